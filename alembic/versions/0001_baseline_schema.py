@@ -0,0 +1,325 @@
+"""Baseline schema
+
+Tables as Base.metadata.create_all built them before the event, payment,
+analytics and rating tables were added (those come in 0001a). Stamp databases
+that create_all built before migrations existed with `alembic stamp 0001`
+before upgrading.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 12:52:01.892230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('brands',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('brand_name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('brands', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_brands_brand_name'), ['brand_name'], unique=True)
+        batch_op.create_index(batch_op.f('ix_brands_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_brands_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_brands_updated_at'), ['updated_at'], unique=False)
+
+    op.create_table('categories',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_categories_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_categories_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_categories_name'), ['name'], unique=True)
+        batch_op.create_index(batch_op.f('ix_categories_updated_at'), ['updated_at'], unique=False)
+
+    op.create_table('role',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('role', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_role_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_role_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_role_name'), ['name'], unique=True)
+        batch_op.create_index(batch_op.f('ix_role_updated_at'), ['updated_at'], unique=False)
+
+    op.create_table('products',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=True),
+    sa.Column('description', sa.String(length=500), nullable=True),
+    sa.Column('price', sa.Float(), nullable=True),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('brand_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('image_urls', sa.JSON(), nullable=True),
+    sa.Column('variants', sa.JSON(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['brand_id'], ['brands.id'], ),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_products_brand_id'), ['brand_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_products_category_id'), ['category_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_products_deleted_at'), ['deleted_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_products_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_products_name'), ['name'], unique=False)
+        batch_op.create_index(batch_op.f('ix_products_price'), ['price'], unique=False)
+        batch_op.create_index(batch_op.f('ix_products_status'), ['status'], unique=False)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('full_name', sa.String(length=100), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('password', sa.String(length=255), nullable=True),
+    sa.Column('gender', sa.String(length=20), nullable=True),
+    sa.Column('avatar', sa.String(length=500), nullable=True),
+    sa.Column('phone_number', sa.String(length=20), nullable=True),
+    sa.Column('role_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.Integer(), nullable=True),
+    sa.Column('otp_code', sa.String(length=255), nullable=True),
+    sa.Column('otp_expired_at', sa.DateTime(), nullable=True),
+    sa.Column('otp_type', sa.Enum('REGISTER', 'RESET', name='otptype'), nullable=True),
+    sa.Column('otp_sent_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['role_id'], ['role.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+        batch_op.create_index(batch_op.f('ix_users_full_name'), ['full_name'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_password'), ['password'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_phone_number'), ['phone_number'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_status'), ['status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_updated_at'), ['updated_at'], unique=False)
+
+    op.create_table('addresses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('street_address', sa.String(length=255), nullable=False),
+    sa.Column('ward', sa.String(length=100), nullable=True),
+    sa.Column('province_city', sa.String(length=100), nullable=False),
+    sa.Column('is_default', sa.Boolean(), nullable=True),
+    sa.Column('recipient_name', sa.String(length=100), nullable=False),
+    sa.Column('recipient_phone', sa.String(length=20), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('addresses', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_addresses_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_addresses_is_default'), ['is_default'], unique=False)
+        batch_op.create_index(batch_op.f('ix_addresses_user_id'), ['user_id'], unique=False)
+
+    op.create_table('carts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('carts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_carts_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_carts_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_carts_updated_at'), ['updated_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_carts_user_id'), ['user_id'], unique=True)
+
+    op.create_table('orders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('delivery_address', sa.JSON(), nullable=False),
+    sa.Column('order_date', sa.DateTime(), nullable=True),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('payment_status', sa.String(length=50), nullable=True),
+    sa.Column('payment_intent_id', sa.String(length=255), nullable=True),
+    sa.Column('payment_method', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_orders_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_orders_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_orders_order_date'), ['order_date'], unique=False)
+        batch_op.create_index(batch_op.f('ix_orders_payment_intent_id'), ['payment_intent_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_orders_payment_status'), ['payment_status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_orders_status'), ['status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_orders_total_amount'), ['total_amount'], unique=False)
+        batch_op.create_index(batch_op.f('ix_orders_updated_at'), ['updated_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_orders_user_id'), ['user_id'], unique=False)
+
+    op.create_table('reviews',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('rating', sa.Float(), nullable=False),
+    sa.Column('comment', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_reviews_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_reviews_product_id'), ['product_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_reviews_rating'), ['rating'], unique=False)
+        batch_op.create_index(batch_op.f('ix_reviews_user_id'), ['user_id'], unique=False)
+
+    op.create_table('cart_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cart_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=True),
+    sa.Column('color', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['cart_id'], ['carts.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('cart_items', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_cart_items_cart_id'), ['cart_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_cart_items_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_cart_items_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_cart_items_product_id'), ['product_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_cart_items_updated_at'), ['updated_at'], unique=False)
+
+    op.create_table('order_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('product_name', sa.String(length=255), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=True),
+    sa.Column('color', sa.String(length=50), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('price_at_purchase', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('order_items', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_order_items_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_order_items_order_id'), ['order_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_order_items_product_id'), ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('order_items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_order_items_product_id'))
+        batch_op.drop_index(batch_op.f('ix_order_items_order_id'))
+        batch_op.drop_index(batch_op.f('ix_order_items_id'))
+
+    op.drop_table('order_items')
+    with op.batch_alter_table('cart_items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_cart_items_updated_at'))
+        batch_op.drop_index(batch_op.f('ix_cart_items_product_id'))
+        batch_op.drop_index(batch_op.f('ix_cart_items_id'))
+        batch_op.drop_index(batch_op.f('ix_cart_items_created_at'))
+        batch_op.drop_index(batch_op.f('ix_cart_items_cart_id'))
+
+    op.drop_table('cart_items')
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_reviews_user_id'))
+        batch_op.drop_index(batch_op.f('ix_reviews_rating'))
+        batch_op.drop_index(batch_op.f('ix_reviews_product_id'))
+        batch_op.drop_index(batch_op.f('ix_reviews_id'))
+
+    op.drop_table('reviews')
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_orders_user_id'))
+        batch_op.drop_index(batch_op.f('ix_orders_updated_at'))
+        batch_op.drop_index(batch_op.f('ix_orders_total_amount'))
+        batch_op.drop_index(batch_op.f('ix_orders_status'))
+        batch_op.drop_index(batch_op.f('ix_orders_payment_status'))
+        batch_op.drop_index(batch_op.f('ix_orders_payment_intent_id'))
+        batch_op.drop_index(batch_op.f('ix_orders_order_date'))
+        batch_op.drop_index(batch_op.f('ix_orders_id'))
+        batch_op.drop_index(batch_op.f('ix_orders_created_at'))
+
+    op.drop_table('orders')
+    with op.batch_alter_table('carts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_carts_user_id'))
+        batch_op.drop_index(batch_op.f('ix_carts_updated_at'))
+        batch_op.drop_index(batch_op.f('ix_carts_id'))
+        batch_op.drop_index(batch_op.f('ix_carts_created_at'))
+
+    op.drop_table('carts')
+    with op.batch_alter_table('addresses', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_addresses_user_id'))
+        batch_op.drop_index(batch_op.f('ix_addresses_is_default'))
+        batch_op.drop_index(batch_op.f('ix_addresses_id'))
+
+    op.drop_table('addresses')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_updated_at'))
+        batch_op.drop_index(batch_op.f('ix_users_status'))
+        batch_op.drop_index(batch_op.f('ix_users_phone_number'))
+        batch_op.drop_index(batch_op.f('ix_users_password'))
+        batch_op.drop_index(batch_op.f('ix_users_id'))
+        batch_op.drop_index(batch_op.f('ix_users_full_name'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+        batch_op.drop_index(batch_op.f('ix_users_created_at'))
+
+    op.drop_table('users')
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_products_status'))
+        batch_op.drop_index(batch_op.f('ix_products_price'))
+        batch_op.drop_index(batch_op.f('ix_products_name'))
+        batch_op.drop_index(batch_op.f('ix_products_id'))
+        batch_op.drop_index(batch_op.f('ix_products_deleted_at'))
+        batch_op.drop_index(batch_op.f('ix_products_category_id'))
+        batch_op.drop_index(batch_op.f('ix_products_brand_id'))
+
+    op.drop_table('products')
+    with op.batch_alter_table('role', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_role_updated_at'))
+        batch_op.drop_index(batch_op.f('ix_role_name'))
+        batch_op.drop_index(batch_op.f('ix_role_id'))
+        batch_op.drop_index(batch_op.f('ix_role_created_at'))
+
+    op.drop_table('role')
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_categories_updated_at'))
+        batch_op.drop_index(batch_op.f('ix_categories_name'))
+        batch_op.drop_index(batch_op.f('ix_categories_id'))
+        batch_op.drop_index(batch_op.f('ix_categories_created_at'))
+
+    op.drop_table('categories')
+    with op.batch_alter_table('brands', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_brands_updated_at'))
+        batch_op.drop_index(batch_op.f('ix_brands_id'))
+        batch_op.drop_index(batch_op.f('ix_brands_created_at'))
+        batch_op.drop_index(batch_op.f('ix_brands_brand_name'))
+
+    op.drop_table('brands')
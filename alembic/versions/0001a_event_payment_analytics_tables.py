@@ -0,0 +1,175 @@
+"""Event, payment, analytics and rating tables
+
+Tables and indexes added after the baseline: the event outbox, idempotency
+keys, payment events, sales rollups, rating summaries, the unique payment
+intent index and the purchase-check indexes. Databases that create_all built
+part-way through already have some of them, so each is created only when
+missing.
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-19 14:05:12.304518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001a'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _indexes(table_name: str) -> dict:
+    return {index['name']: index for index in sa.inspect(op.get_bind()).get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    """Create the tables and indexes this database does not have yet."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'daily_product_sales' not in tables:
+        op.create_table('daily_product_sales',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('brand_id', sa.Integer(), nullable=True),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.Column('units', sa.Integer(), nullable=False),
+        sa.Column('orders', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('day', 'product_id', name='uq_daily_product_sales_day_product')
+        )
+        with op.batch_alter_table('daily_product_sales', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_daily_product_sales_id'), ['id'], unique=False)
+            batch_op.create_index(batch_op.f('ix_daily_product_sales_product_id'), ['product_id'], unique=False)
+
+    if 'daily_sales' not in tables:
+        op.create_table('daily_sales',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.Column('units', sa.Integer(), nullable=False),
+        sa.Column('orders', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day')
+        )
+
+    if 'idempotency_keys' not in tables:
+        op.create_table('idempotency_keys',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('scope', sa.String(length=100), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('request_hash', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('response', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'scope', 'key', name='uq_idempotency_keys_user_scope_key')
+        )
+        with op.batch_alter_table('idempotency_keys', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_idempotency_keys_created_at'), ['created_at'], unique=False)
+            batch_op.create_index(batch_op.f('ix_idempotency_keys_id'), ['id'], unique=False)
+
+    if 'outbox_events' not in tables:
+        op.create_table('outbox_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_type', sa.String(length=100), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('processed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('outbox_events', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_outbox_events_id'), ['id'], unique=False)
+            batch_op.create_index(batch_op.f('ix_outbox_events_processed_at'), ['processed_at'], unique=False)
+
+    if 'payment_events' not in tables:
+        op.create_table('payment_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.String(length=255), nullable=False),
+        sa.Column('event_type', sa.String(length=100), nullable=False),
+        sa.Column('payment_intent_id', sa.String(length=255), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('received_at', sa.DateTime(), nullable=True),
+        sa.Column('processed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('event_id')
+        )
+        with op.batch_alter_table('payment_events', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_payment_events_id'), ['id'], unique=False)
+            batch_op.create_index(batch_op.f('ix_payment_events_payment_intent_id'), ['payment_intent_id'], unique=False)
+
+    if 'product_rating_summaries' not in tables:
+        op.create_table('product_rating_summaries',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('review_count', sa.Integer(), nullable=False),
+        sa.Column('rating_sum', sa.Float(), nullable=False),
+        sa.Column('stars_1', sa.Integer(), nullable=False),
+        sa.Column('stars_2', sa.Integer(), nullable=False),
+        sa.Column('stars_3', sa.Integer(), nullable=False),
+        sa.Column('stars_4', sa.Integer(), nullable=False),
+        sa.Column('stars_5', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+        sa.PrimaryKeyConstraint('product_id')
+        )
+
+    if 'sales_rollup_orders' not in tables:
+        op.create_table('sales_rollup_orders',
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('counted_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+        sa.PrimaryKeyConstraint('order_id')
+        )
+
+    orders_indexes = _indexes('orders')
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        # One order per payment intent; fails if duplicates were already stored
+        if not orders_indexes['ix_orders_payment_intent_id']['unique']:
+            batch_op.drop_index(batch_op.f('ix_orders_payment_intent_id'))
+            batch_op.create_index(batch_op.f('ix_orders_payment_intent_id'), ['payment_intent_id'], unique=True)
+        if 'ix_orders_user_id_status' not in orders_indexes:
+            batch_op.create_index('ix_orders_user_id_status', ['user_id', 'status'], unique=False)
+
+    if 'ix_order_items_product_id_order_id' not in _indexes('order_items'):
+        with op.batch_alter_table('order_items', schema=None) as batch_op:
+            batch_op.create_index('ix_order_items_product_id_order_id', ['product_id', 'order_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the tables and indexes added after the baseline."""
+    with op.batch_alter_table('order_items', schema=None) as batch_op:
+        batch_op.drop_index('ix_order_items_product_id_order_id')
+
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_index('ix_orders_user_id_status')
+        batch_op.drop_index(batch_op.f('ix_orders_payment_intent_id'))
+        batch_op.create_index(batch_op.f('ix_orders_payment_intent_id'), ['payment_intent_id'], unique=False)
+
+    op.drop_table('sales_rollup_orders')
+    op.drop_table('product_rating_summaries')
+    with op.batch_alter_table('payment_events', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_payment_events_payment_intent_id'))
+        batch_op.drop_index(batch_op.f('ix_payment_events_id'))
+
+    op.drop_table('payment_events')
+    with op.batch_alter_table('outbox_events', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_outbox_events_processed_at'))
+        batch_op.drop_index(batch_op.f('ix_outbox_events_id'))
+
+    op.drop_table('outbox_events')
+    with op.batch_alter_table('idempotency_keys', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_idempotency_keys_id'))
+        batch_op.drop_index(batch_op.f('ix_idempotency_keys_created_at'))
+
+    op.drop_table('idempotency_keys')
+    op.drop_table('daily_sales')
+    with op.batch_alter_table('daily_product_sales', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_daily_product_sales_product_id'))
+        batch_op.drop_index(batch_op.f('ix_daily_product_sales_id'))
+
+    op.drop_table('daily_product_sales')
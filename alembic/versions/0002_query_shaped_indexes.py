@@ -0,0 +1,193 @@
+"""Query shaped indexes
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-19 12:52:26.528619
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _drop_index_if_exists(batch_op, table_name: str, index_name: str) -> None:
+    if index_name in {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table_name)}:
+        batch_op.drop_index(index_name)
+
+
+def upgrade() -> None:
+    """Replace single-column indexes nobody queries by composites matching repository queries."""
+    # Composites are created before the single-column indexes they replace are
+    # dropped, so MySQL always has an index backing each foreign key. Indexes
+    # are dropped only where they exist: databases create_all built at
+    # different points do not all have the same ones.
+    with op.batch_alter_table('addresses', schema=None) as batch_op:
+        _drop_index_if_exists(batch_op, 'addresses', 'ix_addresses_id')
+        _drop_index_if_exists(batch_op, 'addresses', 'ix_addresses_is_default')
+
+    with op.batch_alter_table('brands', schema=None) as batch_op:
+        _drop_index_if_exists(batch_op, 'brands', 'ix_brands_created_at')
+        _drop_index_if_exists(batch_op, 'brands', 'ix_brands_id')
+        _drop_index_if_exists(batch_op, 'brands', 'ix_brands_updated_at')
+
+    with op.batch_alter_table('cart_items', schema=None) as batch_op:
+        batch_op.create_index('ix_cart_items_cart_id_product_id_size_color', ['cart_id', 'product_id', 'size', 'color'], unique=False)
+        _drop_index_if_exists(batch_op, 'cart_items', 'ix_cart_items_cart_id')
+        _drop_index_if_exists(batch_op, 'cart_items', 'ix_cart_items_created_at')
+        _drop_index_if_exists(batch_op, 'cart_items', 'ix_cart_items_id')
+        _drop_index_if_exists(batch_op, 'cart_items', 'ix_cart_items_updated_at')
+
+    with op.batch_alter_table('carts', schema=None) as batch_op:
+        _drop_index_if_exists(batch_op, 'carts', 'ix_carts_created_at')
+        _drop_index_if_exists(batch_op, 'carts', 'ix_carts_id')
+        _drop_index_if_exists(batch_op, 'carts', 'ix_carts_updated_at')
+
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        _drop_index_if_exists(batch_op, 'categories', 'ix_categories_created_at')
+        _drop_index_if_exists(batch_op, 'categories', 'ix_categories_id')
+        _drop_index_if_exists(batch_op, 'categories', 'ix_categories_updated_at')
+
+    with op.batch_alter_table('daily_product_sales', schema=None) as batch_op:
+        _drop_index_if_exists(batch_op, 'daily_product_sales', 'ix_daily_product_sales_id')
+
+    with op.batch_alter_table('idempotency_keys', schema=None) as batch_op:
+        _drop_index_if_exists(batch_op, 'idempotency_keys', 'ix_idempotency_keys_id')
+
+    with op.batch_alter_table('order_items', schema=None) as batch_op:
+        _drop_index_if_exists(batch_op, 'order_items', 'ix_order_items_id')
+        _drop_index_if_exists(batch_op, 'order_items', 'ix_order_items_product_id')
+
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.create_index('ix_orders_status_created_at', ['status', 'created_at'], unique=False)
+        batch_op.create_index('ix_orders_user_id_created_at', ['user_id', 'created_at'], unique=False)
+        _drop_index_if_exists(batch_op, 'orders', 'ix_orders_id')
+        _drop_index_if_exists(batch_op, 'orders', 'ix_orders_order_date')
+        _drop_index_if_exists(batch_op, 'orders', 'ix_orders_payment_status')
+        _drop_index_if_exists(batch_op, 'orders', 'ix_orders_status')
+        _drop_index_if_exists(batch_op, 'orders', 'ix_orders_total_amount')
+        _drop_index_if_exists(batch_op, 'orders', 'ix_orders_updated_at')
+        _drop_index_if_exists(batch_op, 'orders', 'ix_orders_user_id')
+
+    with op.batch_alter_table('outbox_events', schema=None) as batch_op:
+        _drop_index_if_exists(batch_op, 'outbox_events', 'ix_outbox_events_id')
+
+    with op.batch_alter_table('payment_events', schema=None) as batch_op:
+        _drop_index_if_exists(batch_op, 'payment_events', 'ix_payment_events_id')
+
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.create_index('ix_products_status_deleted_at_id', ['status', 'deleted_at', 'id'], unique=False)
+        _drop_index_if_exists(batch_op, 'products', 'ix_products_id')
+        _drop_index_if_exists(batch_op, 'products', 'ix_products_name')
+        _drop_index_if_exists(batch_op, 'products', 'ix_products_status')
+
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.create_index('ix_reviews_product_id_deleted_at_created_at', ['product_id', 'deleted_at', 'created_at'], unique=False)
+        _drop_index_if_exists(batch_op, 'reviews', 'ix_reviews_id')
+        _drop_index_if_exists(batch_op, 'reviews', 'ix_reviews_product_id')
+        _drop_index_if_exists(batch_op, 'reviews', 'ix_reviews_rating')
+
+    with op.batch_alter_table('role', schema=None) as batch_op:
+        _drop_index_if_exists(batch_op, 'role', 'ix_role_created_at')
+        _drop_index_if_exists(batch_op, 'role', 'ix_role_id')
+        _drop_index_if_exists(batch_op, 'role', 'ix_role_updated_at')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        _drop_index_if_exists(batch_op, 'users', 'ix_users_created_at')
+        _drop_index_if_exists(batch_op, 'users', 'ix_users_full_name')
+        _drop_index_if_exists(batch_op, 'users', 'ix_users_id')
+        _drop_index_if_exists(batch_op, 'users', 'ix_users_password')
+        _drop_index_if_exists(batch_op, 'users', 'ix_users_phone_number')
+        _drop_index_if_exists(batch_op, 'users', 'ix_users_status')
+        _drop_index_if_exists(batch_op, 'users', 'ix_users_updated_at')
+
+
+
+def downgrade() -> None:
+    """Restore the previous single-column indexes."""
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_updated_at'), ['updated_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_status'), ['status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_phone_number'), ['phone_number'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_password'), ['password'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_full_name'), ['full_name'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_created_at'), ['created_at'], unique=False)
+
+    with op.batch_alter_table('role', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_role_updated_at'), ['updated_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_role_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_role_created_at'), ['created_at'], unique=False)
+
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_reviews_rating'), ['rating'], unique=False)
+        batch_op.create_index(batch_op.f('ix_reviews_product_id'), ['product_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_reviews_id'), ['id'], unique=False)
+        batch_op.drop_index('ix_reviews_product_id_deleted_at_created_at')
+
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_products_status'), ['status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_products_name'), ['name'], unique=False)
+        batch_op.create_index(batch_op.f('ix_products_id'), ['id'], unique=False)
+        batch_op.drop_index('ix_products_status_deleted_at_id')
+
+    with op.batch_alter_table('payment_events', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_payment_events_id'), ['id'], unique=False)
+
+    with op.batch_alter_table('outbox_events', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_outbox_events_id'), ['id'], unique=False)
+
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_orders_user_id'), ['user_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_orders_updated_at'), ['updated_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_orders_total_amount'), ['total_amount'], unique=False)
+        batch_op.create_index(batch_op.f('ix_orders_status'), ['status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_orders_payment_status'), ['payment_status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_orders_order_date'), ['order_date'], unique=False)
+        batch_op.create_index(batch_op.f('ix_orders_id'), ['id'], unique=False)
+        batch_op.drop_index('ix_orders_user_id_created_at')
+        batch_op.drop_index('ix_orders_status_created_at')
+
+    with op.batch_alter_table('order_items', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_order_items_product_id'), ['product_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_order_items_id'), ['id'], unique=False)
+
+    with op.batch_alter_table('idempotency_keys', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_idempotency_keys_id'), ['id'], unique=False)
+
+    with op.batch_alter_table('daily_product_sales', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_daily_product_sales_id'), ['id'], unique=False)
+
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_categories_updated_at'), ['updated_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_categories_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_categories_created_at'), ['created_at'], unique=False)
+
+    with op.batch_alter_table('carts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_carts_updated_at'), ['updated_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_carts_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_carts_created_at'), ['created_at'], unique=False)
+
+    with op.batch_alter_table('cart_items', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_cart_items_updated_at'), ['updated_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_cart_items_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_cart_items_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_cart_items_cart_id'), ['cart_id'], unique=False)
+        batch_op.drop_index('ix_cart_items_cart_id_product_id_size_color')
+
+    with op.batch_alter_table('brands', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_brands_updated_at'), ['updated_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_brands_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_brands_created_at'), ['created_at'], unique=False)
+
+    with op.batch_alter_table('addresses', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_addresses_is_default'), ['is_default'], unique=False)
+        batch_op.create_index(batch_op.f('ix_addresses_id'), ['id'], unique=False)
+
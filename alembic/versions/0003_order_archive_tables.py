@@ -0,0 +1,84 @@
+"""Order archive tables
+
+Finished orders past ORDER_ARCHIVE_AFTER_DAYS are moved here by
+`python -m app.db.archive_orders`.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 13:15:18.158176
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Archive copies of orders/order_items and the units their items sold."""
+    op.create_table('archived_product_sales',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    op.create_table('orders_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('delivery_address', sa.JSON(), nullable=False),
+    sa.Column('order_date', sa.DateTime(), nullable=True),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('payment_status', sa.String(length=50), nullable=True),
+    sa.Column('payment_intent_id', sa.String(length=255), nullable=True),
+    sa.Column('payment_method', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('orders_archive', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_orders_archive_created_at'), ['created_at'], unique=False)
+        batch_op.create_index('ix_orders_archive_status_created_at', ['status', 'created_at'], unique=False)
+        batch_op.create_index('ix_orders_archive_user_id_created_at', ['user_id', 'created_at'], unique=False)
+
+    op.create_table('order_items_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('product_name', sa.String(length=255), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=True),
+    sa.Column('color', sa.String(length=50), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('price_at_purchase', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['orders_archive.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('order_items_archive', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_order_items_archive_order_id'), ['order_id'], unique=False)
+        batch_op.create_index('ix_order_items_archive_product_id_order_id', ['product_id', 'order_id'], unique=False)
+
+
+
+def downgrade() -> None:
+    """Drop the archive tables; archived orders are not moved back."""
+    with op.batch_alter_table('order_items_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_order_items_archive_product_id_order_id')
+        batch_op.drop_index(batch_op.f('ix_order_items_archive_order_id'))
+
+    op.drop_table('order_items_archive')
+    with op.batch_alter_table('orders_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_orders_archive_user_id_created_at')
+        batch_op.drop_index('ix_orders_archive_status_created_at')
+        batch_op.drop_index(batch_op.f('ix_orders_archive_created_at'))
+
+    op.drop_table('orders_archive')
+    op.drop_table('archived_product_sales')
@@ -0,0 +1,56 @@
+"""Unique cart item variant
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 13:40:02.417310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+cart_items = sa.table(
+    'cart_items',
+    sa.column('id', sa.Integer),
+    sa.column('cart_id', sa.Integer),
+    sa.column('product_id', sa.Integer),
+    sa.column('size', sa.Integer),
+    sa.column('color', sa.String),
+    sa.column('quantity', sa.Integer),
+)
+VARIANT_KEY = ['cart_id', 'product_id', 'size', 'color']
+
+
+def upgrade() -> None:
+    """Merge duplicate lines of the same variant, then make the variant index unique."""
+    connection = op.get_bind()
+    key_columns = [cart_items.c[name] for name in VARIANT_KEY]
+    duplicates = connection.execute(
+        sa.select(*key_columns, sa.func.min(cart_items.c.id), sa.func.sum(cart_items.c.quantity))
+        .group_by(*key_columns)
+        .having(sa.func.count() > 1)
+    ).all()
+    for *key, keep_id, quantity in duplicates:
+        # `== None` renders IS NULL, so lines without size or color merge too
+        same_variant = sa.and_(*(column == value for column, value in zip(key_columns, key)))
+        connection.execute(sa.update(cart_items).where(cart_items.c.id == keep_id).values(quantity=quantity))
+        connection.execute(sa.delete(cart_items).where(same_variant, cart_items.c.id != keep_id))
+
+    with op.batch_alter_table('cart_items', schema=None) as batch_op:
+        batch_op.drop_index('ix_cart_items_cart_id_product_id_size_color')
+        batch_op.create_index('ix_cart_items_cart_id_product_id_size_color', VARIANT_KEY, unique=True)
+
+
+def downgrade() -> None:
+    """Make the variant index non-unique again; merged lines stay merged."""
+    with op.batch_alter_table('cart_items', schema=None) as batch_op:
+        batch_op.drop_index('ix_cart_items_cart_id_product_id_size_color')
+        batch_op.create_index('ix_cart_items_cart_id_product_id_size_color', VARIANT_KEY, unique=False)
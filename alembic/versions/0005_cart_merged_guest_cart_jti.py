@@ -0,0 +1,30 @@
+"""Cart merged guest cart jti
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 15:12:44.871203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Record the last guest cart merged into each cart."""
+    with op.batch_alter_table('carts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('merged_guest_cart_jti', sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the merged guest cart jti."""
+    with op.batch_alter_table('carts', schema=None) as batch_op:
+        batch_op.drop_column('merged_guest_cart_jti')
@@ -0,0 +1,89 @@
+import asyncio
+from collections import deque
+from typing import Deque, Dict, NamedTuple, Optional
+
+
+class RouteClassBudget(NamedTuple):
+    concurrency: int
+    queue_size: int
+    max_wait: float
+    # Lower runs first when a slot frees up
+    priority: int
+
+
+class AdmissionController:
+    """
+    Concurrency limiter with a budget per route class and a global cap.
+
+    A request runs when both its class and the global cap have room;
+    otherwise it waits in its class queue until a slot frees up, its
+    deadline passes, or (queue full) it is refused straight away. Freed
+    slots go to the highest-priority class with waiters, so checkout is
+    admitted before browsing when both are queued.
+
+    Lives on one event loop; the middleware only calls it from async code.
+    """
+
+    def __init__(self, budgets: Dict[str, RouteClassBudget], max_concurrency: int):
+        self.budgets = budgets
+        self.max_concurrency = max_concurrency
+        self.active: Dict[str, int] = {name: 0 for name in budgets}
+        self.total_active = 0
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {name: deque() for name in budgets}
+        self._by_priority = sorted(budgets, key=lambda name: budgets[name].priority)
+
+    def _has_room(self, route_class: str) -> bool:
+        if self.max_concurrency and self.total_active >= self.max_concurrency:
+            return False
+        return self.active[route_class] < self.budgets[route_class].concurrency
+
+    def _take(self, route_class: str) -> None:
+        self.active[route_class] += 1
+        self.total_active += 1
+
+    def queued(self, route_class: str) -> int:
+        return len(self._waiters[route_class])
+
+    async def acquire(self, route_class: str) -> Optional[str]:
+        """Take a slot; returns None when admitted, else why the request was shed"""
+        if self._has_room(route_class) and not self._waiters[route_class]:
+            self._take(route_class)
+            return None
+
+        budget = self.budgets[route_class]
+        waiters = self._waiters[route_class]
+        if len(waiters) >= budget.queue_size:
+            return "queue_full"
+
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        try:
+            await asyncio.wait_for(future, budget.max_wait)
+            return None
+        except asyncio.TimeoutError:
+            return "timeout"
+        except asyncio.CancelledError:
+            # Client went away; hand back a slot granted in the meantime
+            if future.done() and not future.cancelled():
+                self.release(route_class)
+            raise
+        finally:
+            if future in waiters:
+                waiters.remove(future)
+
+    def release(self, route_class: str) -> None:
+        self.active[route_class] -= 1
+        self.total_active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        for route_class in self._by_priority:
+            waiters = self._waiters[route_class]
+            while waiters and self._has_room(route_class):
+                future = waiters.popleft()
+                if future.done():
+                    continue
+                self._take(route_class)
+                future.set_result(None)
+            if self.max_concurrency and self.total_active >= self.max_concurrency:
+                return
@@ -0,0 +1,99 @@
+import gzip
+from typing import Callable, Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # optional, br is simply not offered
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional, zstd is simply not offered
+    zstandard = None
+
+# Media types worth compressing; images, archives and fonts already are
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def _gzip(body: bytes, level: int) -> bytes:
+    # mtime=0 keeps the output deterministic, so identical bodies give identical bytes
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def _brotli(body: bytes, level: int) -> bytes:
+    return brotli.compress(body, quality=level)
+
+
+def _zstd(body: bytes, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=level).compress(body)
+
+
+# Server preference order when the client accepts several with the same q
+CODECS: Dict[str, Callable[[bytes, int], bytes]] = {}
+if zstandard is not None:
+    CODECS["zstd"] = _zstd
+if brotli is not None:
+    CODECS["br"] = _brotli
+CODECS["gzip"] = _gzip
+
+# Per-response compression has to be cheap; cached bodies are compressed once
+# and served many times, so they get the strongest setting
+DYNAMIC_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+CACHED_LEVELS = {"zstd": 19, "br": 11, "gzip": 9}
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Best supported encoding for an Accept-Encoding header, None for identity"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in CODECS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(encoding: str, body: bytes, cached: bool = False) -> bytes:
+    levels = CACHED_LEVELS if cached else DYNAMIC_LEVELS
+    return CODECS[encoding](body, levels[encoding])
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def no_compression(endpoint):
+    """
+    Route decorator opting a response out of compression, e.g. bodies that
+    carry secrets next to request-controlled data (BREACH-style leaks).
+    """
+    endpoint.__no_compression__ = True
+    return endpoint
+
+
+def route_allows_compression(route) -> bool:
+    endpoint = getattr(route, "endpoint", None)
+    return not getattr(endpoint, "__no_compression__", False)
@@ -8,6 +8,10 @@ logger = logging.getLogger(__name__)
 
 class Settings:
     SQLALCHEMY_DATABASE_URL: str = os.getenv("SQLALCHEMY_DATABASE_URL", "sqlite:///./dev.db")
+    # Comma-separated read replica URLs; listings, reviews and order history read from them
+    SQLALCHEMY_REPLICA_URLS: list = [url.strip() for url in os.getenv("SQLALCHEMY_REPLICA_URLS", "").split(",") if url.strip()]
+    # After a write, the client reads from the primary for this long (covers replica lag)
+    REPLICA_STICKY_SECONDS: int = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
     SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-secret")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     
@@ -29,5 +33,87 @@ class Settings:
     CLOUDINARY_CLOUD_NAME: str = os.getenv("CLOUDINARY_CLOUD_NAME")
     CLOUDINARY_API_KEY: str = os.getenv("CLOUDINARY_API_KEY")
     CLOUDINARY_API_SECRET: str = os.getenv("CLOUDINARY_API_SECRET")
+
+    # Domain event bus
+    EVENT_BUS_WORKERS: int = int(os.getenv("EVENT_BUS_WORKERS", "2"))
+    EVENT_BUS_QUEUE_SIZE: int = int(os.getenv("EVENT_BUS_QUEUE_SIZE", "1000"))
+    EVENT_OUTBOX_ENABLED: bool = os.getenv("EVENT_OUTBOX_ENABLED", "false").lower() == "true"
+
+    # Stripe payment gateway
+    STRIPE_SECRET_KEY: str = os.getenv("STRIPE_SECRET_KEY")
+    STRIPE_API_BASE: str = os.getenv("STRIPE_API_BASE", "https://api.stripe.com")
+    STRIPE_CONNECT_TIMEOUT: float = float(os.getenv("STRIPE_CONNECT_TIMEOUT", "3"))
+    STRIPE_READ_TIMEOUT: float = float(os.getenv("STRIPE_READ_TIMEOUT", "10"))
+    STRIPE_MAX_CONNECTIONS: int = int(os.getenv("STRIPE_MAX_CONNECTIONS", "20"))
+    # When set, confirm endpoints skip the Stripe round trip and orders are
+    # finalized by the payment_intent.* webhook instead
+    STRIPE_WEBHOOK_SECRET: str = os.getenv("STRIPE_WEBHOOK_SECRET")
+    STRIPE_WEBHOOK_TOLERANCE_SECONDS: int = int(os.getenv("STRIPE_WEBHOOK_TOLERANCE_SECONDS", "300"))
+
+    # Bulk product import/export
+    PRODUCT_IMPORT_BATCH_SIZE: int = int(os.getenv("PRODUCT_IMPORT_BATCH_SIZE", "500"))
+    PRODUCT_BULK_UPDATE_CHUNK_SIZE: int = int(os.getenv("PRODUCT_BULK_UPDATE_CHUNK_SIZE", "1000"))
+    # Most ids one GET /products/batch may ask for
+    PRODUCT_BATCH_MAX_IDS: int = int(os.getenv("PRODUCT_BATCH_MAX_IDS", "50"))
+
+    # Admin order export
+    ORDER_EXPORT_BATCH_SIZE: int = int(os.getenv("ORDER_EXPORT_BATCH_SIZE", "1000"))
+
+    # Order archival (python -m app.db.archive_orders): delivered/cancelled orders
+    # older than this move to orders_archive/order_items_archive
+    ORDER_ARCHIVE_AFTER_DAYS: int = int(os.getenv("ORDER_ARCHIVE_AFTER_DAYS", "365"))
+    ORDER_ARCHIVE_BATCH_SIZE: int = int(os.getenv("ORDER_ARCHIVE_BATCH_SIZE", "1000"))
+
+    # Guest carts travel in a signed token (X-Guest-Cart header) instead of the
+    # database until login merges them into the user's cart
+    GUEST_CART_TTL_DAYS: int = int(os.getenv("GUEST_CART_TTL_DAYS", "30"))
+    GUEST_CART_MAX_ITEMS: int = int(os.getenv("GUEST_CART_MAX_ITEMS", "20"))
+    # Larger tokens are refused before their signature is checked
+    GUEST_CART_MAX_TOKEN_BYTES: int = int(os.getenv("GUEST_CART_MAX_TOKEN_BYTES", "4096"))
+
+    # Idempotency keys for payment confirmation
+    IDEMPOTENCY_KEY_TTL_HOURS: int = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+    IDEMPOTENCY_CACHE_SIZE: int = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+
+    # Request metrics (Server-Timing headers and /metrics)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    # Requests running more SQL statements than this are logged as likely N+1
+    SQL_STATEMENT_BUDGET: int = int(os.getenv("SQL_STATEMENT_BUDGET", "30"))
+
+    # Slow-query log and per-fingerprint statistics
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    QUERY_STATS_MAX_FINGERPRINTS: int = int(os.getenv("QUERY_STATS_MAX_FINGERPRINTS", "500"))
+    QUERY_STATS_SAMPLE_SIZE: int = int(os.getenv("QUERY_STATS_SAMPLE_SIZE", "256"))
+
+    # Sampling profiler for admins (off unless enabled per deployment)
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILER_MAX_SECONDS: int = int(os.getenv("PROFILER_MAX_SECONDS", "30"))
+    PROFILER_INTERVAL_MS: float = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+
+    # Response compression (gzip always; br/zstd when brotli/zstandard are installed)
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    # Smaller bodies gain less than the encoding overhead and CPU cost
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+    # Rendered GET /products, /products/batch and /products/{id} responses; a TTL of 0 disables the cache
+    CATALOG_CACHE_TTL_SECONDS: float = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "30"))
+    CATALOG_CACHE_MAX_ENTRIES: int = int(os.getenv("CATALOG_CACHE_MAX_ENTRIES", "1000"))
+    # How long past its TTL an entry may still be served while one request re-renders it
+    CATALOG_CACHE_STALE_SECONDS: float = float(os.getenv("CATALOG_CACHE_STALE_SECONDS", "60"))
+
+    # Admission control: concurrent requests per route class before queueing,
+    # queued requests per class before shedding with 503
+    ADMISSION_CONTROL_ENABLED: bool = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+    # Across all classes; the default matches the 40-thread pool sync routes run in (0 = no cap)
+    ADMISSION_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "40"))
+    ADMISSION_CHECKOUT_CONCURRENCY: int = int(os.getenv("ADMISSION_CHECKOUT_CONCURRENCY", "16"))
+    ADMISSION_CATALOG_CONCURRENCY: int = int(os.getenv("ADMISSION_CATALOG_CONCURRENCY", "24"))
+    ADMISSION_DEFAULT_CONCURRENCY: int = int(os.getenv("ADMISSION_DEFAULT_CONCURRENCY", "16"))
+    ADMISSION_ADMIN_CONCURRENCY: int = int(os.getenv("ADMISSION_ADMIN_CONCURRENCY", "4"))
+    ADMISSION_QUEUE_SIZE: int = int(os.getenv("ADMISSION_QUEUE_SIZE", "100"))
+    ADMISSION_MAX_WAIT_SECONDS: float = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "2"))
+    # A paying customer is worth waiting longer for
+    ADMISSION_CHECKOUT_MAX_WAIT_SECONDS: float = float(os.getenv("ADMISSION_CHECKOUT_MAX_WAIT_SECONDS", "10"))
+    ADMISSION_RETRY_AFTER_SECONDS: int = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "2"))
     
 settings = Settings()
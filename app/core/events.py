@@ -0,0 +1,226 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+from typing import Awaitable, Callable, ClassVar, Dict, List, Optional, Type
+
+from pydantic import BaseModel, Field
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings, logger
+
+
+class DomainEvent(BaseModel):
+    """Base class for events published on the in-process event bus"""
+    name: ClassVar[str] = "domain_event"
+
+    occurred_at: datetime = Field(default_factory=datetime.now)
+
+
+class OrderCreated(DomainEvent):
+    name: ClassVar[str] = "order.created"
+
+    order_id: int
+    user_id: int
+    total_amount: float
+    payment_method: Optional[str] = None
+    payment_intent_id: Optional[str] = None
+
+
+class OrderStatusChanged(DomainEvent):
+    name: ClassVar[str] = "order.status_changed"
+
+    order_id: int
+    user_id: int
+    old_status: Optional[str] = None
+    new_status: str
+
+
+class ProductsChanged(DomainEvent):
+    """Catalog rows changed in bulk; caches should drop entries for these products"""
+    name: ClassVar[str] = "products.changed"
+
+    product_ids: List[int]
+
+
+Handler = Callable[[DomainEvent], Awaitable[None]]
+
+_PENDING_EVENTS_KEY = "pending_domain_events"
+
+
+class EventBus:
+    """
+    In-process domain event bus.
+
+    publish() only enqueues the event, so request latency does not grow with
+    the number of subscribers. A fixed pool of worker tasks on the app event
+    loop drains the queue and awaits every subscriber of the event type.
+
+    Events published with a session are held until that session commits and
+    dropped on rollback; a savepoint rollback drops only the events published
+    inside it. When EVENT_OUTBOX_ENABLED is set they are also
+    written to outbox_events in the same transaction, so events that were not
+    delivered before a restart are replayed on startup.
+    """
+
+    def __init__(self, workers: int = 2, max_queue_size: int = 1000):
+        self._subscribers: Dict[str, List[Handler]] = defaultdict(list)
+        self._event_types: Dict[str, Type[DomainEvent]] = {}
+        self._workers = workers
+        self._max_queue_size = max_queue_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def subscribe(self, event_type: Type[DomainEvent]):
+        """Decorator registering an async handler for an event type"""
+        def decorator(handler: Handler) -> Handler:
+            self._event_types[event_type.name] = event_type
+            self._subscribers[event_type.name].append(handler)
+            return handler
+        return decorator
+
+    def publish(self, event: DomainEvent, db: Optional[Session] = None) -> None:
+        """Publish an event, deferred until db commits when a session is given"""
+        if db is None:
+            self._deliver(event, None)
+            return
+
+        outbox_id = None
+        if settings.EVENT_OUTBOX_ENABLED:
+            from app.repositories.outbox_repository import OutboxRepository
+            outbox_id = OutboxRepository.add(db, event.name, event.model_dump(mode="json")).id
+
+        # Begun here if nothing else has, so a rollback before any SQL still drops the event
+        transaction = db.get_nested_transaction() or db.get_transaction() or db.begin()
+        db.info.setdefault(_PENDING_EVENTS_KEY, []).append((event, outbox_id, transaction))
+
+    def _deliver(self, event: DomainEvent, outbox_id: Optional[int]) -> None:
+        if not self._subscribers.get(event.name):
+            return
+
+        if self._loop is None or self._loop.is_closed():
+            logger.warning("Event bus not started, dropping event %s", event.name)
+            return
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self._loop:
+            self._enqueue(event, outbox_id)
+        else:
+            # Sync routes run in the threadpool, hand the event over to the loop
+            self._loop.call_soon_threadsafe(self._enqueue, event, outbox_id)
+
+    def _enqueue(self, event: DomainEvent, outbox_id: Optional[int]) -> None:
+        try:
+            self._queue.put_nowait((event, outbox_id))
+        except asyncio.QueueFull:
+            logger.warning("Event queue full, dropping event %s (outbox id=%s)", event.name, outbox_id)
+
+    async def _dispatch(self, event: DomainEvent) -> bool:
+        delivered = True
+        for handler in self._subscribers.get(event.name, []):
+            try:
+                await handler(event)
+            except Exception:
+                delivered = False
+                logger.exception("Event handler %s failed for %s", handler.__name__, event.name)
+        return delivered
+
+    async def _worker(self) -> None:
+        while True:
+            event, outbox_id = await self._queue.get()
+            try:
+                delivered = await self._dispatch(event)
+                if delivered and outbox_id is not None:
+                    await asyncio.to_thread(_mark_outbox_processed, outbox_id)
+            except Exception:
+                logger.exception("Failed to finalize event %s", event.name)
+            finally:
+                self._queue.task_done()
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+        if settings.EVENT_OUTBOX_ENABLED:
+            await asyncio.to_thread(self._replay_outbox)
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Drain pending events, then cancel the workers"""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Event bus stopped with %s undelivered events", self._queue.qsize())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    def _replay_outbox(self) -> None:
+        """Re-queue outbox events that were not delivered before the last shutdown"""
+        from app.db.base import SessionLocal
+        from app.repositories.outbox_repository import OutboxRepository
+
+        db = SessionLocal()
+        try:
+            for row in OutboxRepository.get_pending(db):
+                event_type = self._event_types.get(row.event_type)
+                if event_type is None:
+                    continue
+                self._loop.call_soon_threadsafe(self._enqueue, event_type(**row.payload), row.id)
+        finally:
+            db.close()
+
+
+def _mark_outbox_processed(outbox_id: int) -> None:
+    from app.db.base import SessionLocal
+    from app.repositories.outbox_repository import OutboxRepository
+
+    db = SessionLocal()
+    try:
+        OutboxRepository.mark_processed(db, outbox_id)
+    finally:
+        db.close()
+
+
+event_bus = EventBus(
+    workers=settings.EVENT_BUS_WORKERS,
+    max_queue_size=settings.EVENT_BUS_QUEUE_SIZE,
+)
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _deliver_pending_events(session: Session) -> None:
+    # Also fired when a savepoint is released; hold events for the outer commit
+    if session.in_nested_transaction():
+        return
+    for domain_event, outbox_id, _ in session.info.pop(_PENDING_EVENTS_KEY, []):
+        event_bus._deliver(domain_event, outbox_id)
+
+
+def _published_within(transaction, savepoint) -> bool:
+    while transaction is not None:
+        if transaction is savepoint:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+@sa_event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_events(session: Session, previous_transaction) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_EVENTS_KEY, None)
+        return
+    # A savepoint rolled back; the outer transaction may still commit the rest
+    pending = session.info.get(_PENDING_EVENTS_KEY)
+    if pending:
+        pending[:] = [entry for entry in pending if not _published_within(entry[2], previous_transaction)]
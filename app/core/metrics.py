@@ -0,0 +1,163 @@
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.query_stats import query_stats
+
+LabelValues = Tuple[Tuple[str, str], ...]
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+QUEUE_WAIT_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestMetrics:
+    """SQL activity of the request being served, shared with the threads it runs in"""
+    __slots__ = ("statements", "db_time", "pool_wait")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+
+
+_current_request: ContextVar[Optional[RequestMetrics]] = ContextVar("current_request_metrics", default=None)
+
+
+def start_request_metrics():
+    """Start collecting for the current context; returns the token for reset"""
+    return _current_request.set(RequestMetrics())
+
+
+def current_request_metrics() -> Optional[RequestMetrics]:
+    return _current_request.get()
+
+
+def reset_request_metrics(token) -> None:
+    _current_request.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info["statement_started_at"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info.pop("statement_started_at", None)
+    if started_at is None:
+        return
+    duration = time.perf_counter() - started_at
+    query_stats.record(statement, duration)
+    metrics = _current_request.get()
+    if metrics is None:
+        return
+    metrics.statements += 1
+    metrics.db_time += duration
+
+
+def instrument_pool_wait(engine: Engine) -> None:
+    """Record how long requests wait for a pooled connection"""
+    pool = engine.pool
+    connect = pool.connect
+
+    def timed_connect():
+        started_at = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            metrics = _current_request.get()
+            if metrics is not None:
+                metrics.pool_wait += time.perf_counter() - started_at
+
+    pool.connect = timed_connect
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process Prometheus registry (counters and histograms).
+
+    Values are per worker process; scrape every worker or aggregate in
+    Prometheus with sum() by the usual labels.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[LabelValues, float]] = {}
+        self._histograms: Dict[str, Dict[LabelValues, List[float]]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+
+    def counter(self, name: str, description: str) -> None:
+        self._help[name] = ("counter", description)
+        self._counters[name] = {}
+
+    def histogram(self, name: str, description: str, buckets: Tuple[float, ...]) -> None:
+        self._help[name] = ("histogram", description)
+        self._histograms[name] = {}
+        self._buckets[name] = buckets
+
+    def inc(self, name: str, labels: Dict[str, str], value: float = 1.0) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, labels: Dict[str, str], value: float) -> None:
+        key = tuple(sorted(labels.items()))
+        buckets = self._buckets[name]
+        with self._lock:
+            # Per-bucket counts followed by sum and count
+            series = self._histograms[name].setdefault(key, [0.0] * (len(buckets) + 2))
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @staticmethod
+    def _format_labels(labels: LabelValues, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        escaped = []
+        for key, value in pairs:
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            escaped.append(f'{key}="{value}"')
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4"""
+        lines: List[str] = []
+        with self._lock:
+            for name, (kind, description) in self._help.items():
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind == "counter":
+                    for labels, value in self._counters[name].items():
+                        lines.append(f"{name}{self._format_labels(labels)} {value}")
+                    continue
+                buckets = self._buckets[name]
+                for labels, series in self._histograms[name].items():
+                    for bound, count in zip(buckets, series):
+                        lines.append(f"{name}_bucket{self._format_labels(labels, (('le', str(bound)),))} {count}")
+                    lines.append(f"{name}_bucket{self._format_labels(labels, (('le', '+Inf'),))} {series[-1]}")
+                    lines.append(f"{name}_sum{self._format_labels(labels)} {series[-2]}")
+                    lines.append(f"{name}_count{self._format_labels(labels)} {series[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+metrics_registry.counter("http_requests_total", "HTTP requests by route and status code")
+metrics_registry.histogram("http_request_duration_seconds", "Total request latency", DURATION_BUCKETS)
+metrics_registry.histogram("http_request_db_statements", "SQL statements executed per request", STATEMENT_BUCKETS)
+metrics_registry.counter("http_request_db_seconds_total", "Time spent executing SQL statements")
+metrics_registry.counter("http_request_db_pool_wait_seconds_total", "Time spent waiting for a pooled connection")
+metrics_registry.counter("http_requests_over_statement_budget_total", "Requests that exceeded SQL_STATEMENT_BUDGET")
+metrics_registry.counter("catalog_cache_requests_total", "Catalog response cache lookups by result (hit, stale, coalesced, miss)")
+metrics_registry.histogram("admission_queue_wait_seconds", "Time spent waiting for an admission slot", QUEUE_WAIT_BUCKETS)
+metrics_registry.counter("admission_shed_total", "Requests refused with 503 by admission control")
@@ -0,0 +1,73 @@
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Optional
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only one profile runs at a time per worker; sampling is cheap but not free
+profile_lock = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _is_app_frame(frame) -> bool:
+    filename = frame.f_code.co_filename
+    return filename.startswith(APP_DIR) and filename != __file__
+
+
+class StackSampler:
+    """
+    Statistical profiler sampling every thread's stack from a background thread.
+
+    Unlike sys.setprofile it adds no per-call overhead to the code being
+    measured, so it is safe to run on a live worker. Output is the collapsed
+    stack format ("root;caller;callee count" per line) read by flamegraph.pl,
+    speedscope and similar tools.
+    """
+
+    def __init__(self, interval: float, app_only: bool = False):
+        self.interval = interval
+        self.app_only = app_only
+        self.samples = 0
+        self._counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> str:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.collapsed()
+
+    def _run(self) -> None:
+        sampler_id = threading.get_ident()
+        thread_names = {}
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_id:
+                    continue
+                stack = []
+                has_app_frame = False
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    has_app_frame = has_app_frame or _is_app_frame(frame)
+                    frame = frame.f_back
+                if self.app_only and not has_app_frame:
+                    continue
+                if thread_id not in thread_names:
+                    thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+                stack.append(thread_names.get(thread_id, str(thread_id)))
+                self._counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self._counts.most_common())
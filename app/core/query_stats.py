@@ -0,0 +1,143 @@
+import json
+import re
+import sys
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.config import settings, logger
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+|\$\d+))*\s*\)")
+_VALUES_ROWS = re.compile(r"(VALUES\s*\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+# Where the originating call is looked for, most specific first
+_ORIGIN_PACKAGES = ("app/repositories/", "app/services/", "app/")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so executions differing only in parameters group together"""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    # IN (?, ?, ?) and multi-row VALUES collapse regardless of list length
+    normalized = _PLACEHOLDER_LIST.sub("(...)", normalized)
+    normalized = _VALUES_ROWS.sub(r"\1", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def find_origin() -> Optional[str]:
+    """module:function of the nearest repository (else service, else app) frame on the stack"""
+    frames = []
+    frame = sys._getframe(1)
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    for package in _ORIGIN_PACKAGES:
+        for frame in frames:
+            filename = frame.f_code.co_filename.replace("\\", "/")
+            # app/core holds the instrumentation hooks themselves
+            if package in filename and "app/core/" not in filename:
+                name = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+                return f"{frame.f_globals.get('__name__', filename)}:{name}"
+    return None
+
+
+class _FingerprintStats:
+    __slots__ = ("count", "total", "max", "samples", "slow_count", "last_origin")
+
+    def __init__(self, sample_size: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: Deque[float] = deque(maxlen=sample_size)
+        self.slow_count = 0
+        self.last_origin: Optional[str] = None
+
+
+class QueryStats:
+    """
+    Bounded in-memory table of per-fingerprint timings.
+
+    p50/p95 come from the most recent executions of each fingerprint; when
+    the table is full the least recently seen fingerprint is evicted.
+    """
+
+    def __init__(self, max_fingerprints: int, sample_size: int, slow_threshold_ms: float):
+        self._max_fingerprints = max_fingerprints
+        self._sample_size = sample_size
+        self._slow_threshold = slow_threshold_ms / 1000
+        self._items: "OrderedDict[str, _FingerprintStats]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, duration: float) -> None:
+        key = fingerprint(statement)
+        slow = duration >= self._slow_threshold
+        # Walking the stack is only worth it for the statements we log
+        origin = find_origin() if slow else None
+
+        with self._lock:
+            stats = self._items.get(key)
+            if stats is None:
+                stats = self._items[key] = _FingerprintStats(self._sample_size)
+                while len(self._items) > self._max_fingerprints:
+                    self._items.popitem(last=False)
+            else:
+                self._items.move_to_end(key)
+            stats.count += 1
+            stats.total += duration
+            stats.max = max(stats.max, duration)
+            stats.samples.append(duration)
+            if slow:
+                stats.slow_count += 1
+                stats.last_origin = origin
+
+        if slow:
+            logger.warning(json.dumps({
+                "event": "slow_query",
+                "duration_ms": round(duration * 1000, 2),
+                "origin": origin,
+                "fingerprint": key,
+            }, ensure_ascii=False))
+
+    @staticmethod
+    def _percentile(sorted_samples: List[float], percentile: float) -> float:
+        if not sorted_samples:
+            return 0.0
+        index = min(len(sorted_samples) - 1, int(round(percentile * (len(sorted_samples) - 1))))
+        return sorted_samples[index]
+
+    def snapshot(self, sort_by: str = "total", limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = [
+                (key, stats.count, stats.total, stats.max, sorted(stats.samples), stats.slow_count, stats.last_origin)
+                for key, stats in self._items.items()
+            ]
+
+        rows = []
+        for key, count, total, max_duration, samples, slow_count, origin in items:
+            rows.append({
+                "fingerprint": key,
+                "count": count,
+                "total_ms": round(total * 1000, 2),
+                "p50_ms": round(self._percentile(samples, 0.5) * 1000, 2),
+                "p95_ms": round(self._percentile(samples, 0.95) * 1000, 2),
+                "max_ms": round(max_duration * 1000, 2),
+                "slow_count": slow_count,
+                "last_slow_origin": origin,
+            })
+        sort_key = {"total": "total_ms", "p95": "p95_ms", "max": "max_ms", "count": "count"}[sort_by]
+        rows.sort(key=lambda row: row[sort_key], reverse=True)
+        return rows[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+query_stats = QueryStats(
+    max_fingerprints=settings.QUERY_STATS_MAX_FINGERPRINTS,
+    sample_size=settings.QUERY_STATS_SAMPLE_SIZE,
+    slow_threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+)
@@ -0,0 +1,122 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.compression import compress
+from app.core.config import settings
+from app.core.events import event_bus, ProductsChanged
+
+_PRODUCT_DETAIL_PATH = re.compile(r"^/products/(\d+)$")
+
+
+class CachedResponse:
+    """A cached 200 response: the identity body plus every encoding served so far"""
+    __slots__ = ("headers", "body", "route", "expires_at", "stale_until", "encoded")
+
+    def __init__(self, headers: List[Tuple[bytes, bytes]], body: bytes, route, expires_at: float, stale_until: float):
+        self.headers = headers
+        self.body = body
+        self.route = route
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.encoded: Dict[str, bytes] = {}
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at > time.monotonic()
+
+    def body_for(self, encoding: str) -> bytes:
+        """Body in the given encoding, compressed on first use and kept with the entry"""
+        encoded = self.encoded.get(encoding)
+        if encoded is None:
+            # Two concurrent first requests may both compress; the results are identical
+            encoded = self.encoded[encoding] = compress(encoding, self.body, cached=True)
+        return encoded
+
+
+class ResponseCache:
+    """
+    Per-process LRU of rendered catalog responses with a TTL.
+
+    Keys are the path plus the normalized query string. Entries are dropped
+    when ProductsChanged names a product they may contain, so the TTL only
+    bounds staleness from changes this worker hears nothing about: edits
+    served by other workers, and stock and sold counts moving with orders.
+
+    Expired entries are kept for another stale_seconds so the middleware can
+    serve them while a single background render replaces them
+    (stale-while-revalidate); invalidation drops them outright.
+
+    Every invalidation bumps `generation`. A render captures it before it
+    starts and passes it to set, which does not store the response if an
+    invalidation happened in between, as its data may predate the change.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, stale_seconds: float = 0):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._items: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            now = time.monotonic()
+            if entry.stale_until <= now:
+                del self._items[key]
+                return None
+            if entry.expires_at <= now and not allow_stale:
+                return None
+            self._items.move_to_end(key)
+            return entry
+
+    def set(self, key: str, headers: List[Tuple[bytes, bytes]], body: bytes, route,
+            generation: Optional[int] = None) -> CachedResponse:
+        """Store and return an entry; with a generation older than the current one it is only returned"""
+        expires_at = time.monotonic() + self.ttl_seconds
+        entry = CachedResponse(headers, body, route, expires_at, expires_at + self.stale_seconds)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return entry
+            self._items[key] = entry
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return entry
+
+    def invalidate_products(self, product_ids: Iterable[int]) -> None:
+        """Drop the detail entries of these products and every listing, which may include them"""
+        ids = {str(product_id) for product_id in product_ids}
+        with self._lock:
+            self.generation += 1
+            for key in list(self._items):
+                match = _PRODUCT_DETAIL_PATH.match(key.split("?", 1)[0])
+                if match is None or match.group(1) in ids:
+                    del self._items[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._items.clear()
+
+
+catalog_cache = ResponseCache(
+    ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS,
+    max_entries=settings.CATALOG_CACHE_MAX_ENTRIES,
+    stale_seconds=settings.CATALOG_CACHE_STALE_SECONDS,
+)
+
+
+@event_bus.subscribe(ProductsChanged)
+async def invalidate_catalog_cache(event: ProductsChanged) -> None:
+    catalog_cache.invalidate_products(event.product_ids)
@@ -1,5 +1,7 @@
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
+import uuid
 from app.core.config import settings
 import jwt
 from fastapi import Depends, HTTPException, status
@@ -36,6 +38,34 @@ def create_reset_token(user_id: str):
     }
     return jwt.encode(payload, RESET_SECRET_KEY, algorithm="HS256")
 
+# Derived key, so a guest cart token can never pass as an access token or the reverse
+GUEST_CART_SECRET_KEY = f"{settings.SECRET_KEY}:guest-cart"
+
+def create_guest_cart_token(items: list, jti: Optional[str] = None) -> str:
+    """
+    Sign guest cart lines, [[product_id, size, color, quantity], ...]. The jti
+    names the cart across re-signs so a merge can consume it; a new cart gets one.
+    """
+    expired = datetime.now() + timedelta(days=settings.GUEST_CART_TTL_DAYS)
+    payload = {
+        "items": items,
+        "jti": jti or uuid.uuid4().hex,
+        "exp": int(expired.timestamp())
+    }
+    return jwt.encode(payload, GUEST_CART_SECRET_KEY, "HS256")
+
+def decode_guest_cart_token(token: str) -> Tuple[list, Optional[str]]:
+    """Lines and jti of a guest cart token; an expired cart comes back empty"""
+    if len(token) > settings.GUEST_CART_MAX_TOKEN_BYTES:
+        raise HTTPException(status_code=400, detail="Guest cart is too large")
+    try:
+        payload = jwt.decode(token, GUEST_CART_SECRET_KEY, algorithms=["HS256"])
+    except jwt.ExpiredSignatureError:
+        return [], None
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=400, detail="Invalid guest cart")
+    return payload.get("items", []), payload.get("jti")
+
 def decode_access_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
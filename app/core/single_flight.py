@@ -0,0 +1,52 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class FlightAborted(Exception):
+    """The call a waiter was sharing was cancelled before it produced a result"""
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into one.
+
+    The first caller for a key runs the call; everyone arriving while it is
+    in flight waits for and shares its result (or its exception). Nothing is
+    kept once the call finishes, so this only deduplicates concurrent work;
+    caching the result is up to the caller.
+
+    Lives on one event loop, like AdmissionController.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def wait(self, key: Hashable):
+        """Result of the call in flight for key"""
+        # A waiter giving up must not cancel the shared call
+        return await asyncio.shield(self._calls[key])
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn, or share the result of the identical call already in flight"""
+        if key in self._calls:
+            return await self.wait(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except BaseException as exc:
+            future.set_exception(exc if isinstance(exc, Exception) else FlightAborted())
+            # Mark retrieved so a call nobody waited on is not logged as unhandled
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
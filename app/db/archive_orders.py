@@ -0,0 +1,33 @@
+# app/db/archive_orders.py
+# Usage: python -m app.db.archive_orders [days]
+#
+# Moves delivered and cancelled orders older than ORDER_ARCHIVE_AFTER_DAYS (or
+# the given number of days) to orders_archive/order_items_archive in batches of
+# ORDER_ARCHIVE_BATCH_SIZE, one transaction per batch. Safe to interrupt and
+# rerun; schedule it nightly.
+import sys
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.repositories.order_archive_repository import OrderArchiveRepository
+
+
+def archive_orders(days: int) -> int:
+    cutoff = datetime.now() - timedelta(days=days)
+    db = SessionLocal()
+    total = 0
+    try:
+        while True:
+            moved = OrderArchiveRepository.archive_batch(db, cutoff, settings.ORDER_ARCHIVE_BATCH_SIZE)
+            if not moved:
+                break
+            total += moved
+            print(f"  … {total} orders archived")
+    finally:
+        db.close()
+    print(f"✓ Archived {total} orders created before {cutoff:%Y-%m-%d}")
+    return total
+
+
+if __name__ == "__main__":
+    archive_orders(int(sys.argv[1]) if len(sys.argv) > 1 else settings.ORDER_ARCHIVE_AFTER_DAYS)
@@ -1,16 +1,109 @@
-from sqlalchemy import create_engine
+import itertools
+import time
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_pool_wait
+from app.core.security import decode_access_token
 from app.models.role_model import seed_roles
 
 
 print("settings.SQLALCHEMY_DATABASE_URL", settings.SQLALCHEMY_DATABASE_URL)
 engine = create_engine(settings.SQLALCHEMY_DATABASE_URL)
+instrument_pool_wait(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read replicas; read-only endpoints take turns across them via get_read_db
+replica_engines = [create_engine(url) for url in settings.SQLALCHEMY_REPLICA_URLS]
+for replica_engine in replica_engines:
+    instrument_pool_wait(replica_engine)
+ReplicaSessionLocals = [
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) for replica_engine in replica_engines
+]
+_replica_sessions = itertools.cycle(ReplicaSessionLocals)
+
+# Set by ReadYourWritesMiddleware after a write; holds a unix timestamp
+PRIMARY_COOKIE = "db_primary_until"
+
+# The same deadline per authenticated user, for Bearer clients that keep no
+# cookies; held in worker memory, pruned of expired entries once it grows
+_user_primary_until: Dict[int, float] = {}
+_USER_PRIMARY_PRUNE_AT = 10000
+
+CART_VARIANT_INDEX = "ix_cart_items_cart_id_product_id_size_color"
+
+def check_cart_schema():
+    """
+    Refuse to start on a database whose cart tables predate the unique
+    variant index or the merged guest cart column. create_all never changes
+    an existing table, and the cart upserts and merges fail against one.
+    """
+    inspector = inspect(engine)
+    if inspector.has_table("cart_items"):
+        index = next((i for i in inspector.get_indexes("cart_items") if i["name"] == CART_VARIANT_INDEX), None)
+        if index is None or not index["unique"]:
+            raise RuntimeError(
+                f"cart_items.{CART_VARIANT_INDEX} is missing or not unique. "
+                "Stamp this database at the revision it was built at and run `alembic upgrade head` "
+                "(see Database Migrations in the README) before starting the app."
+            )
+    if inspector.has_table("carts") and "merged_guest_cart_jti" not in {
+        column["name"] for column in inspector.get_columns("carts")
+    }:
+        raise RuntimeError(
+            "carts.merged_guest_cart_jti is missing. Run `alembic upgrade head` "
+            "(see Database Migrations in the README) before starting the app."
+        )
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def bearer_user_id(authorization: Optional[str]) -> Optional[int]:
+    """User id from an Authorization: Bearer header; None when absent or invalid"""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return decode_access_token(token).get("user_id")
+    except HTTPException:
+        return None
+
+def pin_user_to_primary(user_id: int, until: float):
+    if len(_user_primary_until) >= _USER_PRIMARY_PRUNE_AT:
+        now = time.time()
+        for expired in [uid for uid, deadline in _user_primary_until.items() if deadline <= now]:
+            del _user_primary_until[expired]
+    _user_primary_until[user_id] = until
+
+def reads_pinned_to_primary(request: Request) -> bool:
+    """Whether this client wrote recently enough that a replica may not have its change yet"""
+    now = time.time()
+    user_id = bearer_user_id(request.headers.get("authorization"))
+    if user_id is not None and _user_primary_until.get(user_id, 0) > now:
+        return True
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > now
+    except ValueError:
+        return False
+
+def get_read_db(request: Request):
+    """
+    Session for read-only endpoints: the next replica, or the primary when no
+    replicas are configured or the client is pinned to it after a write.
+    Never write through it.
+    """
+    if ReplicaSessionLocals and not reads_pinned_to_primary(request):
+        db = next(_replica_sessions)()
+    else:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
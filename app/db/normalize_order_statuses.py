@@ -0,0 +1,15 @@
+# app/db/normalize_order_statuses.py
+# Usage: python -m app.db.normalize_order_statuses
+#
+# One-off data fix: rewrites mixed-case and legacy display statuses
+# ('Đã giao hàng', 'success') to OrderStatus values. Run it once on databases
+# with orders placed before statuses were normalized; rerunning is harmless.
+from app.db.base import SessionLocal
+from app.models.order_model import normalize_order_statuses
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        normalize_order_statuses(db)
+    finally:
+        db.close()
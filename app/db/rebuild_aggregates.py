@@ -0,0 +1,40 @@
+# app/db/rebuild_aggregates.py
+# Usage: python -m app.db.rebuild_aggregates [sales] [ratings]
+import sys
+from app.db.base import SessionLocal
+
+
+def rebuild_sales():
+    from app.services.analytics_service import AnalyticsService
+
+    db = SessionLocal()
+    try:
+        counted = AnalyticsService.rebuild(db)
+        print(f"✓ Sales rollups rebuilt from {counted} orders")
+    finally:
+        db.close()
+
+
+def rebuild_ratings():
+    from app.repositories.product_rating_repository import ProductRatingRepository
+
+    db = SessionLocal()
+    try:
+        products = ProductRatingRepository.rebuild(db)
+        print(f"✓ Rating summaries rebuilt for {products} products")
+    finally:
+        db.close()
+
+
+REBUILDERS = {
+    "sales": rebuild_sales,
+    "ratings": rebuild_ratings,
+}
+
+if __name__ == "__main__":
+    targets = sys.argv[1:] or list(REBUILDERS)
+    for target in targets:
+        if target not in REBUILDERS:
+            print(f"Unknown aggregate '{target}', expected one of: {', '.join(REBUILDERS)}")
+            sys.exit(1)
+        REBUILDERS[target]()
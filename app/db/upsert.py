@@ -0,0 +1,109 @@
+from typing import Any, Dict, List, Optional, Sequence, Type
+from sqlalchemy import and_, insert, update
+from sqlalchemy.orm import Session
+
+
+def insert_or_increment(
+    db: Session,
+    model: Type[Any],
+    keys: Dict[str, Any],
+    increments: Dict[str, Any],
+    values: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Insert a row, or add `increments` to the existing row with the same
+    unique `keys`, in a single statement (ON CONFLICT / ON DUPLICATE KEY).
+    `values` are written on insert and overwritten on conflict. Does not commit.
+    """
+    table = model.__table__
+    row = {**keys, **increments, **(values or {})}
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table).values(**row)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={
+                **{column: table.c[column] + stmt.excluded[column] for column in increments},
+                **{column: stmt.excluded[column] for column in (values or {})},
+            },
+        )
+        db.execute(stmt)
+        return
+
+    if dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert as dialect_insert
+        stmt = dialect_insert(table).values(**row)
+        stmt = stmt.on_duplicate_key_update(
+            **{column: table.c[column] + stmt.inserted[column] for column in increments},
+            **{column: stmt.inserted[column] for column in (values or {})},
+        )
+        db.execute(stmt)
+        return
+
+    # Generic fallback: update first, insert when nothing matched
+    match = and_(*(table.c[column] == value for column, value in keys.items()))
+    result = db.execute(
+        update(table)
+        .where(match)
+        .values(**{column: table.c[column] + amount for column, amount in increments.items()}, **(values or {}))
+    )
+    if result.rowcount == 0:
+        db.execute(insert(table).values(**row))
+
+
+def insert_or_increment_many(
+    db: Session,
+    model: Type[Any],
+    rows: List[Dict[str, Any]],
+    keys: Sequence[str],
+    increments: Sequence[str],
+    values: Sequence[str] = (),
+) -> None:
+    """
+    insert_or_increment for many rows in one multi-row statement. Each row
+    holds its `keys`, `increments` and `values` columns; keys must be distinct
+    across rows. Does not commit.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={
+                **{column: table.c[column] + stmt.excluded[column] for column in increments},
+                **{column: stmt.excluded[column] for column in values},
+            },
+        )
+        db.execute(stmt)
+        return
+
+    if dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert as dialect_insert
+        stmt = dialect_insert(table).values(rows)
+        stmt = stmt.on_duplicate_key_update(
+            **{column: table.c[column] + stmt.inserted[column] for column in increments},
+            **{column: stmt.inserted[column] for column in values},
+        )
+        db.execute(stmt)
+        return
+
+    for row in rows:
+        insert_or_increment(
+            db, model,
+            keys={column: row[column] for column in keys},
+            increments={column: row[column] for column in increments},
+            values={column: row[column] for column in values},
+        )
@@ -1,9 +1,9 @@
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from app.db.base import get_db, engine, SessionLocal
+from app.db.base import get_db, engine, SessionLocal, check_cart_schema
 from app.models import Base
 from app.routers.product_router import router as product_router
 from app.routers.user_router import router as user_router_router
@@ -15,10 +15,19 @@ from app.routers.category_router import router as category_router
 from app.routers.cart_router import router as cart_router
 from app.routers.order_router import router as order_router
 from app.routers.payment_router import router as payment_router
+from app.routers.analytics_router import router as analytics_router
+from app.routers.metrics_router import router as metrics_router
+from app.routers.diagnostics_router import router as diagnostics_router
 from app.models.role_model import seed_roles
 from app.models.user_model import seed_admin
+from app.core.events import event_bus
+from app.services.payment_gateway import payment_gateway
+import app.services.notification_service  # noqa: F401 - registers event subscribers
+import app.services.analytics_service  # noqa: F401 - registers event subscribers
 
-# Create tables and seed data on startup
+# Create tables and seed data on startup; an existing database has to be
+# migrated first where create_all cannot change it
+check_cart_schema()
 Base.metadata.create_all(bind=engine)
 db = SessionLocal()
 try:
@@ -30,8 +39,22 @@ finally:
 app = FastAPI(
     title="SHOES SHOP BABA",
     description="BABA SHOES SHOP API Documentation",
+    # orjson encodes the already-serialized response_model output several times faster than json.dumps
+    default_response_class=ORJSONResponse,
 )
 
+@app.on_event("startup")
+async def start_event_bus():
+    await event_bus.start()
+
+@app.on_event("shutdown")
+async def stop_event_bus():
+    await event_bus.stop()
+
+@app.on_event("shutdown")
+async def close_payment_gateway():
+    await payment_gateway.close()
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     error_messages = []
@@ -42,7 +65,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         error_messages.append(f"{field}: {msg}")
     
     full_message = " | ".join(error_messages)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={
             "code": "422",
@@ -53,7 +76,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "code": str(exc.status_code),
@@ -62,10 +85,33 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
         }
     )
 
+# Read-your-writes stickiness when read replicas are configured; innermost so
+# it reads the uncompressed body to tell a failed write from a successful one
+from app.middleware.replica import setup_read_replicas
+setup_read_replicas(app)
+
+# Compression, admission control and the catalog response cache; set up
+# before CORS so they run inside it (cached responses never carry another
+# origin's CORS headers, 503s still get them) and in that order so cache hits
+# never wait for an admission slot
+from app.middleware.compression import setup_compression, setup_catalog_cache
+from app.middleware.admission import setup_admission_control
+setup_compression(app)
+setup_admission_control(app)
+setup_catalog_cache(app)
+
 # CORS configuration for frontend
 from app.middleware.cors import setup_cors
 setup_cors(app)
 
+# Per-request SQL/latency instrumentation
+from app.middleware.metrics import setup_metrics
+setup_metrics(app)
+
+# Admin ?profile=1 sampling profiler
+from app.middleware.profiling import setup_profiling
+setup_profiling(app)
+
 app.include_router(product_router)
 app.include_router(user_router_router)
 app.include_router(review_router)
@@ -76,6 +122,9 @@ app.include_router(category_router)
 app.include_router(cart_router)
 app.include_router(order_router)
 app.include_router(payment_router)
+app.include_router(analytics_router)
+app.include_router(metrics_router)
+app.include_router(diagnostics_router)
 
 @app.get("/home")
 async def root():
@@ -0,0 +1,97 @@
+import time
+from typing import Optional
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.admission import AdmissionController, RouteClassBudget
+from app.core.config import settings, logger
+from app.core.metrics import metrics_registry
+
+CATALOG_PREFIXES = ("/products", "/categories", "/brands", "/reviews")
+# Catalog paths customers write to; admins moderate reviews under /reviews/admin
+CUSTOMER_WRITE_PREFIXES = ("/reviews",)
+CHECKOUT_PREFIXES = ("/api/payments", "/api/cart")
+ADMIN_PREFIXES = ("/api/admin", "/api/analytics", "/api/orders/search", "/products/import", "/products/export", "/products/bulk")
+# Never queued: health, scraping and docs must answer during overload
+EXEMPT_PATHS = ("/home", "/metrics", "/docs", "/redoc", "/openapi.json")
+
+
+def classify(scope: Scope) -> Optional[str]:
+    """Route class of a request, None for paths that bypass admission control"""
+    path = scope["path"]
+    method = scope["method"]
+    if path in EXEMPT_PATHS:
+        return None
+    if "/admin" in path or path.startswith(ADMIN_PREFIXES):
+        return "admin"
+    if path.startswith(CHECKOUT_PREFIXES) or (path.startswith("/api/orders") and method != "GET"):
+        return "checkout"
+    if path.startswith(CATALOG_PREFIXES):
+        if method in ("GET", "HEAD"):
+            return "catalog"
+        # Other catalog writes are admin operations
+        return "default" if path.startswith(CUSTOMER_WRITE_PREFIXES) else "admin"
+    return "default"
+
+
+class AdmissionControlMiddleware:
+    """
+    Load shedding: bound concurrent requests per route class so overload
+    queues briefly and then fails fast with 503 + Retry-After, instead of
+    piling onto the DB pool until latency collapses for everyone.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController, retry_after: int):
+        self.app = app
+        self.controller = controller
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route_class = classify(scope) if scope["type"] == "http" else None
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        reason = await self.controller.acquire(route_class)
+        metrics_registry.observe(
+            "admission_queue_wait_seconds", {"class": route_class}, time.perf_counter() - started_at
+        )
+        if reason is not None:
+            metrics_registry.inc("admission_shed_total", {"class": route_class, "reason": reason})
+            logger.warning("Shed %s %s (%s, %s)", scope["method"], scope["path"], route_class, reason)
+            response = ORJSONResponse(
+                status_code=503,
+                content={"code": "503", "message": "Server is busy, please retry shortly", "data": None},
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route_class)
+
+
+def setup_admission_control(app: FastAPI):
+    if not settings.ADMISSION_CONTROL_ENABLED:
+        return
+    queue_size = settings.ADMISSION_QUEUE_SIZE
+    max_wait = settings.ADMISSION_MAX_WAIT_SECONDS
+    controller = AdmissionController(
+        budgets={
+            "checkout": RouteClassBudget(
+                settings.ADMISSION_CHECKOUT_CONCURRENCY, queue_size, settings.ADMISSION_CHECKOUT_MAX_WAIT_SECONDS, 0
+            ),
+            "default": RouteClassBudget(settings.ADMISSION_DEFAULT_CONCURRENCY, queue_size, max_wait, 1),
+            "catalog": RouteClassBudget(settings.ADMISSION_CATALOG_CONCURRENCY, queue_size, max_wait, 2),
+            "admin": RouteClassBudget(settings.ADMISSION_ADMIN_CONCURRENCY, queue_size, max_wait, 3),
+        },
+        max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+    )
+    app.add_middleware(
+        AdmissionControlMiddleware, controller=controller, retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS
+    )
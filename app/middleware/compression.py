@@ -0,0 +1,259 @@
+import asyncio
+from typing import Optional, Set
+from urllib.parse import parse_qsl, urlencode
+
+import anyio
+from fastapi import FastAPI
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.compression import compress, is_compressible, negotiate, route_allows_compression
+from app.core.config import settings, logger
+from app.core.metrics import metrics_registry
+from app.core.response_cache import CachedResponse, ResponseCache, catalog_cache
+from app.core.single_flight import SingleFlight
+
+# Listing, batch and detail pages; /products/export, /products/import etc. are not cached.
+# Batch pages are dropped on any product change, like listings.
+CACHEABLE_PATHS = ("/products", "/products/batch")
+CACHEABLE_PREFIX = "/products/"
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with the best encoding the client accepts
+    (zstd, br, gzip, in that order when equally weighted).
+
+    Only compressible media types at or above minimum_size are touched.
+    Streamed responses (exports, import progress) pass through unchanged
+    so their chunks still reach the client as they are produced.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether the response is streamed
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(scope=start)
+            if is_compressible(headers.get("content-type")):
+                headers.add_vary_header("Accept-Encoding")
+            if (
+                not message.get("more_body")
+                and self._should_compress(scope, start, headers, body)
+            ):
+                compressed = compress(encoding, body)
+                if len(compressed) < len(body):
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(compressed))
+                    message = {**message, "body": compressed}
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    def _should_compress(self, scope: Scope, start: Message, headers: MutableHeaders, body: bytes) -> bool:
+        return (
+            start["status"] not in (204, 304)
+            and len(body) >= self.minimum_size
+            and "content-encoding" not in headers
+            and is_compressible(headers.get("content-type"))
+            and route_allows_compression(scope.get("route"))
+        )
+
+
+class CatalogCacheMiddleware:
+    """
+    Serve GET /products and /products/{id} from the catalog response cache.
+
+    A miss renders the response uncompressed and stores it; each encoding is
+    then compressed once, at the strongest level, and kept next to the
+    identity body, so hits never compress again. Must run inside CORS: the
+    stored headers are the app's own, and CORS adds per-origin ones on top.
+
+    Identical misses arriving while one render is in flight wait for it and
+    share its entry instead of each running the query. An expired entry is
+    still served during the cache's stale window while one background render
+    replaces it, so a popular page expiring never stalls its readers.
+    """
+
+    def __init__(self, app: ASGIApp, cache: ResponseCache, minimum_size: int, compression_enabled: bool):
+        self.app = app
+        self.cache = cache
+        self.minimum_size = minimum_size
+        self.compression_enabled = compression_enabled
+        self.flights = SingleFlight()
+        # Strong references, so background refreshes are not garbage collected mid-flight
+        self._refreshes: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def _cache_key(scope: Scope) -> Optional[str]:
+        path = scope["path"]
+        if scope["method"] != "GET":
+            return None
+        if path not in CACHEABLE_PATHS and not (path.startswith(CACHEABLE_PREFIX) and path[len(CACHEABLE_PREFIX):].isdigit()):
+            return None
+        params = sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+        # Profiled requests must reach the app
+        if any(name == "profile" for name, _ in params):
+            return None
+        return f"{path}?{urlencode(params)}" if params else path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = self._cache_key(scope) if scope["type"] == "http" else None
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        if self.compression_enabled:
+            encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+
+        entry = self.cache.get(key, allow_stale=True)
+        if entry is not None:
+            if entry.fresh:
+                result = "HIT"
+            else:
+                result = "STALE"
+                if key not in self.flights:
+                    self._start_refresh(scope, key)
+            metrics_registry.inc("catalog_cache_requests_total", {"result": result.lower()})
+            # Keep per-route metrics labelled as if the route had run
+            scope["route"] = entry.route
+            await self._send_entry(entry, encoding, send, result)
+            return
+
+        if key in self.flights:
+            try:
+                entry = await self.flights.wait(key)
+            except Exception:
+                # The shared render failed; let this request try on its own
+                entry = None
+            if entry is not None:
+                metrics_registry.inc("catalog_cache_requests_total", {"result": "coalesced"})
+                scope["route"] = entry.route
+                await self._send_entry(entry, encoding, send, "HIT")
+                return
+
+        metrics_registry.inc("catalog_cache_requests_total", {"result": "miss"})
+        await self.flights.do(key, lambda: self._render(scope, receive, send, key, encoding))
+
+    async def _render(
+        self, scope: Scope, receive: Receive, send: Send, key: str, encoding: Optional[str]
+    ) -> Optional[CachedResponse]:
+        """Run the app, store a cacheable response and send it; returns the new entry, if any"""
+        # Render uncompressed; the inner CompressionMiddleware must not see Accept-Encoding
+        inner_scope = {**scope, "headers": [(k, v) for k, v in scope["headers"] if k != b"accept-encoding"]}
+        # An invalidation during the render means its data may predate the change
+        generation = self.cache.generation
+        start_message: Optional[Message] = None
+        body = b""
+        streaming = False
+
+        async def capture(message: Message) -> None:
+            nonlocal start_message, body, streaming
+            if message["type"] == "http.response.start":
+                start_message = message
+            elif message["type"] != "http.response.body":
+                await send(message)
+            elif streaming or message.get("more_body"):
+                if not streaming:
+                    streaming = True
+                    await send(start_message)
+                await send(message)
+            else:
+                body = message.get("body", b"")
+
+        await self.app(scope=inner_scope, receive=receive, send=capture)
+        scope["route"] = inner_scope.get("route")
+        if streaming or start_message is None:
+            return None
+
+        headers = Headers(raw=start_message["headers"])
+        if start_message["status"] != 200 or not is_compressible(headers.get("content-type")):
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+            return None
+
+        stored_headers = [(k, v) for k, v in start_message["headers"] if k != b"content-length"]
+        entry = self.cache.set(key, stored_headers, body, scope["route"], generation)
+        await self._send_entry(entry, encoding, send, "MISS")
+        return entry
+
+    def _start_refresh(self, scope: Scope, key: str) -> None:
+        # The client is served the stale entry right away; the re-render runs
+        # detached from its request, with an empty body and nowhere to send to
+        refresh_scope = {**scope, "state": dict(scope.get("state", {}))}
+        request_sent = False
+
+        async def receive() -> Message:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            return {"type": "http.disconnect"}
+
+        async def discard(message: Message) -> None:
+            pass
+
+        async def refresh() -> None:
+            try:
+                await self.flights.do(key, lambda: self._render(refresh_scope, receive, discard, key, None))
+            except Exception:
+                logger.exception("Background refresh of %s failed", key)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    async def _send_entry(self, entry: CachedResponse, encoding: Optional[str], send: Send, cache_status: str) -> None:
+        body = entry.body
+        headers = MutableHeaders(raw=list(entry.headers))
+        if encoding is not None and len(body) >= self.minimum_size and route_allows_compression(entry.route):
+            if encoding not in entry.encoded:
+                # Strongest levels are slow on large pages; keep them off the event loop
+                await anyio.to_thread.run_sync(entry.body_for, encoding)
+            body = entry.encoded[encoding]
+            headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(body))
+        headers.add_vary_header("Accept-Encoding")
+        headers["X-Cache"] = cache_status
+        await send({"type": "http.response.start", "status": 200, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body})
+
+
+def setup_compression(app: FastAPI):
+    # Added first so it sits innermost and outer middleware sees the final body
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+
+def setup_catalog_cache(app: FastAPI):
+    if catalog_cache.enabled:
+        app.add_middleware(
+            CatalogCacheMiddleware,
+            cache=catalog_cache,
+            minimum_size=settings.COMPRESSION_MIN_SIZE,
+            compression_enabled=settings.COMPRESSION_ENABLED,
+        )
@@ -0,0 +1,79 @@
+import time
+
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings, logger
+from app.core.metrics import (
+    metrics_registry, start_request_metrics, current_request_metrics, reset_request_metrics
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    Per-request SQL statement count, DB time, pool wait and total latency.
+
+    Figures are returned in a Server-Timing header (visible in browser dev
+    tools) and aggregated into the Prometheus metrics served at /metrics.
+    Requests that run more than SQL_STATEMENT_BUDGET statements are logged,
+    which is usually an N+1 query in a service loop.
+    """
+
+    def __init__(self, app: ASGIApp, statement_budget: int):
+        self.app = app
+        self.statement_budget = statement_budget
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        token = start_request_metrics()
+        metrics = current_request_metrics()
+        started_at = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total_ms = (time.perf_counter() - started_at) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", ", ".join([
+                    f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.statements} queries"',
+                    f"pool;dur={metrics.pool_wait * 1000:.1f}",
+                    f"total;dur={total_ms:.1f}",
+                ]))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            reset_request_metrics(token)
+            self._record(scope, status_code, time.perf_counter() - started_at, metrics)
+
+    def _record(self, scope: Scope, status_code: int, duration: float, metrics) -> None:
+        route = scope.get("route")
+        # Route templates, not raw paths, keep the label set bounded
+        path = route.path if route is not None else "unmatched"
+        method = scope["method"]
+        labels = {"method": method, "route": path}
+
+        metrics_registry.inc("http_requests_total", {**labels, "status": str(status_code)})
+        metrics_registry.observe("http_request_duration_seconds", labels, duration)
+        metrics_registry.observe("http_request_db_statements", labels, metrics.statements)
+        metrics_registry.inc("http_request_db_seconds_total", labels, metrics.db_time)
+        metrics_registry.inc("http_request_db_pool_wait_seconds_total", labels, metrics.pool_wait)
+
+        if metrics.statements > self.statement_budget:
+            metrics_registry.inc("http_requests_over_statement_budget_total", labels)
+            logger.warning(
+                "%s %s ran %d SQL statements (budget %d, %.1f ms in DB)",
+                method, path, metrics.statements, self.statement_budget, metrics.db_time * 1000
+            )
+
+
+def setup_metrics(app: FastAPI):
+    if settings.METRICS_ENABLED:
+        app.add_middleware(RequestMetricsMiddleware, statement_budget=settings.SQL_STATEMENT_BUDGET)
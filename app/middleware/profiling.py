@@ -0,0 +1,79 @@
+from urllib.parse import parse_qs
+
+from fastapi import FastAPI, HTTPException
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.profiler import StackSampler, profile_lock
+from app.core.security import decode_access_token
+
+
+class RequestProfilerMiddleware:
+    """
+    ?profile=1 on any request made with an admin token returns a collapsed-stack
+    profile of that request instead of its response body.
+
+    Samples come from every thread running app code while the request is in
+    flight, so profile on a quiet worker to avoid mixing in other requests.
+    """
+
+    def __init__(self, app: ASGIApp, interval: float):
+        self.app = app
+        self.interval = interval
+
+    @staticmethod
+    def _is_admin(scope: Scope) -> bool:
+        authorization = Headers(scope=scope).get("authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        try:
+            return decode_access_token(token).get("role") == "admin"
+        except HTTPException:
+            return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or b"profile=1" not in scope.get("query_string", b""):
+            await self.app(scope, receive, send)
+            return
+        query = parse_qs(scope["query_string"].decode("latin-1"))
+        if query.get("profile") != ["1"] or not self._is_admin(scope):
+            await self.app(scope, receive, send)
+            return
+        if not profile_lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def discard_response(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        sampler = StackSampler(self.interval, app_only=True)
+        sampler.start()
+        try:
+            await self.app(scope, receive, discard_response)
+        finally:
+            profile = sampler.stop()
+            profile_lock.release()
+
+        body = profile.encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-profile-samples", str(sampler.samples).encode()),
+                (b"x-profile-response-status", str(status_code).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def setup_profiling(app: FastAPI):
+    if settings.PROFILING_ENABLED:
+        app.add_middleware(RequestProfilerMiddleware, interval=settings.PROFILER_INTERVAL_MS / 1000)
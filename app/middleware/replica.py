@@ -0,0 +1,94 @@
+import time
+from typing import List, Optional
+
+import orjson
+from fastapi import FastAPI
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.base import PRIMARY_COOKIE, ReplicaSessionLocals, bearer_user_id, pin_user_to_primary
+from app.schemas.base_schema import is_success_code
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def succeeded(status: int, body: bytes) -> bool:
+    """
+    Whether a write went through: a status below 400 and, for a JSON body, a
+    success code (see is_success_code).
+    """
+    if status >= 400:
+        return False
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return True
+    return is_success_code(payload.get("code") if isinstance(payload, dict) else None)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin a client to the primary for a few seconds after a successful write.
+
+    The deadline travels in a cookie rather than worker memory, so a browser's
+    next request sees it whichever worker serves it. Bearer clients are also
+    pinned by user id in this worker's memory; get_read_db honours both. A
+    Bearer client whose next read lands on another worker reads from a
+    replica, bounded by replica lag.
+    """
+
+    def __init__(self, app: ASGIApp, sticky_seconds: int):
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+
+        async def send_with_cookie(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                content_type = Headers(raw=message["headers"]).get("content-type", "")
+                if message["status"] < 400 and content_type.startswith("application/json"):
+                    # Hold the response until the body shows whether the write succeeded
+                    start = message
+                    return
+                if message["status"] < 400:
+                    self._pin(scope, message)
+                await send(message)
+                return
+
+            if start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            if succeeded(start["status"], body):
+                self._pin(scope, start)
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_with_cookie)
+
+    def _pin(self, scope: Scope, message: Message) -> None:
+        until = int(time.time()) + self.sticky_seconds
+        user_id = bearer_user_id(Headers(scope=scope).get("authorization"))
+        if user_id is not None:
+            pin_user_to_primary(user_id, until)
+        headers = MutableHeaders(scope=message)
+        headers.append(
+            "Set-Cookie",
+            f"{PRIMARY_COOKIE}={until}; Max-Age={self.sticky_seconds}; Path=/; HttpOnly; SameSite=Lax",
+        )
+
+
+def setup_read_replicas(app: FastAPI):
+    if ReplicaSessionLocals and settings.REPLICA_STICKY_SECONDS > 0:
+        app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=settings.REPLICA_STICKY_SECONDS)
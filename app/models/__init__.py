@@ -6,8 +6,14 @@ from app.models.address_model import Address
 from app.models.brand_model import Brand
 from app.models.category_model import Category
 from app.models.order_model import Order, OrderItem
+from app.models.order_archive_model import ArchivedOrder, ArchivedOrderItem, ArchivedProductSales
 from app.models.cart_model import Cart, CartItem
 from app.models.review_model import Review
+from app.models.outbox_model import OutboxEvent
+from app.models.idempotency_model import IdempotencyKey
+from app.models.payment_event_model import PaymentEvent
+from app.models.analytics_model import DailyProductSales, DailySales, SalesRollupOrder
+from app.models.product_rating_model import ProductRatingSummary
 
 __all__ = [
     "Base",
@@ -20,7 +26,17 @@ __all__ = [
     "Category",
     "Order",
     "OrderItem",
+    "ArchivedOrder",
+    "ArchivedOrderItem",
+    "ArchivedProductSales",
     "Cart",
     "CartItem",
     "Review",
+    "OutboxEvent",
+    "IdempotencyKey",
+    "PaymentEvent",
+    "DailyProductSales",
+    "DailySales",
+    "SalesRollupOrder",
+    "ProductRatingSummary",
 ]
\ No newline at end of file
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey, UniqueConstraint
+from datetime import datetime
+from app.models.base_model import Base, BaseModel
+
+
+class DailyProductSales(BaseModel):
+    """Revenue/units/orders per product per order day, maintained incrementally"""
+    __tablename__ = "daily_product_sales"
+    __table_args__ = (
+        UniqueConstraint("day", "product_id", name="uq_daily_product_sales_day_product"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)
+    product_id = Column(Integer, nullable=False, index=True)
+    brand_id = Column(Integer, nullable=True)
+    category_id = Column(Integer, nullable=True)
+    revenue = Column(Float, nullable=False, default=0)
+    units = Column(Integer, nullable=False, default=0)
+    orders = Column(Integer, nullable=False, default=0)
+
+
+class DailySales(Base):
+    """Store-wide revenue/units/orders per order day"""
+    __tablename__ = "daily_sales"
+
+    day = Column(Date, primary_key=True)
+    revenue = Column(Float, nullable=False, default=0)
+    units = Column(Integer, nullable=False, default=0)
+    orders = Column(Integer, nullable=False, default=0)
+
+
+class SalesRollupOrder(Base):
+    """Orders currently counted in the sales rollups; makes rollup updates idempotent"""
+    __tablename__ = "sales_rollup_orders"
+
+    order_id = Column(Integer, ForeignKey("orders.id"), primary_key=True)
+    counted_at = Column(DateTime, default=datetime.now)
@@ -15,4 +15,4 @@ class Base:
 class BaseModel(Base):
     __abstract__ = True
     __allow_unmapped__ = True
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime, Integer, ForeignKey
+from sqlalchemy import Column, String, Float, DateTime, Integer, ForeignKey, Index
 from datetime import datetime
 from app.models.base_model import BaseModel
 
@@ -6,20 +6,27 @@ from app.models.base_model import BaseModel
 class Cart(BaseModel):
     __tablename__ = "carts"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, unique=True, index=True)
-    created_at = Column(DateTime, index=True, default=datetime.now)
-    updated_at = Column(DateTime, index=True, default=datetime.now, onupdate=datetime.now)
+    # jti of the last guest cart merged in; merging the same token again is a no-op
+    merged_guest_cart_jti = Column(String(32), nullable=True)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
 
 class CartItem(BaseModel):
     __tablename__ = "cart_items"
     
-    id = Column(Integer, primary_key=True, index=True)
-    cart_id = Column(Integer, ForeignKey("carts.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    cart_id = Column(Integer, ForeignKey("carts.id"), nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
     quantity = Column(Integer, nullable=False, default=1)
     size = Column(Integer, nullable=True)
     color = Column(String(50), nullable=True)
-    created_at = Column(DateTime, index=True, default=datetime.now)
-    updated_at = Column(DateTime, index=True, default=datetime.now, onupdate=datetime.now)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        # One line per cart + product + variant; the upsert when adding to cart conflicts on it
+        Index("ix_cart_items_cart_id_product_id_size_color", "cart_id", "product_id", "size", "color", unique=True),
+    )
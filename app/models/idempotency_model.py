@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON, UniqueConstraint
+from datetime import datetime
+from app.models.base_model import BaseModel
+
+
+class IdempotencyKey(BaseModel):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "scope", "key", name="uq_idempotency_keys_user_scope_key"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    scope = Column(String(100), nullable=False)
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    status = Column(String(20), nullable=False, default="in_progress")  # in_progress, completed
+    response = Column(JSON, nullable=True)
+    created_at = Column(DateTime, default=datetime.now, index=True)
@@ -0,0 +1,60 @@
+from sqlalchemy import Column, String, Float, DateTime, Integer, ForeignKey, JSON, Index
+from sqlalchemy.orm import relationship
+from app.models.base_model import Base, BaseModel
+
+
+class ArchivedOrder(BaseModel):
+    """Delivered/cancelled orders past ORDER_ARCHIVE_AFTER_DAYS, moved out of orders with their ids"""
+    __tablename__ = "orders_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    user = relationship("User")
+    items = relationship("ArchivedOrderItem", back_populates="order")
+
+    delivery_address = Column(JSON, nullable=False)
+    order_date = Column(DateTime)
+    total_amount = Column(Float, nullable=False)
+    status = Column(String(50))
+    payment_status = Column(String(50))
+    payment_intent_id = Column(String(255), nullable=True)
+    payment_method = Column(String(50))
+    created_at = Column(DateTime, index=True)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # Same access paths as the live table
+        Index("ix_orders_archive_user_id_created_at", "user_id", "created_at"),
+        Index("ix_orders_archive_status_created_at", "status", "created_at"),
+    )
+
+
+class ArchivedOrderItem(BaseModel):
+    __tablename__ = "order_items_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    order_id = Column(Integer, ForeignKey("orders_archive.id"), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+
+    order = relationship("ArchivedOrder", back_populates="items")
+    product = relationship("Product")
+
+    product_name = Column(String(255), nullable=False)
+    size = Column(Integer, nullable=True)
+    color = Column(String(50), nullable=True)
+    quantity = Column(Integer, nullable=False)
+    price_at_purchase = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index("ix_order_items_archive_product_id_order_id", "product_id", "order_id"),
+    )
+
+
+class ArchivedProductSales(Base):
+    """Units per product in archived order items, so sold counts never read the archive"""
+    __tablename__ = "archived_product_sales"
+
+    product_id = Column(Integer, primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
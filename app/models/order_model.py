@@ -1,36 +1,55 @@
-from sqlalchemy import Column, String, Float, DateTime, Integer, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+import enum
+from sqlalchemy import Column, String, Float, DateTime, Integer, ForeignKey, JSON, Index, func
+from sqlalchemy.orm import relationship, Session
 from datetime import datetime
 from app.models.base_model import BaseModel
 
 
+class OrderStatus(str, enum.Enum):
+    """Canonical order statuses; stored lowercase so queries can compare them directly"""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    SHIPPED = "shipped"
+    DELIVERED = "delivered"
+    CANCELLED = "cancelled"
+
+
 class Order(BaseModel):
     __tablename__ = "orders"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Relationship to user
     user = relationship("User", backref="orders")
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
     
     delivery_address = Column(JSON, nullable=False)  # Address object as JSON
-    order_date = Column(DateTime, index=True, default=datetime.now)
-    total_amount = Column(Float, nullable=False, index=True)
-    status = Column(String(50), index=True, default="pending")  # pending, processing, shipped, delivered, cancelled
-    payment_status = Column(String(50), index=True, default="pending")  # pending, completed, failed, refunded
-    payment_intent_id = Column(String(255), nullable=True, index=True)  # Stripe payment intent ID
+    order_date = Column(DateTime, default=datetime.now)
+    total_amount = Column(Float, nullable=False)
+    status = Column(String(50), default="pending")  # pending, processing, shipped, delivered, cancelled
+    payment_status = Column(String(50), default="pending")  # pending, completed, failed, refunded
+    payment_intent_id = Column(String(255), nullable=True, unique=True, index=True)  # Stripe payment intent ID
     payment_method = Column(String(50), default="stripe")  # stripe, cash_on_delivery
     created_at = Column(DateTime, index=True, default=datetime.now)
-    updated_at = Column(DateTime, index=True, default=datetime.now, onupdate=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        # Order history: WHERE user_id = ? ORDER BY created_at DESC
+        Index("ix_orders_user_id_created_at", "user_id", "created_at"),
+        # Purchase checks filter orders by user and status
+        Index("ix_orders_user_id_status", "user_id", "status"),
+        # Admin search by status, newest first
+        Index("ix_orders_status_created_at", "status", "created_at"),
+    )
     
 
 class OrderItem(BaseModel):
     __tablename__ = "order_items"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
-    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     
     order = relationship("Order", back_populates="items")
     product = relationship("Product", backref="order_items")
@@ -42,4 +61,30 @@ class OrderItem(BaseModel):
     price_at_purchase = Column(Float, nullable=False)
     
 
+    __table_args__ = (
+        # Lets purchase checks go from product to its orders without touching the table
+        Index("ix_order_items_product_id_order_id", "product_id", "order_id"),
+    )
+
+
+# Display strings older clients stored instead of the canonical value
+LEGACY_ORDER_STATUSES = {
+    "đã giao hàng": OrderStatus.DELIVERED,
+    "success": OrderStatus.DELIVERED,
+}
+
 
+def normalize_order_statuses(db: Session):
+    """Rewrite mixed-case and legacy status strings to OrderStatus values"""
+    updated = 0
+    for legacy, order_status in LEGACY_ORDER_STATUSES.items():
+        updated += db.query(Order).filter(func.lower(Order.status) == legacy).update(
+            {Order.status: order_status.value}, synchronize_session=False
+        )
+    for order_status in OrderStatus:
+        updated += db.query(Order).filter(
+            func.lower(Order.status) == order_status.value,
+            Order.status != order_status.value
+        ).update({Order.status: order_status.value}, synchronize_session=False)
+    db.commit()
+    print(f"✓ Normalized status of {updated} orders")
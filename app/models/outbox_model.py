@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON
+from datetime import datetime
+from app.models.base_model import BaseModel
+
+
+class OutboxEvent(BaseModel):
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True)
+    event_type = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
+    processed_at = Column(DateTime, nullable=True, index=True)
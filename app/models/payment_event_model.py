@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON
+from datetime import datetime
+from app.models.base_model import BaseModel
+
+
+class PaymentEvent(BaseModel):
+    __tablename__ = "payment_events"
+
+    id = Column(Integer, primary_key=True)
+    event_id = Column(String(255), nullable=False, unique=True)  # Stripe event ID
+    event_type = Column(String(100), nullable=False)
+    payment_intent_id = Column(String(255), nullable=True, index=True)
+    payload = Column(JSON, nullable=False)
+    received_at = Column(DateTime, default=datetime.now)
+    processed_at = Column(DateTime, nullable=True)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey
+from app.models.base_model import Base
+
+
+class ProductRatingSummary(Base):
+    """Per-product review count, rating sum and 1-5 star histogram, kept in sync by ReviewRepository"""
+    __tablename__ = "product_rating_summaries"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Float, nullable=False, default=0)
+    stars_1 = Column(Integer, nullable=False, default=0)
+    stars_2 = Column(Integer, nullable=False, default=0)
+    stars_3 = Column(Integer, nullable=False, default=0)
+    stars_4 = Column(Integer, nullable=False, default=0)
+    stars_5 = Column(Integer, nullable=False, default=0)
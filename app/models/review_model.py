@@ -1,21 +1,26 @@
 from app.models.base_model import BaseModel
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 import datetime
 
 class Review(BaseModel):
     __tablename__ = "reviews"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     
     # Relationships
     user = relationship("User", backref="reviews")
     product = relationship("Product", backref="reviews")
     
-    rating = Column(Float, nullable=False, index=True)  
+    rating = Column(Float, nullable=False)  
     comment = Column(Text, nullable=True)  
     created_at = Column(DateTime, nullable=False)
     updated_at = Column(DateTime, nullable=True)
-    deleted_at = Column(DateTime, nullable=True)
\ No newline at end of file
+    deleted_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Product review pages: WHERE product_id = ? AND deleted_at IS NULL ORDER BY created_at DESC
+        Index("ix_reviews_product_id_deleted_at_created_at", "product_id", "deleted_at", "created_at"),
+    )
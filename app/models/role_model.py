@@ -7,11 +7,11 @@ from sqlalchemy.orm import Session
 class Role(BaseModel):
     __tablename__ = "role"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(50), unique=True, index=True, nullable=False)
     description = Column(String(255), nullable=True)
-    created_at = Column(DateTime, index=True, default=func.now())
-    updated_at = Column(DateTime, index=True, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
 def seed_roles(db: Session):
@@ -13,22 +13,22 @@ class OTPType(enum.Enum):
 class User(BaseModel):
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
-    full_name = Column(String(100), index=True)  
+    id = Column(Integer, primary_key=True)
+    full_name = Column(String(100))  
     email = Column(String(255), unique=True, index=True)
-    password = Column(String(255), index=True)
+    password = Column(String(255))
     gender = Column(String(20), nullable=True)  
     avatar = Column(String(500), nullable=True)
-    phone_number = Column(String(20), nullable=True, index=True) 
+    phone_number = Column(String(20), nullable=True) 
     role_id = Column(Integer, ForeignKey("role.id"), nullable=True)
-    status = Column(Integer, index=True, default=0)
+    status = Column(Integer, default=0)
     otp_code = Column(String(255), nullable=True)
     otp_expired_at = Column(DateTime, nullable=True)
     otp_type = Column(Enum(OTPType), nullable=True)
     otp_sent_at = Column(DateTime, nullable=True) 
 
-    created_at = Column(DateTime, index=True, default=datetime.now)
-    updated_at = Column(DateTime, index=True, default=datetime.now)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now)
 
 
 
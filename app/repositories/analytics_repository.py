@@ -0,0 +1,183 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, desc, delete, select, union_all
+from sqlalchemy.exc import IntegrityError
+from typing import List, Dict, Any, Optional
+from datetime import date
+from app.models.analytics_model import DailyProductSales, DailySales, SalesRollupOrder
+from app.models.order_model import Order, OrderItem
+from app.models.product_model import Product
+from app.repositories.order_archive_repository import ORDER_SOURCES
+from app.db.upsert import insert_or_increment
+
+
+class AnalyticsRepository:
+    """Repository for the sales rollup tables"""
+
+    @staticmethod
+    def mark_order_counted(db: Session, order_id: int) -> bool:
+        """Record the order as counted; False when it already was"""
+        try:
+            with db.begin_nested():
+                db.add(SalesRollupOrder(order_id=order_id))
+            return True
+        except IntegrityError:
+            return False
+
+    @staticmethod
+    def unmark_order_counted(db: Session, order_id: int) -> bool:
+        """Remove the order from the counted set; False when it was not counted"""
+        result = db.execute(delete(SalesRollupOrder).where(SalesRollupOrder.order_id == order_id))
+        return result.rowcount > 0
+
+    @staticmethod
+    def get_product_dimensions(db: Session, product_ids: List[int]) -> Dict[int, Any]:
+        rows = db.query(Product.id, Product.brand_id, Product.category_id).filter(Product.id.in_(product_ids)).all()
+        return {row.id: row for row in rows}
+
+    @staticmethod
+    def apply_order(db: Session, order: Order, items: List[OrderItem], sign: int) -> None:
+        """Add (sign=1) or subtract (sign=-1) an order's items from the rollups; does not commit"""
+        day = (order.created_at or order.order_date).date()
+        dimensions = AnalyticsRepository.get_product_dimensions(db, list({item.product_id for item in items}))
+
+        per_product: Dict[int, Dict[str, float]] = {}
+        for item in items:
+            totals = per_product.setdefault(item.product_id, {"revenue": 0.0, "units": 0})
+            totals["revenue"] += item.quantity * item.price_at_purchase
+            totals["units"] += item.quantity
+
+        for product_id, totals in per_product.items():
+            product = dimensions.get(product_id)
+            insert_or_increment(
+                db, DailyProductSales,
+                keys={"day": day, "product_id": product_id},
+                increments={
+                    "revenue": sign * totals["revenue"],
+                    "units": sign * totals["units"],
+                    "orders": sign,
+                },
+                values={
+                    "brand_id": product.brand_id if product else None,
+                    "category_id": product.category_id if product else None,
+                },
+            )
+
+        insert_or_increment(
+            db, DailySales,
+            keys={"day": day},
+            increments={
+                "revenue": sign * sum(t["revenue"] for t in per_product.values()),
+                "units": sign * sum(t["units"] for t in per_product.values()),
+                "orders": sign,
+            },
+        )
+
+    @staticmethod
+    def rebuild(db: Session, counted_statuses: List[str]) -> int:
+        """Recompute every rollup from orders and order items, archived ones included"""
+        db.execute(delete(DailyProductSales))
+        db.execute(delete(DailySales))
+        db.execute(delete(SalesRollupOrder))
+
+        # Archived orders are final, so only live ones get a counted marker
+        order_ids = [
+            row.id for row in db.query(Order.id).filter(Order.status.in_(counted_statuses))
+        ]
+        if order_ids:
+            db.bulk_insert_mappings(SalesRollupOrder, [{"order_id": order_id} for order_id in order_ids])
+
+        orders = union_all(*(
+            select(order_model.id, order_model.status, order_model.created_at)
+            .where(order_model.status.in_(counted_statuses))
+            for order_model, _ in ORDER_SOURCES
+        )).subquery()
+        items = union_all(*(
+            select(item_model.order_id, item_model.product_id, item_model.quantity, item_model.price_at_purchase)
+            for _, item_model in ORDER_SOURCES
+        )).subquery()
+
+        day = func.date(orders.c.created_at)
+        product_rows = (
+            db.query(
+                day.label("day"),
+                items.c.product_id,
+                Product.brand_id,
+                Product.category_id,
+                func.sum(items.c.quantity * items.c.price_at_purchase).label("revenue"),
+                func.sum(items.c.quantity).label("units"),
+                func.count(func.distinct(orders.c.id)).label("orders"),
+            )
+            .select_from(orders)
+            .join(items, items.c.order_id == orders.c.id)
+            .outerjoin(Product, Product.id == items.c.product_id)
+            .group_by(day, items.c.product_id, Product.brand_id, Product.category_id)
+            .all()
+        )
+        db.bulk_insert_mappings(DailyProductSales, [
+            {**row._asdict(), "day": date.fromisoformat(str(row.day))} for row in product_rows
+        ])
+
+        daily_rows = (
+            db.query(
+                day.label("day"),
+                func.sum(items.c.quantity * items.c.price_at_purchase).label("revenue"),
+                func.sum(items.c.quantity).label("units"),
+                func.count(func.distinct(orders.c.id)).label("orders"),
+            )
+            .select_from(orders)
+            .join(items, items.c.order_id == orders.c.id)
+            .group_by(day)
+            .all()
+        )
+        db.bulk_insert_mappings(DailySales, [
+            {**row._asdict(), "day": date.fromisoformat(str(row.day))} for row in daily_rows
+        ])
+
+        db.commit()
+        return db.scalar(select(func.count()).select_from(orders))
+
+    @staticmethod
+    def get_daily_sales(db: Session, start_date: Optional[date], end_date: Optional[date]) -> List[Any]:
+        query = db.query(DailySales)
+        if start_date:
+            query = query.filter(DailySales.day >= start_date)
+        if end_date:
+            query = query.filter(DailySales.day <= end_date)
+        return query.order_by(DailySales.day).all()
+
+    @staticmethod
+    def get_sales_by_dimension(db: Session, dimension: str, start_date: Optional[date],
+                               end_date: Optional[date]) -> List[Any]:
+        """Revenue/units/orders grouped by brand_id or category_id"""
+        column = getattr(DailyProductSales, dimension)
+        query = db.query(
+            column.label("key"),
+            func.sum(DailyProductSales.revenue).label("revenue"),
+            func.sum(DailyProductSales.units).label("units"),
+            func.sum(DailyProductSales.orders).label("orders"),
+        )
+        if start_date:
+            query = query.filter(DailyProductSales.day >= start_date)
+        if end_date:
+            query = query.filter(DailyProductSales.day <= end_date)
+        return query.group_by(column).order_by(desc("revenue")).all()
+
+    @staticmethod
+    def get_top_products(db: Session, start_date: Optional[date], end_date: Optional[date],
+                         limit: int = 10, order_by: str = "units") -> List[Any]:
+        query = db.query(
+            DailyProductSales.product_id,
+            func.sum(DailyProductSales.revenue).label("revenue"),
+            func.sum(DailyProductSales.units).label("units"),
+            func.sum(DailyProductSales.orders).label("orders"),
+        )
+        if start_date:
+            query = query.filter(DailyProductSales.day >= start_date)
+        if end_date:
+            query = query.filter(DailyProductSales.day <= end_date)
+        return (
+            query.group_by(DailyProductSales.product_id)
+            .order_by(desc(order_by))
+            .limit(limit)
+            .all()
+        )
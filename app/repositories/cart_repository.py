@@ -1,23 +1,39 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import Optional, List
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from typing import Optional, List, Tuple
+from datetime import datetime
 from app.models.cart_model import Cart, CartItem
 from app.models.product_model import Product
-from sqlalchemy import and_, or_
+from app.db.upsert import insert_or_increment, insert_or_increment_many
 
 class CartRepository:
     """Repository for cart operations"""
     
     @staticmethod
     def get_user_cart(db: Session, user_id: int) -> Optional[Cart]:
-        """Get user's cart, create if doesn't exist"""
-        cart = db.query(Cart).filter(Cart.user_id == user_id).first()
-        if not cart:
-            cart = Cart(user_id=user_id)
-            db.add(cart)
-            db.commit()
-            db.refresh(cart)
-        return cart
+        """Get user's cart; None until the first item is added, so reads never write"""
+        return db.query(Cart).filter(Cart.user_id == user_id).first()
+    
+    @staticmethod
+    def get_or_create_user_cart(db: Session, user_id: int) -> Cart:
+        """Get user's cart, creating it on first write; does not commit"""
+        cart = CartRepository.get_user_cart(db, user_id)
+        if cart:
+            return cart
+        try:
+            with db.begin_nested():
+                cart = Cart(user_id=user_id)
+                db.add(cart)
+            return cart
+        except IntegrityError:
+            # A concurrent first add created it
+            return CartRepository.get_user_cart(db, user_id)
+    
+    @staticmethod
+    def lock_cart(db: Session, cart_id: int) -> Cart:
+        """Re-read the cart under a row lock held until the next commit"""
+        return db.query(Cart).filter(Cart.id == cart_id).with_for_update().populate_existing().one()
     
     @staticmethod
     def get_cart_items(db: Session, cart_id: int) -> List[CartItem]:
@@ -35,12 +51,11 @@ class CartRepository:
         query = db.query(CartItem).filter(
             CartItem.cart_id == cart_id,
             CartItem.product_id == product_id,
-            or_(CartItem.size == size, and_(CartItem.size.is_(None), size is None)),
-            or_(CartItem.color == color, and_(CartItem.color.is_(None), color is None))
+            CartItem.size.is_(None) if size is None else CartItem.size == size,
+            CartItem.color.is_(None) if color is None else CartItem.color == color
         )
         
         return query.first()
-
     
     @staticmethod
     def get_cart_item_by_id(db: Session, item_id: int) -> Optional[CartItem]:
@@ -49,36 +64,42 @@ class CartRepository:
     
     @staticmethod
     def add_item_to_cart(db: Session, cart_id: int, product_id: int, quantity: int, 
-                        size: Optional[int], color: Optional[str]) -> CartItem:
-        """Add item to cart or increment quantity if it exists."""
-        existing_item = CartRepository.get_cart_item(db, cart_id, product_id, size, color)
-        
-        if existing_item:
-            existing_item.quantity += quantity
-            
-            if existing_item.quantity <= 0:
-                db.delete(existing_item)
-                db.commit()
-                return None
-                
-            db.commit()
-            db.refresh(existing_item)
-            return existing_item
-        else:
-            if quantity <= 0:
-                return None
-                
-            new_item = CartItem(
-                cart_id=cart_id,
-                product_id=product_id,
-                quantity=quantity,
-                size=size,
-                color=color
-            )
-            db.add(new_item)
-            db.commit()
-            db.refresh(new_item)
-            return new_item
+                        size: Optional[int], color: Optional[str]) -> None:
+        """
+        Add item to cart or increment quantity if it exists, in one upsert on
+        the (cart_id, product_id, size, color) unique key, so concurrent adds of
+        the same variant land on one line. A line brought to zero or below is removed.
+        """
+        keys = {"cart_id": cart_id, "product_id": product_id, "size": size, "color": color}
+        insert_or_increment(db, CartItem, keys=keys, increments={"quantity": quantity},
+                            values={"updated_at": datetime.now()})
+        if quantity <= 0:
+            db.execute(delete(CartItem).where(
+                *(CartItem.__table__.c[column] == value for column, value in keys.items()),
+                CartItem.quantity <= 0
+            ))
+        db.commit()
+    
+    @staticmethod
+    def add_items_to_cart(db: Session, cart_id: int,
+                          items: List[Tuple[int, Optional[int], Optional[str], int]]) -> None:
+        """
+        Add (product_id, size, color, quantity) lines in one multi-row upsert;
+        lines must be distinct variants with positive quantities.
+        """
+        now = datetime.now()
+        insert_or_increment_many(
+            db, CartItem,
+            rows=[
+                {"cart_id": cart_id, "product_id": product_id, "size": size, "color": color,
+                 "quantity": quantity, "created_at": now, "updated_at": now}
+                for product_id, size, color, quantity in items
+            ],
+            keys=["cart_id", "product_id", "size", "color"],
+            increments=["quantity"],
+            values=["updated_at"],
+        )
+        db.commit()
     
     @staticmethod
     def remove_cart_item(db: Session, item_id: int) -> bool:
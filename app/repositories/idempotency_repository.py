@@ -0,0 +1,60 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from typing import Optional, Dict, Any
+from datetime import datetime
+from app.models.idempotency_model import IdempotencyKey
+
+
+class IdempotencyRepository:
+    """Repository for idempotency key records"""
+
+    @staticmethod
+    def get(db: Session, user_id: int, scope: str, key: str) -> Optional[IdempotencyKey]:
+        return db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key
+        ).first()
+
+    @staticmethod
+    def reserve(db: Session, user_id: int, scope: str, key: str, request_hash: str) -> bool:
+        """Insert an in-progress record; False when the key is already taken"""
+        db.add(IdempotencyKey(
+            user_id=user_id,
+            scope=scope,
+            key=key,
+            request_hash=request_hash,
+            status="in_progress"
+        ))
+        try:
+            db.commit()
+            return True
+        except IntegrityError:
+            db.rollback()
+            return False
+
+    @staticmethod
+    def complete(db: Session, user_id: int, scope: str, key: str, response: Dict[str, Any]) -> None:
+        db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key
+        ).update({"status": "completed", "response": response}, synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def release(db: Session, user_id: int, scope: str, key: str) -> None:
+        db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def delete_expired(db: Session, created_before: datetime) -> int:
+        deleted = db.query(IdempotencyKey).filter(
+            IdempotencyKey.created_at < created_before
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
@@ -0,0 +1,84 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, insert, literal, select, DateTime
+from typing import List, Optional
+from datetime import datetime
+from app.models.analytics_model import SalesRollupOrder
+from app.models.order_archive_model import ArchivedOrder, ArchivedOrderItem, ArchivedProductSales
+from app.models.order_model import Order, OrderItem, OrderStatus
+from app.db.upsert import insert_or_increment
+
+# Orders that can no longer change; anything else stays live however old it is
+ARCHIVABLE_STATUSES = [OrderStatus.DELIVERED.value, OrderStatus.CANCELLED.value]
+
+# Live and archived (order, item) models, for reads that must see every order
+ORDER_SOURCES = ((Order, OrderItem), (ArchivedOrder, ArchivedOrderItem))
+
+ORDER_COLUMNS = [column.key for column in Order.__table__.columns]
+ORDER_ITEM_COLUMNS = [column.key for column in OrderItem.__table__.columns]
+
+
+class OrderArchiveRepository:
+    """Moves finished orders to the archive tables and answers where they live"""
+
+    @staticmethod
+    def newest_archived_at(db: Session) -> Optional[datetime]:
+        """created_at of the newest archived order; None while the archive is empty"""
+        return db.scalar(select(func.max(ArchivedOrder.created_at)))
+
+    @staticmethod
+    def covers(db: Session, start_date: Optional[datetime], status: Optional[str] = None) -> bool:
+        """Whether orders from start_date on (None: from the beginning) may include archived ones"""
+        if status and status not in ARCHIVABLE_STATUSES:
+            return False
+        newest = OrderArchiveRepository.newest_archived_at(db)
+        return newest is not None and (start_date is None or start_date <= newest)
+
+    @staticmethod
+    def get_order_by_id(db: Session, order_id: int) -> Optional[ArchivedOrder]:
+        return db.get(ArchivedOrder, order_id)
+
+    @staticmethod
+    def get_order_items(db: Session, order_id: int) -> List[ArchivedOrderItem]:
+        return db.query(ArchivedOrderItem).filter(ArchivedOrderItem.order_id == order_id).all()
+
+    @staticmethod
+    def archive_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+        """
+        Move up to batch_size finished orders created before cutoff, with their
+        items, in one transaction. Ids are kept, so links to an order still work.
+        Returns the number of orders moved; 0 when nothing is left to archive.
+        """
+        order_ids = db.scalars(
+            select(Order.id)
+            .where(Order.status.in_(ARCHIVABLE_STATUSES), Order.created_at < cutoff)
+            .order_by(Order.id)
+            .limit(batch_size)
+        ).all()
+        if not order_ids:
+            return 0
+
+        archived_at = literal(datetime.now(), DateTime)
+        db.execute(insert(ArchivedOrder).from_select(
+            ORDER_COLUMNS + ["archived_at"],
+            select(*[Order.__table__.c[name] for name in ORDER_COLUMNS], archived_at).where(Order.id.in_(order_ids))
+        ))
+        db.execute(insert(ArchivedOrderItem).from_select(
+            ORDER_ITEM_COLUMNS,
+            select(*[OrderItem.__table__.c[name] for name in ORDER_ITEM_COLUMNS]).where(OrderItem.order_id.in_(order_ids))
+        ))
+
+        # Carry the units over so sold counts stay whole without reading the archive
+        sold = db.execute(
+            select(OrderItem.product_id, func.sum(OrderItem.quantity))
+            .where(OrderItem.order_id.in_(order_ids))
+            .group_by(OrderItem.product_id)
+        ).all()
+        for product_id, quantity in sold:
+            insert_or_increment(db, ArchivedProductSales, keys={"product_id": product_id}, increments={"quantity": quantity})
+
+        # Finished orders never change status again, so their rollup markers are not needed
+        db.execute(delete(SalesRollupOrder).where(SalesRollupOrder.order_id.in_(order_ids)))
+        db.execute(delete(OrderItem).where(OrderItem.order_id.in_(order_ids)))
+        db.execute(delete(Order).where(Order.id.in_(order_ids)))
+        db.commit()
+        return len(order_ids)
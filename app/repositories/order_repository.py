@@ -1,9 +1,11 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
-from typing import Optional, List, Dict, Any
+from sqlalchemy import and_, or_, desc, select, func, literal, union_all
+from typing import Optional, List, Dict, Any, Iterator
 from datetime import datetime
 from app.models.order_model import Order, OrderItem
+from app.models.order_archive_model import ArchivedOrder, ArchivedOrderItem
 from app.models.cart_model import CartItem
+from app.repositories.order_archive_repository import OrderArchiveRepository
 import math
 
 
@@ -50,15 +52,56 @@ class OrderRepository:
         return order_items
     
     @staticmethod
-    def get_order_by_id(db: Session, order_id: int) -> Optional[Order]:
-        return db.query(Order).filter(Order.id == order_id).first()
+    def get_order_by_id(db: Session, order_id: int, include_archive: bool = False) -> Optional[Order]:
+        """Live order; with include_archive, falls back to the archive (read-only use)"""
+        order = db.query(Order).filter(Order.id == order_id).first()
+        if order is None and include_archive:
+            return OrderArchiveRepository.get_order_by_id(db, order_id)
+        return order
     
     @staticmethod
     def get_order_items(db: Session, order_id: int) -> List[OrderItem]:
         return db.query(OrderItem).filter(OrderItem.order_id == order_id).all()
     
+    @staticmethod
+    def get_items(db: Session, order) -> List[OrderItem]:
+        """Items of a live or an archived order"""
+        if isinstance(order, ArchivedOrder):
+            return OrderArchiveRepository.get_order_items(db, order.id)
+        return OrderRepository.get_order_items(db, order.id)
+    
+    @staticmethod
+    def _page_with_archive(db: Session, live, archived, page: int, limit: int) -> tuple[List[Any], int]:
+        """
+        One page, newest first, across live and archived orders. `live` and
+        `archived` select (id, created_at) of the matching orders; only those go
+        through the UNION, and the page's orders are then loaded by id.
+        """
+        keys = union_all(
+            live.add_columns(literal(False).label("archived")),
+            archived.add_columns(literal(True).label("archived")),
+        ).subquery()
+        total = db.scalar(select(func.count()).select_from(keys))
+        rows = db.execute(
+            select(keys).order_by(desc(keys.c.created_at)).offset((page - 1) * limit).limit(limit)
+        ).all()
+        
+        loaded = {}
+        for model, archived_flag in ((Order, False), (ArchivedOrder, True)):
+            ids = [row.id for row in rows if bool(row.archived) == archived_flag]
+            if ids:
+                loaded.update({(archived_flag, order.id): order for order in db.query(model).filter(model.id.in_(ids))})
+        return [loaded[(bool(row.archived), row.id)] for row in rows], total
+    
     @staticmethod
     def get_user_orders(db: Session, user_id: int, page: int = 1, limit: int = 10) -> tuple[List[Order], int]:
+        if OrderArchiveRepository.covers(db, None):
+            return OrderRepository._page_with_archive(
+                db,
+                select(Order.id, Order.created_at).where(Order.user_id == user_id),
+                select(ArchivedOrder.id, ArchivedOrder.created_at).where(ArchivedOrder.user_id == user_id),
+                page, limit
+            )
         query = db.query(Order).filter(Order.user_id == user_id).order_by(desc(Order.created_at))
         
         total = query.count()
@@ -87,21 +130,41 @@ class OrderRepository:
         return order
     
     @staticmethod
-    def search_orders(db: Session, user_id: Optional[int] = None, status: Optional[str] = None,
-                     payment_status: Optional[str] = None, start_date: Optional[datetime] = None,
-                     end_date: Optional[datetime] = None, page: int = 1, limit: int = 10) -> tuple[List[Order], int]:
-        query = db.query(Order)
-        
+    def _search_conditions(user_id: Optional[int] = None, status: Optional[str] = None,
+                           payment_status: Optional[str] = None, start_date: Optional[datetime] = None,
+                           end_date: Optional[datetime] = None, model=Order) -> list:
+        conditions = []
         if user_id:
-            query = query.filter(Order.user_id == user_id)
+            conditions.append(model.user_id == user_id)
         if status:
-            query = query.filter(Order.status == status)
+            conditions.append(model.status == status)
         if payment_status:
-            query = query.filter(Order.payment_status == payment_status)
+            conditions.append(model.payment_status == payment_status)
         if start_date:
-            query = query.filter(Order.created_at >= start_date)
+            conditions.append(model.created_at >= start_date)
         if end_date:
-            query = query.filter(Order.created_at <= end_date)
+            conditions.append(model.created_at <= end_date)
+        return conditions
+    
+    @staticmethod
+    def search_orders(db: Session, user_id: Optional[int] = None, status: Optional[str] = None,
+                     payment_status: Optional[str] = None, start_date: Optional[datetime] = None,
+                     end_date: Optional[datetime] = None, page: int = 1, limit: int = 10) -> tuple[List[Order], int]:
+        # The archive is read only when the range reaches back into it
+        if OrderArchiveRepository.covers(db, start_date, status):
+            return OrderRepository._page_with_archive(
+                db,
+                select(Order.id, Order.created_at).where(*OrderRepository._search_conditions(
+                    user_id, status, payment_status, start_date, end_date
+                )),
+                select(ArchivedOrder.id, ArchivedOrder.created_at).where(*OrderRepository._search_conditions(
+                    user_id, status, payment_status, start_date, end_date, model=ArchivedOrder
+                )),
+                page, limit
+            )
+        query = db.query(Order).filter(*OrderRepository._search_conditions(
+            user_id, status, payment_status, start_date, end_date
+        ))
         
         query = query.order_by(desc(Order.created_at))
         
@@ -113,6 +176,15 @@ class OrderRepository:
     @staticmethod
     def get_orders_by_product(db: Session, product_id: int, page: int = 1, limit: int = 10) -> tuple[List[Order], int]:
         """Admin: Get all orders containing a specific product"""
+        if OrderArchiveRepository.covers(db, None):
+            return OrderRepository._page_with_archive(
+                db,
+                select(Order.id, Order.created_at).join(OrderItem)
+                .where(OrderItem.product_id == product_id).distinct(),
+                select(ArchivedOrder.id, ArchivedOrder.created_at).join(ArchivedOrderItem)
+                .where(ArchivedOrderItem.product_id == product_id).distinct(),
+                page, limit
+            )
         query = db.query(Order).join(OrderItem).filter(OrderItem.product_id == product_id).order_by(desc(Order.created_at))
         
         total = query.count()
@@ -124,3 +196,38 @@ class OrderRepository:
     def get_order_by_payment_intent(db: Session, payment_intent_id: str) -> Optional[Order]:
         """Get order by Stripe payment intent ID"""
         return db.query(Order).filter(Order.payment_intent_id == payment_intent_id).first()
+    
+    @staticmethod
+    def _export_statement(order_model, item_model, conditions: list, batch_size: int):
+        return (
+            select(
+                order_model.id.label("order_id"), order_model.user_id, order_model.created_at, order_model.status,
+                order_model.payment_status, order_model.payment_method, order_model.payment_intent_id,
+                order_model.total_amount, order_model.delivery_address,
+                item_model.id.label("item_id"), item_model.product_id, item_model.product_name,
+                item_model.size, item_model.color, item_model.quantity, item_model.price_at_purchase,
+            )
+            .select_from(order_model)
+            .outerjoin(item_model, item_model.order_id == order_model.id)
+            .where(*conditions)
+            .order_by(order_model.id, item_model.id)
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+    
+    @staticmethod
+    def iter_order_rows(db: Session, user_id: Optional[int] = None, status: Optional[str] = None,
+                        payment_status: Optional[str] = None, start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream orders joined to their items (one row per item) through a server-side
+        cursor; archived orders, when the range reaches them, come first
+        """
+        filters = (user_id, status, payment_status, start_date, end_date)
+        sources = [(Order, OrderItem)]
+        if OrderArchiveRepository.covers(db, start_date, status):
+            sources.insert(0, (ArchivedOrder, ArchivedOrderItem))
+        for order_model, item_model in sources:
+            conditions = OrderRepository._search_conditions(*filters, model=order_model)
+            stmt = OrderRepository._export_statement(order_model, item_model, conditions, batch_size)
+            for row in db.execute(stmt):
+                yield dict(row._mapping)
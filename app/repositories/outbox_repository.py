@@ -0,0 +1,33 @@
+from sqlalchemy.orm import Session
+from typing import List, Dict, Any
+from datetime import datetime
+from app.models.outbox_model import OutboxEvent
+
+
+class OutboxRepository:
+    """Repository for the domain event outbox"""
+
+    @staticmethod
+    def add(db: Session, event_type: str, payload: Dict[str, Any]) -> OutboxEvent:
+        """Stage an outbox row in the caller's transaction (no commit)"""
+        row = OutboxEvent(event_type=event_type, payload=payload)
+        db.add(row)
+        db.flush()
+        return row
+
+    @staticmethod
+    def get_pending(db: Session, limit: int = 500) -> List[OutboxEvent]:
+        return (
+            db.query(OutboxEvent)
+            .filter(OutboxEvent.processed_at.is_(None))
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def mark_processed(db: Session, outbox_id: int) -> None:
+        db.query(OutboxEvent).filter(OutboxEvent.id == outbox_id).update(
+            {OutboxEvent.processed_at: datetime.now()}, synchronize_session=False
+        )
+        db.commit()
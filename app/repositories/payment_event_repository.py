@@ -0,0 +1,45 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from typing import Optional, Dict, Any, List
+from datetime import datetime
+from app.models.payment_event_model import PaymentEvent
+
+
+class PaymentEventRepository:
+    """Repository for received Stripe webhook events"""
+
+    @staticmethod
+    def record(db: Session, event_id: str, event_type: str, payment_intent_id: Optional[str],
+               payload: Dict[str, Any]) -> Optional[PaymentEvent]:
+        """Store a webhook event; None when the event was already received"""
+        event = PaymentEvent(
+            event_id=event_id,
+            event_type=event_type,
+            payment_intent_id=payment_intent_id,
+            payload=payload
+        )
+        db.add(event)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return None
+        db.refresh(event)
+        return event
+
+    @staticmethod
+    def get_by_id(db: Session, payment_event_id: int) -> Optional[PaymentEvent]:
+        return db.query(PaymentEvent).filter(PaymentEvent.id == payment_event_id).first()
+
+    @staticmethod
+    def get_unprocessed_for_intent(db: Session, payment_intent_id: str, event_types: List[str]) -> List[PaymentEvent]:
+        return db.query(PaymentEvent).filter(
+            PaymentEvent.payment_intent_id == payment_intent_id,
+            PaymentEvent.event_type.in_(event_types),
+            PaymentEvent.processed_at.is_(None)
+        ).order_by(PaymentEvent.id).all()
+
+    @staticmethod
+    def mark_processed(db: Session, event: PaymentEvent) -> None:
+        event.processed_at = datetime.now()
+        db.commit()
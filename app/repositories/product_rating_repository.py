@@ -0,0 +1,56 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import delete
+from typing import List, Dict, Optional
+from app.models.product_rating_model import ProductRatingSummary
+from app.models.review_model import Review
+from app.db.upsert import insert_or_increment
+
+
+def star_bucket(rating: float) -> int:
+    """Histogram bucket (1-5) for a rating, rounding half up"""
+    return min(5, max(1, int(rating + 0.5)))
+
+
+class ProductRatingRepository:
+    """Repository for precomputed product rating summaries"""
+
+    @staticmethod
+    def apply(db: Session, product_id: int, rating: Optional[float], sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one rating from the summary; does not commit"""
+        if rating is None:
+            return
+        insert_or_increment(
+            db, ProductRatingSummary,
+            keys={"product_id": product_id},
+            increments={
+                "review_count": sign,
+                "rating_sum": sign * rating,
+                f"stars_{star_bucket(rating)}": sign,
+            },
+        )
+
+    @staticmethod
+    def get_many(db: Session, product_ids: List[int]) -> Dict[int, ProductRatingSummary]:
+        if not product_ids:
+            return {}
+        rows = db.query(ProductRatingSummary).filter(ProductRatingSummary.product_id.in_(product_ids)).all()
+        return {row.product_id: row for row in rows}
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Recompute every summary from non-deleted reviews"""
+        db.execute(delete(ProductRatingSummary))
+        summaries: Dict[int, Dict[str, float]] = {}
+        for product_id, rating in db.query(Review.product_id, Review.rating).filter(
+            Review.deleted_at.is_(None), Review.rating.isnot(None)
+        ).yield_per(1000):
+            summary = summaries.setdefault(product_id, {
+                "product_id": product_id, "review_count": 0, "rating_sum": 0.0,
+                "stars_1": 0, "stars_2": 0, "stars_3": 0, "stars_4": 0, "stars_5": 0,
+            })
+            summary["review_count"] += 1
+            summary["rating_sum"] += rating
+            summary[f"stars_{star_bucket(rating)}"] += 1
+        db.bulk_insert_mappings(ProductRatingSummary, list(summaries.values()))
+        db.commit()
+        return len(summaries)
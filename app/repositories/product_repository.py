@@ -1,21 +1,45 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc, func, or_
+from sqlalchemy import desc, asc, func, or_, insert, select, update
 from app.models.product_model import Product
 from app.models.order_model import OrderItem, Order
+from app.models.order_archive_model import ArchivedProductSales
 from app.models.product_model import Product
+from app.repositories.product_rating_repository import ProductRatingRepository
 from app.schemas.product_schema import ProductFilter
-from typing import List, Optional, Tuple, Any
+from typing import List, Optional, Set, Tuple, Any, Dict, Iterator
 from datetime import datetime
 
+# Columns each GET /products field needs; sold_count and rating come from
+# order_items (plus archived_product_sales) and product_rating_summaries instead
+PROJECTION_COLUMNS = {
+    "id": (Product.id,),
+    "name": (Product.name,),
+    "description": (Product.description,),
+    "price": (Product.price,),
+    "category_id": (Product.category_id,),
+    "brand_id": (Product.brand_id,),
+    "status": (Product.status,),
+    "image_urls": (Product.image_urls,),
+    "thumbnail": (Product.image_urls,),
+    "variants": (Product.variants,),
+    "deleted_at": (Product.deleted_at,),
+}
+
+# Units sold: live order items (joined by the query) plus what archived orders left behind
+SOLD_COUNT = func.coalesce(func.sum(OrderItem.quantity), 0) + func.coalesce(
+    select(ArchivedProductSales.quantity).where(ArchivedProductSales.product_id == Product.id).scalar_subquery(), 0
+)
+
 class ProductRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_list(self, page: int, size: int, filters: ProductFilter):
+    def _list_query(self, filters: ProductFilter):
+        """Storefront listing query before pagination; check_indexes explains this same statement"""
         query = (
             self.db.query(
                 Product,
-                func.coalesce(func.sum(OrderItem.quantity), 0).label("sold_quantity")
+                SOLD_COUNT.label("sold_quantity")
             )
             .outerjoin(
                 OrderItem, Product.id == OrderItem.product_id
@@ -25,7 +49,7 @@ class ProductRepository:
                 (OrderItem.order_id == Order.id) &
                 (Order.status == "delivered")
             )
-            .filter(Product.status == "active")
+            .filter(Product.status == "active", Product.deleted_at == None)
             .group_by(Product.id)
         )
 
@@ -50,7 +74,10 @@ class ProductRepository:
             query = query.order_by(desc(Product.price))
         else:
             query = query.order_by(desc(Product.id))
+        return query
 
+    def get_list(self, page: int, size: int, filters: ProductFilter):
+        query = self._list_query(filters)
         total = query.count()
         products = (
             query
@@ -78,42 +105,49 @@ class ProductRepository:
     def get_by_id(self, product_id: int):
         return self.db.query(Product).filter(Product.id == product_id, Product.status.in_(['active', 'out_of_stock'])).first()
     
+    @staticmethod
+    def _filter_and_sort(query, keyword: Optional[str], search_type: str, sort_by: Optional[str]):
+        if keyword:
+            if search_type == "title":
+                query = query.filter(Product.name.ilike(f"%{keyword}%"))
+            elif search_type == "category":
+                query = query.filter(Product.category_id == keyword)
+            elif search_type == "brand":
+                query = query.filter(Product.brand_id == keyword)
+        
+        # Add sorting
+        if sort_by == "price-asc":
+            return query.order_by(asc(Product.price))
+        if sort_by == "price-desc":
+            return query.order_by(desc(Product.price))
+        if sort_by == "name-asc":
+            return query.order_by(asc(Product.name))
+        return query.order_by(desc(Product.id))
+
     def get_all(
         self, 
         skip: int = 0, 
         limit: int = 100, 
         keyword: Optional[str] = None, 
         search_type: str = "title",
-        sort_by: Optional[str] = None
-    ) -> Tuple[List[Product], int]:
+        sort_by: Optional[str] = None,
+        fields: Optional[Set[str]] = None
+    ) -> Tuple[List[Any], int]:
+        """Full Product rows, or dicts holding only `fields` when a projection is requested"""
+        if fields is not None:
+            return self._get_projection(skip, limit, keyword, search_type, sort_by, fields)
+
         # Create base query with sold_count aggregation
         query = (
             self.db.query(
                 Product,
-                func.coalesce(func.sum(OrderItem.quantity), 0).label("sold_count")
+                SOLD_COUNT.label("sold_count")
             )
             .outerjoin(OrderItem, Product.id == OrderItem.product_id)
             .filter(Product.deleted_at == None)
             .group_by(Product.id)
         )
-        
-        if keyword:
-            if search_type == "title":
-                query = query.filter(Product.name.ilike(f"%{keyword}%"))
-            elif search_type == "category":
-                query = query.filter(Product.category_id == keyword)
-            elif search_type == "brand":
-                query = query.filter(Product.brand_id == keyword)
-        
-        # Add sorting
-        if sort_by == "price-asc":
-            query = query.order_by(asc(Product.price))
-        elif sort_by == "price-desc":
-            query = query.order_by(desc(Product.price))
-        elif sort_by == "name-asc":
-            query = query.order_by(asc(Product.name))
-        else:
-            query = query.order_by(desc(Product.id))
+        query = self._filter_and_sort(query, keyword, search_type, sort_by)
 
         total = query.count()
         results = query.offset(skip).limit(limit).all()
@@ -123,14 +157,70 @@ class ProductRepository:
         for product, sold_count in results:
             product.sold_count = sold_count
             products.append(product)
+        self.attach_ratings(products)
             
         return products, total
 
+    def _get_projection(
+        self,
+        skip: int,
+        limit: int,
+        keyword: Optional[str],
+        search_type: str,
+        sort_by: Optional[str],
+        fields: Set[str]
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        SELECT only the columns behind `fields`. The order_items join and
+        GROUP BY run only when sold_count is asked for, ratings are read only
+        for rating, and thumbnail needs just the image_urls column.
+        """
+        columns = {Product.id}
+        for field in fields:
+            columns.update(PROJECTION_COLUMNS.get(field, ()))
+        columns = sorted(columns, key=lambda column: column.key)
+
+        if "sold_count" in fields:
+            query = (
+                self.db.query(*columns, SOLD_COUNT.label("sold_count"))
+                .outerjoin(OrderItem, Product.id == OrderItem.product_id)
+                .filter(Product.deleted_at == None)
+                .group_by(Product.id)
+            )
+        else:
+            query = self.db.query(*columns).filter(Product.deleted_at == None)
+        query = self._filter_and_sort(query, keyword, search_type, sort_by)
+
+        total = query.count()
+        rows = query.offset(skip).limit(limit).all()
+
+        summaries = {}
+        if "rating" in fields:
+            summaries = ProductRatingRepository.get_many(self.db, [row.id for row in rows])
+
+        items = []
+        for row in rows:
+            values = row._mapping
+            item = {field: values[field] for field in fields if field in values}
+            if "thumbnail" in fields:
+                item["thumbnail"] = self._thumbnail(values["image_urls"])
+            if "rating" in fields:
+                item["rating"] = self._rating(summaries.get(row.id))
+            items.append(item)
+        return items, total
+
+    @staticmethod
+    def _thumbnail(image_urls) -> Optional[str]:
+        if not image_urls:
+            return None
+        first_image = image_urls[0]
+        return first_image.get("url") if isinstance(first_image, dict) else first_image
+
     def get_by_id(self, product_id: int) -> Optional[Product]:
         result = (
             self.db.query(
                 Product,
-                func.coalesce(func.sum(OrderItem.quantity), 0).label("sold_count")
+                SOLD_COUNT.label("sold_count")
             )
             .outerjoin(OrderItem, Product.id == OrderItem.product_id)
             .filter(Product.id == product_id, Product.deleted_at == None)
@@ -141,9 +231,48 @@ class ProductRepository:
         if result:
             product, sold_count = result
             product.sold_count = sold_count
+            self.attach_ratings([product])
             return product
         return None
 
+    def get_by_ids(self, product_ids: List[int]) -> List[Product]:
+        """Products with sold_count and rating in one IN query plus one rating lookup; order is not kept"""
+        rows = (
+            self.db.query(
+                Product,
+                SOLD_COUNT.label("sold_count")
+            )
+            .outerjoin(OrderItem, Product.id == OrderItem.product_id)
+            .filter(Product.id.in_(product_ids), Product.deleted_at == None)
+            .group_by(Product.id)
+            .all()
+        )
+        products = []
+        for product, sold_count in rows:
+            product.sold_count = sold_count
+            products.append(product)
+        if products:
+            self.attach_ratings(products)
+        return products
+
+    def attach_ratings(self, products: List[Product]) -> None:
+        """Set product.rating from the precomputed summaries with one IN lookup, no join"""
+        summaries = ProductRatingRepository.get_many(self.db, [product.id for product in products])
+        for product in products:
+            product.rating = self._rating(summaries.get(product.id))
+
+    @staticmethod
+    def _rating(summary) -> Dict[str, Any]:
+        count = summary.review_count if summary else 0
+        return {
+            "average": round(summary.rating_sum / count, 2) if count else 0,
+            "count": count,
+            "histogram": {
+                str(star): getattr(summary, f"stars_{star}") if summary else 0
+                for star in range(1, 6)
+            },
+        }
+
     def create(self, product_data: dict) -> Product:
         db_product = Product(**product_data)
         self.db.add(db_product)
@@ -151,6 +280,64 @@ class ProductRepository:
         self.db.refresh(db_product)
         return db_product
 
+    def bulk_create(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert many products in one executemany statement"""
+        if not rows:
+            return 0
+        self.db.execute(insert(Product), rows)
+        self.db.commit()
+        return len(rows)
+
+    EXPORT_COLUMNS = (
+        Product.id, Product.name, Product.description, Product.price, Product.category_id,
+        Product.brand_id, Product.status, Product.image_urls, Product.variants,
+    )
+
+    def existing_ids(self, model, ids: Set[int]) -> Set[int]:
+        """Which of ids exist in model's table, in one IN query"""
+        if not ids:
+            return set()
+        return set(self.db.scalars(select(model.id).where(model.id.in_(ids))))
+
+    def iter_for_export(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Stream non-deleted products as plain dicts using a server-side cursor"""
+        stmt = (
+            select(*self.EXPORT_COLUMNS)
+            .where(Product.deleted_at.is_(None))
+            .order_by(Product.id)
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        for row in self.db.execute(stmt):
+            yield dict(row._mapping)
+
+    def get_rows_for_bulk_update(self, product_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Load the columns a bulk price/stock update touches, keyed by product id.
+        The rows stay locked until bulk_update commits, so a checkout's stock
+        decrement waits instead of being overwritten; id order avoids deadlocks.
+        """
+        rows = self.db.execute(
+            select(Product.id, Product.price, Product.status, Product.variants)
+            .where(Product.id.in_(product_ids), Product.deleted_at.is_(None))
+            .order_by(Product.id)
+            .with_for_update()
+        )
+        return {row.id: dict(row._mapping) for row in rows}
+
+    def get_rows_for_cart(self, product_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Load the columns a cart line needs (price, availability, variants, image), keyed by product id"""
+        rows = self.db.execute(
+            select(Product.id, Product.name, Product.price, Product.status, Product.variants, Product.image_urls)
+            .where(Product.id.in_(product_ids), Product.deleted_at.is_(None))
+        )
+        return {row.id: dict(row._mapping) for row in rows}
+
+    def bulk_update(self, rows: List[Dict[str, Any]]) -> None:
+        """Update many products by primary key in one executemany statement"""
+        if rows:
+            self.db.execute(update(Product), rows)
+        self.db.commit()
+
     def update(self, product: Product, update_data: dict) -> Product:
         for key, value in update_data.items():
             setattr(product, key, value)
@@ -165,7 +352,8 @@ class ProductRepository:
     @staticmethod
     def decrement_stock(db: Session, product_id: int, quantity: int, size: Optional[int] = None, color: Optional[str] = None):
         """Decrement stock quantity for a product variant"""
-        product = db.query(Product).filter(Product.id == product_id).first()
+        # Locked like get_rows_for_bulk_update, so neither read-modify-write of variants loses the other
+        product = db.query(Product).filter(Product.id == product_id).with_for_update().first()
         if not product:
             return False
             
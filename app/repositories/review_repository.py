@@ -1,9 +1,12 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
+from sqlalchemy import desc, exists, or_, select, union
+from typing import List, Set
 from datetime import datetime
 from app.models.review_model import Review
-from app.models.order_model import Order, OrderItem
+from app.models.order_model import OrderStatus
+from app.repositories.order_archive_repository import ORDER_SOURCES
 from app.models.product_model import Product
+from app.repositories.product_rating_repository import ProductRatingRepository
 
 class ReviewRepository:
     def __init__(self, db: Session):
@@ -48,22 +51,58 @@ class ReviewRepository:
         reviews = query.order_by(desc(Review.created_at)).offset(skip).limit(limit).all()
         return reviews, total
     
+    def _purchased_condition(self, user_id: int, product_id):
+        # Purchases past the archive horizon are in the archive tables
+        return or_(*(
+            exists().where(
+                item_model.product_id == product_id,
+                item_model.order_id == order_model.id,
+                order_model.user_id == user_id,
+                order_model.status == OrderStatus.DELIVERED.value
+            )
+            for order_model, item_model in ORDER_SOURCES
+        ))
+
+    def _reviewed_condition(self, user_id: int, product_id):
+        return exists().where(
+            Review.user_id == user_id,
+            Review.product_id == product_id,
+            Review.deleted_at.is_(None)
+        )
+
     def has_purchased_product(self, user_id: int, product_id: int) -> bool:
-        query = self.db.query(OrderItem).join(Order, OrderItem.order_id == Order.id).filter(
-            Order.user_id == user_id,
-            OrderItem.product_id == product_id
+        return self.db.scalar(select(self._purchased_condition(user_id, product_id)))
+
+    def get_eligibility(self, user_id: int, product_id: int):
+        """(has_purchased, already_reviewed) in one round trip"""
+        return self.db.execute(select(
+            self._purchased_condition(user_id, product_id),
+            self._reviewed_condition(user_id, product_id)
+        )).one()
+
+    def get_purchased_product_ids(self, user_id: int, product_ids: List[int]) -> Set[int]:
+        rows = self.db.execute(union(*(
+            select(item_model.product_id)
+            .join(order_model, item_model.order_id == order_model.id)
+            .where(
+                item_model.product_id.in_(product_ids),
+                order_model.user_id == user_id,
+                order_model.status == OrderStatus.DELIVERED.value
+            )
+            for order_model, item_model in ORDER_SOURCES
+        )))
+        return {product_id for (product_id,) in rows}
+
+    def get_reviewed_product_ids(self, user_id: int, product_ids: List[int]) -> Set[int]:
+        rows = self.db.execute(
+            select(Review.product_id).where(
+                Review.product_id.in_(product_ids),
+                Review.user_id == user_id,
+                Review.deleted_at.is_(None)
+            )
         )
-        
-        # Pull orders to check status more flexibly
-        order_items = query.all()
-        for item in order_items:
-            # Check for multiple possible success statuses, case-insensitive
-            # Supporting both internal 'delivered' and potential display strings
-            order_status = item.order.status.lower() if item.order.status else ""
-            if order_status in ["delivered", "đã giao hàng", "success"]:
-                return True
-        
-        return False
+        return {product_id for (product_id,) in rows}
+
     def create(self, user_id: int, data: dict):
         new_review = Review(
             user_id=user_id,
@@ -73,12 +112,15 @@ class ReviewRepository:
             created_at=datetime.now(),
         )
         self.db.add(new_review)
+        ProductRatingRepository.apply(self.db, new_review.product_id, new_review.rating, 1)
         self.db.commit()
         self.db.refresh(new_review)
         return new_review
     
     def update(self, review: Review, data: dict):
-        if 'rating' in data and data['rating'] is not None:
+        if 'rating' in data and data['rating'] is not None and data['rating'] != review.rating:
+            ProductRatingRepository.apply(self.db, review.product_id, review.rating, -1)
+            ProductRatingRepository.apply(self.db, review.product_id, data['rating'], 1)
             review.rating = data['rating']
         if 'comment' in data and data['comment'] is not None:
             review.comment = data['comment']
@@ -89,6 +131,7 @@ class ReviewRepository:
         return review
     
     def delete(self, review: Review):
+        ProductRatingRepository.apply(self.db, review.product_id, review.rating, -1)
         review.deleted_at = datetime.now()
         self.db.commit()
         self.db.refresh(review)
\ No newline at end of file
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+from datetime import date
+from app.db.base import get_db
+from app.core.security import require_role
+from app.schemas.base_schema import DataResponse
+from app.schemas.analytics_schema import DailySalesSchema, DimensionSalesSchema, TopProductSchema
+from app.services.analytics_service import AnalyticsService
+
+router = APIRouter(prefix="/api/analytics", tags=["Analytics"])
+
+
+@router.get("/sales/daily", response_model=DataResponse[List[DailySalesSchema]])
+def get_daily_sales(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_role(["admin"]))
+):
+    """Admin: Revenue, units and orders per day"""
+    data = AnalyticsService.get_daily_sales(db, start_date, end_date)
+    return DataResponse.custom_response(code="200", message="Daily sales", data=data)
+
+
+@router.get("/sales/by-brand", response_model=DataResponse[List[DimensionSalesSchema]])
+def get_sales_by_brand(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_role(["admin"]))
+):
+    """Admin: Revenue, units and orders per brand"""
+    data = AnalyticsService.get_sales_by_dimension(db, "brand_id", start_date, end_date)
+    return DataResponse.custom_response(code="200", message="Sales by brand", data=data)
+
+
+@router.get("/sales/by-category", response_model=DataResponse[List[DimensionSalesSchema]])
+def get_sales_by_category(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_role(["admin"]))
+):
+    """Admin: Revenue, units and orders per category"""
+    data = AnalyticsService.get_sales_by_dimension(db, "category_id", start_date, end_date)
+    return DataResponse.custom_response(code="200", message="Sales by category", data=data)
+
+
+@router.get("/top-products", response_model=DataResponse[List[TopProductSchema]])
+def get_top_products(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    limit: int = Query(10, ge=1, le=100),
+    order_by: Literal["units", "revenue", "orders"] = Query("units"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_role(["admin"]))
+):
+    """Admin: Best-selling products"""
+    data = AnalyticsService.get_top_products(db, start_date, end_date, limit, order_by)
+    return DataResponse.custom_response(code="200", message="Top products", data=data)
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from typing import Optional
 from sqlalchemy.orm import Session
 from app.core.security import require_role
+from app.core.compression import no_compression
 from app.db.base import get_db
 from app.schemas.user_schemas import RegisterUserSchema, UserSchema, LoginUserSchema, LoginUserResponseSchema, VerifyOtpSchema, LoginUserByGoogleResponseSchema
 from app.services.auth_service import AuthService
@@ -42,10 +44,12 @@ async def verify_otp(
     except HTTPException as e:
         return DataResponse.custom_response(code=str(e.status_code), message=e.detail, data=None)
 @router.post("/login", tags=["auth"], description="Login a user", response_model=DataResponse[LoginUserResponseSchema])
-async def login_user(data: LoginUserSchema, db: Session = Depends(get_db)):
+@no_compression
+async def login_user(data: LoginUserSchema, db: Session = Depends(get_db),
+                     x_guest_cart: Optional[str] = Header(None)):
     auth_service = AuthService(db)
     try:
-        response_data = auth_service.login_user(data)
+        response_data = auth_service.login_user(data, x_guest_cart)
         return DataResponse.custom_response(code="200", message="Login user success", data=response_data)
     except HTTPException as e:
         return DataResponse.custom_response(code=str(e.status_code), message=e.detail, data=None)
@@ -66,6 +70,7 @@ def login_google():
     return RedirectResponse(url)
 
 @router.get("/login/oauth2/code/google", tags=["auth"], description="Google Auth Callback", response_model=DataResponse[LoginUserByGoogleResponseSchema])
+@no_compression
 async def auth_callback(request: Request, db: Session = Depends(get_db)):
     code = request.query_params.get("code")
     if not code:
@@ -85,6 +90,7 @@ async def auth_callback(request: Request, db: Session = Depends(get_db)):
         return DataResponse.custom_response(code="500", message=str(e), data=None)
 
 @router.post("/refresh-token", tags=["auth"], description="Refresh Google Token")
+@no_compression
 async def refresh_access_token(refresh_token: str, db: Session = Depends(get_db)):
     auth_service = AuthService(db)
     try:
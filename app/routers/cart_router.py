@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, status
 from sqlalchemy.orm import Session
-from typing import Annotated
-from app.db.base import get_db
+from typing import Annotated, Optional
+from app.db.base import get_db, get_read_db
 from app.services.cart_service import CartService
+from app.services.guest_cart_service import GuestCartService
 from app.schemas.cart_schema import (
     AddToCartSchema,
-    CartSchema
+    CartSchema,
+    GuestCartMergeSchema,
+    GuestCartSchema
 )
-from app.core.security import get_current_user
+from app.core.security import create_guest_cart_token, get_current_user
 
 router = APIRouter(prefix="/api/cart", tags=["Cart"])
 
@@ -48,3 +51,47 @@ async def clear_cart(
 ):
     """Clear entire cart"""
     return CartService.clear_cart(db, current_user["user_id"])
+
+
+@router.get("/guest", response_model=GuestCartSchema)
+async def get_guest_cart(
+    x_guest_cart: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db)
+):
+    """Get a guest cart from the X-Guest-Cart token; no token gives an empty cart"""
+    return GuestCartService.get_cart(db, x_guest_cart)
+
+
+@router.post("/guest/items", response_model=GuestCartSchema)
+async def add_to_guest_cart(
+    data: AddToCartSchema,
+    x_guest_cart: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db)
+):
+    """Add or update (increment) item in a guest cart; returns the new token"""
+    return GuestCartService.add_to_cart(db, x_guest_cart, data)
+
+
+@router.delete("/guest/items/{line}", response_model=GuestCartSchema)
+async def remove_guest_cart_item(
+    line: int,
+    x_guest_cart: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db)
+):
+    """Remove item from a guest cart by its id (line position)"""
+    return GuestCartService.remove_cart_item(db, x_guest_cart, line)
+
+
+@router.post("/merge", response_model=GuestCartMergeSchema)
+async def merge_guest_cart(
+    current_user: Annotated[dict, Depends(get_current_user)],
+    x_guest_cart: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Merge a guest cart into the current user's cart once (password login merges on its own)"""
+    merged = GuestCartService.merge_into_user_cart(db, current_user["user_id"], x_guest_cart) if x_guest_cart else 0
+    return GuestCartMergeSchema(
+        merged=merged > 0,
+        guest_cart_token=create_guest_cart_token([]),
+        cart=CartService.get_user_cart(db, current_user["user_id"])
+    )
@@ -0,0 +1,55 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from typing import List, Literal
+from app.core.config import settings
+from app.core.security import require_role
+from app.core.query_stats import query_stats
+from app.core.profiler import StackSampler, profile_lock
+from app.schemas.base_schema import DataResponse
+from app.schemas.diagnostics_schema import QueryStatSchema
+
+router = APIRouter(prefix="/api/admin/diagnostics", tags=["Diagnostics"])
+
+
+@router.get("/queries", response_model=DataResponse[List[QueryStatSchema]])
+def get_query_stats(
+    sort_by: Literal["total", "p95", "max", "count"] = "total",
+    limit: int = Query(50, ge=1, le=500),
+    current_user: dict = Depends(require_role(["admin"]))
+):
+    """Admin: Per-fingerprint SQL timings of this worker process"""
+    data = query_stats.snapshot(sort_by, limit)
+    return DataResponse.custom_response(code="200", message="Query statistics", data=data)
+
+
+@router.delete("/queries", response_model=DataResponse[None])
+def reset_query_stats(current_user: dict = Depends(require_role(["admin"]))):
+    """Admin: Clear the query statistics table"""
+    query_stats.reset()
+    return DataResponse.custom_response(code="200", message="Query statistics cleared", data=None)
+
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def run_profile(
+    seconds: float = Query(10, gt=0, le=settings.PROFILER_MAX_SECONDS),
+    interval_ms: float = Query(settings.PROFILER_INTERVAL_MS, ge=1, le=1000),
+    app_only: bool = Query(False, description="Keep only stacks that pass through app code"),
+    current_user: dict = Depends(require_role(["admin"]))
+):
+    """Admin: Sample this worker for a few seconds and return collapsed stacks (flame graph input)"""
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled")
+    if not profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile is already running")
+
+    try:
+        sampler = StackSampler(interval_ms / 1000, app_only=app_only)
+        sampler.start()
+        # Sleeping keeps the event loop free, so the traffic being profiled is still served
+        await asyncio.sleep(seconds)
+        profile = sampler.stop()
+    finally:
+        profile_lock.release()
+
+    return PlainTextResponse(profile, headers={"X-Profile-Samples": str(sampler.samples)})
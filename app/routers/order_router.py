@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, Query, status, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Annotated, Optional
+from typing import Annotated, Optional, Literal
 from datetime import datetime
-from app.db.base import get_db
+from app.db.base import get_db, get_read_db
 from app.services.order_service import OrderService
 from app.schemas.order_schema import (
     OrderSchema,
@@ -20,7 +21,7 @@ async def get_user_orders(
     current_user: Annotated[dict, Depends(get_current_user)],
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get current user's order history"""
     return OrderService.get_user_orders(db, current_user["user_id"], page, limit)
@@ -30,7 +31,7 @@ async def get_user_orders(
 async def get_order(
     order_id: int,
     current_user: Annotated[dict, Depends(get_current_user)],
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get order details"""
     order = OrderService.get_order_by_id(db, order_id)
@@ -52,7 +53,7 @@ async def get_all_orders(
     payment_status: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Admin: Get all orders with optional filters"""
     if current_user.get("role") != "admin":
@@ -72,6 +73,40 @@ async def get_all_orders(
     return OrderService.search_orders(db, filters)
 
 
+@router.get("/admin/export")
+async def export_orders(
+    current_user: Annotated[dict, Depends(get_current_user)],
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    user_id: Optional[int] = Query(None),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    payment_status: Optional[str] = Query(None),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    db: Session = Depends(get_read_db)
+):
+    """Admin: Stream all matching orders with their items as CSV or NDJSON"""
+    if current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    
+    filters = OrderSearchSchema(
+        user_id=user_id,
+        status=status_filter,
+        payment_status=payment_status,
+        start_date=start_date,
+        end_date=end_date
+    )
+    
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        OrderService.export_orders(db, filters, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="orders.{format}"'}
+    )
+
+
 @router.get("/search/all", response_model=OrderHistorySchema)
 async def search_orders(
     current_user: Annotated[dict, Depends(get_current_user)],
@@ -81,7 +116,7 @@ async def search_orders(
     end_date: Optional[datetime] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Search user's orders with filters"""
     filters = OrderSearchSchema(
@@ -104,7 +139,7 @@ async def get_orders_by_user(
     current_user: Annotated[dict, Depends(get_current_user)],
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Admin: Get all orders by specific user"""
     # Check if current user is admin
@@ -123,7 +158,7 @@ async def get_orders_by_product(
     current_user: Annotated[dict, Depends(get_current_user)],
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Admin: Get all orders containing specific product"""
     # Check if current user is admin
@@ -152,6 +187,6 @@ async def update_order_status(
         )
     
     if data.status:
-        OrderService.update_order_status(db, order_id, data.status)
+        OrderService.update_order_status(db, order_id, data.status.value)
     
     return OrderService.get_order_by_id(db, order_id)
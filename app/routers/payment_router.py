@@ -1,7 +1,6 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, Request, status, HTTPException
 from sqlalchemy.orm import Session
-from typing import Annotated
-import stripe
+from typing import Annotated, Optional
 from app.db.base import get_db
 from app.services.payment_service import PaymentService
 from app.schemas.payment_schema import (
@@ -13,37 +12,56 @@ from app.schemas.payment_schema import (
 
 from app.schemas.order_schema import OrderSchema, DeliveryAddressSchema
 from app.core.security import get_current_user
+from app.core.compression import no_compression
 
 router = APIRouter(prefix="/api/payments", tags=["Payments"])
 
 
 @router.post("/create-intent", response_model=PaymentIntentResponseSchema)
+@no_compression
 async def create_payment_intent(
     amount: int,
     current_user: Annotated[dict, Depends(get_current_user)]
 ):
     """Create Stripe payment intent for cart total"""
-    return PaymentService.create_payment_intent(amount)
+    return await PaymentService.create_payment_intent(amount, current_user["user_id"])
 
 
 @router.post("/confirm-from-cart", response_model=OrderSchema, status_code=status.HTTP_201_CREATED)
 async def confirm_payment_from_cart(
     data: ConfirmPaymentFromCartSchema,
     current_user: Annotated[dict, Depends(get_current_user)],
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
 ):
     """Confirm payment and create order from cart"""
-    return PaymentService.confirm_payment_from_cart(db, current_user["user_id"], data)
+    return await PaymentService.confirm_payment_from_cart(db, current_user["user_id"], data, idempotency_key)
 
 
 @router.post("/confirm-from-products", response_model=OrderSchema, status_code=status.HTTP_201_CREATED)
 async def confirm_payment_from_products(
     data: ConfirmPaymentFromProductsSchema,
     current_user: Annotated[dict, Depends(get_current_user)],
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
 ):
     """Confirm payment and create order from products (buy now)"""
-    return PaymentService.confirm_payment_from_products(db, current_user["user_id"], data)
+    return await PaymentService.confirm_payment_from_products(db, current_user["user_id"], data, idempotency_key)
+
+
+@router.post("/webhook")
+async def stripe_webhook(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    stripe_signature: Optional[str] = Header(None, alias="Stripe-Signature"),
+    db: Session = Depends(get_db)
+):
+    """Receive Stripe events; payment_intent.* events finalize orders in the background"""
+    payload = await request.body()
+    payment_event_id = PaymentService.record_webhook_event(db, payload, stripe_signature)
+    if payment_event_id is not None:
+        background_tasks.add_task(PaymentService.process_webhook_event, payment_event_id)
+    return {"received": True}
 
 
 @router.post("/test-confirm/{payment_intent_id}")
@@ -55,7 +73,7 @@ async def test_confirm_payment(
     TEST ONLY: Auto confirm payment on Stripe using test card.
     After this, call /confirm-from-cart or /confirm-from-products to create order.
     """
-    return PaymentService.test_confirm_payment(payment_intent_id)
+    return await PaymentService.test_confirm_payment(payment_intent_id)
 
 
 
@@ -1,6 +1,8 @@
-from typing import Optional
-from fastapi import APIRouter, Depends, Query
-from app.db.base import get_db
+import json
+from typing import Optional, Literal
+from fastapi import APIRouter, Depends, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
+from app.db.base import get_db, get_read_db
 from sqlalchemy.orm import Session
 from app.models.product_model import Product
 from app.schemas.product_schema import ProductSchema, CreateProductSchema, UpdateProductSchema, ProductResponse, ProductFilter, ProductResponseDetail
@@ -12,7 +14,7 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.db.base import get_db
-from app.schemas.product_schema import ProductSchema, CreateProductSchema, UpdateProductSchema, ProductPaginationSchema
+from app.schemas.product_schema import ProductSchema, CreateProductSchema, UpdateProductSchema, ProductPaginationSchema, BulkProductUpdateSchema, BulkProductUpdateResponse, ProductBatchSchema
 from app.schemas.base_schema import DataResponse
 from app.services.product_service import ProductService
 from app.repositories.product_repository import ProductRepository
@@ -25,17 +27,24 @@ def get_product_service(db: Session = Depends(get_db)) -> ProductService:
     repository = ProductRepository(db)
     return ProductService(repository)
 
-@router.get("/products", tags=["products"], description="Get all products", response_model=DataResponse[ProductPaginationSchema])
+def get_product_read_service(db: Session = Depends(get_read_db)) -> ProductService:
+    return ProductService(ProductRepository(db))
+
+@router.get("/products", tags=["products"], description="Get all products", response_model=DataResponse[ProductPaginationSchema], response_model_exclude_unset=True)
 async def get_products(
     limit: int = 10, 
     page: int = 1, 
     keyword: Optional[str] = None, 
     search_type: str = "title",
     sort_by: Optional[str] = None,
-    service: ProductService = Depends(get_product_service)
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to return, e.g. id,name,price,thumbnail"),
+    view: Literal["full", "list"] = Query("full", description="list: id, name, price, thumbnail, sold_count, rating"),
+    service: ProductService = Depends(get_product_read_service)
 ):
     # Sử dụng get_products_v2 vì nó hỗ trợ limit, page, keyword và trả về đúng schema ProductPaginationSchema
-    products_data = service.get_products_v2(limit=limit, page=page, keyword=keyword, search_type=search_type, sort_by=sort_by)
+    products_data = service.get_products_v2(
+        limit=limit, page=page, keyword=keyword, search_type=search_type, sort_by=sort_by, fields=fields, view=view
+    )
     return DataResponse.custom_response(code="200", message="get list products", data=products_data)
 
 @router.post("/products", tags=["products"], description="Create a new product", response_model=DataResponse[ProductSchema])
@@ -43,8 +52,56 @@ async def create_product(data: CreateProductSchema, service: ProductService = De
     product = service.create_product(data)
     return DataResponse.custom_response(code="201", message="Create product page", data=product)
 
+@router.post("/products/import", tags=["products"], description="Admin: Bulk import products from a CSV or JSONL file")
+def import_products(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "jsonl"]] = Query(None, description="Defaults to the file extension"),
+    service: ProductService = Depends(get_product_service),
+    current_user: dict = Depends(require_role(["admin"]))
+):
+    file_format = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "jsonl")
+    progress = service.import_products(file.file, file_format)
+    return StreamingResponse(
+        (json.dumps(report, ensure_ascii=False) + "\n" for report in progress),
+        media_type="application/x-ndjson"
+    )
+
+@router.patch("/products/bulk", tags=["products"], description="Admin: Bulk update product prices and variant stock", response_model=DataResponse[BulkProductUpdateResponse])
+def bulk_update_products(
+    data: BulkProductUpdateSchema,
+    service: ProductService = Depends(get_product_service),
+    current_user: dict = Depends(require_role(["admin"]))
+):
+    result = service.bulk_update_products(data.items)
+    return DataResponse.custom_response(code="200", message="Bulk update products", data=result)
+
+@router.get("/products/export", tags=["products"], description="Admin: Stream the full catalog as CSV or JSONL")
+def export_products(
+    format: Literal["csv", "jsonl"] = "jsonl",
+    service: ProductService = Depends(get_product_service),
+    current_user: dict = Depends(require_role(["admin"]))
+):
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        service.export_products(format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="products.{format}"'}
+    )
+
+@router.get("/products/batch", tags=["products"], description="Get up to PRODUCT_BATCH_MAX_IDS products by id, in the order given", response_model=DataResponse[ProductBatchSchema])
+def get_products_batch(
+    ids: str = Query(..., description="Comma-separated product ids, e.g. 3,1,2"),
+    service: ProductService = Depends(get_product_read_service)
+):
+    try:
+        product_ids = [int(product_id) for product_id in ids.split(",") if product_id.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    products = service.get_products_by_ids(product_ids)
+    return DataResponse.custom_response(code="200", message="Get products by ids", data=products)
+
 @router.get("/products/{product_id}", tags=["products"], description="Get a product by id", response_model=DataResponse[ProductSchema])
-def get_product(product_id: int, service: ProductService = Depends(get_product_service)):
+def get_product(product_id: int, service: ProductService = Depends(get_product_read_service)):
     product = service.get_product(product_id)
     return DataResponse.custom_response(code="200", message="Get product by id", data=product)
 
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from app.db.base import get_db
+from app.db.base import get_db, get_read_db
 from app.middleware.authenticate import authenticate
 from app.models.user_model import User
 from app.services.review_service import ReviewService
@@ -38,7 +38,7 @@ def get_reviews_by_product(
     product_id: int = Query(..., description="ID of the product"),
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     service = ReviewService(db)
     data, pagination = service.get_product_reviews(product_id, page, size)
@@ -53,7 +53,7 @@ def get_reviews_by_product(
 def get_my_reviews(
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(current_user_dependency)
 ):
     service = ReviewService(db)
@@ -97,7 +97,7 @@ def delete_review(
 @router.get("/reviews/check-eligibility", tags=["reviews"], description="Check if user can review product")
 def check_eligibility(
     product_id: int = Query(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(current_user_dependency)
 ):
     service = ReviewService(db)
@@ -108,11 +108,25 @@ def check_eligibility(
         data=result
     )
 
+@router.get("/reviews/check-eligibility/batch", tags=["reviews"], description="Check review eligibility for many products at once")
+def check_eligibility_batch(
+    product_ids: List[int] = Query(..., min_length=1, max_length=200),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(current_user_dependency)
+):
+    service = ReviewService(db)
+    result = service.check_eligibility_batch(current_user.id, product_ids)
+    return DataResponse.custom_response(
+        code="200",
+        message="Eligibility checked",
+        data=result
+    )
+
 @router.get("/reviews/admin/all", tags=["reviews"], description="Admin: Get all reviews", response_model=ResponseSchema[List[ReviewResponse]])
 def get_all_reviews_admin(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(require_role(["admin"]))
 ):
     service = ReviewService(db)
@@ -0,0 +1,28 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import date
+
+
+class DailySalesSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    day: date
+    revenue: float
+    units: int
+    orders: int
+
+
+class DimensionSalesSchema(BaseModel):
+    """Sales grouped by brand or category (id is None for unassigned products)"""
+    id: Optional[int] = None
+    revenue: float
+    units: int
+    orders: int
+
+
+class TopProductSchema(BaseModel):
+    product_id: int
+    product_name: Optional[str] = None
+    revenue: float
+    units: int
+    orders: int
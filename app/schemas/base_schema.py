@@ -1,10 +1,17 @@
-from pydantic import BaseModel
-from pydantic.generics import GenericModel
+from pydantic import BaseModel, ConfigDict
 from typing import TypeVar, Generic, Optional
 
 
 T = TypeVar("T")
 
+def is_success_code(code: Optional[str]) -> bool:
+    """
+    Whether a response body's code reports success ("000" or 2xx). Handlers
+    return some errors as HTTP 200 with the real status in the code, such as
+    "422" for validation errors; a body without a code counts as success.
+    """
+    return code is None or str(code) == "000" or str(code).startswith("2")
+
 class ResponseSchemaBase(BaseModel):
     __abstract__ = True
 
@@ -16,11 +23,10 @@ class ResponseSchemaBase(BaseModel):
         self.message = message
         return self
     
-class DataResponse(ResponseSchemaBase, GenericModel, Generic[T]):
-    data: Optional[T] = None
+class DataResponse(ResponseSchemaBase, Generic[T]):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
-    class Config:
-        arbitrary_types_allowed = True
+    data: Optional[T] = None
 
     @classmethod
     def custom_response(cls, code: str, message: str, data: T):
@@ -39,11 +39,32 @@ class CartItemWithProductSchema(BaseModel):
 
 
 class CartSchema(BaseModel):
-    """Complete cart with items and total"""
-    id: int
+    """Complete cart with items and total; id and timestamps are null until the first item is added"""
+    id: Optional[int] = None
     user_id: int
     items: List[CartItemWithProductSchema]
     total_items: int
     total_amount: float
-    created_at: datetime
-    updated_at: datetime
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class GuestCartSchema(BaseModel):
+    """
+    Guest cart priced from the catalog. Item ids are line positions in the
+    token; store `token` in place of the one sent, it is re-signed on every call.
+    """
+    token: str
+    items: List[CartItemWithProductSchema]
+    total_items: int
+    total_amount: float
+
+
+class GuestCartMergeSchema(BaseModel):
+    """
+    Result of merging a guest cart. The guest token is spent either way;
+    replace it with `guest_cart_token`, a fresh empty cart.
+    """
+    merged: bool
+    guest_cart_token: str
+    cart: CartSchema
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class QueryStatSchema(BaseModel):
+    """Timings of one normalized SQL statement since startup or the last reset"""
+    fingerprint: str
+    count: int
+    total_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    slow_count: int
+    last_slow_origin: Optional[str] = None
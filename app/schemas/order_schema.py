@@ -1,6 +1,7 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+from app.models.order_model import OrderStatus
 
 
 class DeliveryAddressSchema(BaseModel):
@@ -98,6 +99,11 @@ class CreateOrderSchema(BaseModel):
 
 class UpdateOrderSchema(BaseModel):
     delivery_address: Optional[DeliveryAddressSchema] = None
-    status: Optional[str] = None
+    status: Optional[OrderStatus] = None
     total_amount: Optional[float] = None
 
+    @field_validator("status", mode="before")
+    @classmethod
+    def normalize_status(cls, value):
+        return value.strip().lower() if isinstance(value, str) else value
+
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 
@@ -12,6 +12,12 @@ class ProductVariantSchema(BaseModel):
     stock_quantity: int
 
 
+class ProductRatingSchema(BaseModel):
+    average: float = 0
+    count: int = 0
+    histogram: Dict[str, int] = {}
+
+
 class ProductSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
@@ -26,16 +32,49 @@ class ProductSchema(BaseModel):
     variants: Optional[List[Dict[str, Any]]] = None
     deleted_at: Optional[datetime] = None
     sold_count: int = 0
+    rating: Optional[ProductRatingSchema] = None
+
+
+class ProductListItemSchema(BaseModel):
+    """
+    One GET /products item. Every field is optional so fields= can select any
+    subset; the route leaves out fields that were not loaded (exclude_unset).
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+    id: Optional[int] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[float] = None
+    category_id: Optional[int] = None
+    brand_id: Optional[int] = None
+    status: Optional[str] = None
+    image_urls: Optional[List[FileProductResponse]] = None
+    thumbnail: Optional[str] = None
+    variants: Optional[List[Dict[str, Any]]] = None
+    deleted_at: Optional[datetime] = None
+    sold_count: Optional[int] = None
+    rating: Optional[ProductRatingSchema] = None
+
+
+# view=list: what a product card needs
+PRODUCT_LIST_FIELDS = ("id", "name", "price", "thumbnail", "sold_count", "rating")
 
 
 class ProductPaginationSchema(BaseModel):
-    items: List[ProductSchema]
+    items: List[ProductListItemSchema]
     total: int
     page: int
     limit: int
     total_pages: int
 
 
+class ProductBatchSchema(BaseModel):
+    """Found products in the order their ids were asked for; missing_ids were not found or are deleted"""
+    items: List[ProductSchema]
+    missing_ids: List[int]
+
+
 class CreateProductSchema(BaseModel):
     name: str
     description: Optional[str] = None
@@ -98,4 +137,32 @@ class ProductFilter(BaseModel):
 
     sort_by: Optional[
         Literal["price_asc", "price_desc", "newest"]
-    ] = "newest"
\ No newline at end of file
+    ] = "newest"
+
+
+class BulkProductUpdateItem(BaseModel):
+    """One price and/or stock change; stock changes target the (size, color) variant"""
+    product_id: int
+    size: Optional[int] = None
+    color: Optional[str] = None
+    price: Optional[float] = None
+    price_delta: Optional[float] = None
+    stock_quantity: Optional[int] = None
+    stock_delta: Optional[int] = None
+
+
+class BulkProductUpdateSchema(BaseModel):
+    items: List[BulkProductUpdateItem] = Field(..., min_length=1, max_length=10000)
+
+
+class BulkProductUpdateResult(BaseModel):
+    index: int
+    product_id: int
+    success: bool
+    message: Optional[str] = None
+
+
+class BulkProductUpdateResponse(BaseModel):
+    updated: int
+    failed: int
+    results: List[BulkProductUpdateResult]
@@ -50,6 +50,10 @@ class LoginUserResponseSchema(BaseModel):
     access_token: str
     token_type: str = "Bearer"
     role: Optional[str] = None
+    # Set when an X-Guest-Cart token was sent: the token is spent, replace it
+    # with guest_cart_token (a fresh empty cart)
+    guest_cart_merged: bool = False
+    guest_cart_token: Optional[str] = None
 
 class LoginUserByGoogleResponseSchema(BaseModel):
     access_token: str
@@ -0,0 +1,88 @@
+import asyncio
+from datetime import date
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.core.events import event_bus, OrderStatusChanged
+from app.db.base import SessionLocal
+from app.models.product_model import Product
+from app.repositories.analytics_repository import AnalyticsRepository
+from app.repositories.order_repository import OrderRepository
+from app.schemas.analytics_schema import DailySalesSchema, DimensionSalesSchema, TopProductSchema
+
+# Orders in these statuses count as sales in the rollups
+COUNTED_ORDER_STATUSES = ["processing", "shipped", "delivered"]
+
+
+class AnalyticsService:
+    @staticmethod
+    def sync_order(db: Session, order_id: int) -> None:
+        """
+        Bring the rollups in line with the order's current status. Safe to run
+        any number of times per transition: the sales_rollup_orders set records
+        whether the order is already counted.
+        """
+        order = OrderRepository.get_order_by_id(db, order_id)
+        if not order:
+            return
+
+        if order.status in COUNTED_ORDER_STATUSES:
+            changed = AnalyticsRepository.mark_order_counted(db, order_id)
+            sign = 1
+        else:
+            changed = AnalyticsRepository.unmark_order_counted(db, order_id)
+            sign = -1
+
+        if changed:
+            AnalyticsRepository.apply_order(db, order, OrderRepository.get_order_items(db, order_id), sign)
+        db.commit()
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        return AnalyticsRepository.rebuild(db, COUNTED_ORDER_STATUSES)
+
+    @staticmethod
+    def get_daily_sales(db: Session, start_date: Optional[date], end_date: Optional[date]) -> List[DailySalesSchema]:
+        return [
+            DailySalesSchema.model_validate(row)
+            for row in AnalyticsRepository.get_daily_sales(db, start_date, end_date)
+        ]
+
+    @staticmethod
+    def get_sales_by_dimension(db: Session, dimension: str, start_date: Optional[date],
+                               end_date: Optional[date]) -> List[DimensionSalesSchema]:
+        rows = AnalyticsRepository.get_sales_by_dimension(db, dimension, start_date, end_date)
+        return [
+            DimensionSalesSchema(id=row.key, revenue=row.revenue, units=row.units, orders=row.orders)
+            for row in rows
+        ]
+
+    @staticmethod
+    def get_top_products(db: Session, start_date: Optional[date], end_date: Optional[date],
+                         limit: int, order_by: str) -> List[TopProductSchema]:
+        rows = AnalyticsRepository.get_top_products(db, start_date, end_date, limit, order_by)
+        names = dict(
+            db.query(Product.id, Product.name).filter(Product.id.in_([row.product_id for row in rows])).all()
+        )
+        return [
+            TopProductSchema(
+                product_id=row.product_id,
+                product_name=names.get(row.product_id),
+                revenue=row.revenue,
+                units=row.units,
+                orders=row.orders
+            )
+            for row in rows
+        ]
+
+
+def _sync_order_rollups(order_id: int) -> None:
+    db = SessionLocal()
+    try:
+        AnalyticsService.sync_order(db, order_id)
+    finally:
+        db.close()
+
+
+@event_bus.subscribe(OrderStatusChanged)
+async def update_sales_rollups(event: OrderStatusChanged):
+    await asyncio.to_thread(_sync_order_rollups, event.order_id)
@@ -1,7 +1,8 @@
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.models.user_model import OTPType, User
 from app.schemas.user_schemas import RegisterUserSchema, LoginUserResponseSchema, LoginUserSchema, LoginUserByGoogleResponseSchema
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import hash_password, verify_password, create_access_token, create_guest_cart_token
 from app.core.config import settings
 from fastapi import HTTPException
 import httpx
@@ -9,6 +10,7 @@ from app.repositories.user_repository import UserRepository
 from app.core.config import logger
 from datetime import datetime, timedelta, timezone
 from app.services.email_service import EmailService
+from app.services.guest_cart_service import GuestCartService
 
 
 from app.repositories.role_repository import RoleRepository
@@ -32,7 +34,7 @@ class AuthService:
         )
         return self.user_repo.create_user(user)
 
-    def login_user(self, data: LoginUserSchema) -> LoginUserResponseSchema:
+    def login_user(self, data: LoginUserSchema, guest_cart_token: Optional[str] = None) -> LoginUserResponseSchema:
    
         user = self.user_repo.get_by_email(data.email)
         if not user:
@@ -50,11 +52,17 @@ class AuthService:
         logger.info("Role name: %s", role_name)
         token = create_access_token(user.id, role_name)
 
-        return LoginUserResponseSchema(
+        response = LoginUserResponseSchema(
             access_token=token, 
             token_type="Bearer",
             role=role_name
         )
+        if guest_cart_token:
+            merged = GuestCartService.merge_into_user_cart(self.db, user.id, guest_cart_token)
+            logger.info("Merged %s guest cart lines for user %s", merged, user.id)
+            response.guest_cart_merged = merged > 0
+            response.guest_cart_token = create_guest_cart_token([])
+        return response
 
     async def google_login(self, code: str) -> LoginUserResponseSchema:
         data = {
@@ -18,6 +18,9 @@ class CartService:
     def get_user_cart(db: Session, user_id: int) -> CartSchema:
         """Get user's cart with all items and product details"""
         cart = CartRepository.get_user_cart(db, user_id)
+        if not cart:
+            # Created on the first add; viewing an empty cart must not write
+            return CartSchema(id=None, user_id=user_id, items=[], total_items=0, total_amount=0)
         cart_items = CartRepository.get_cart_items(db, cart.id)
         
         items_with_products = []
@@ -87,7 +90,7 @@ class CartService:
             )
 
         # 4. Get cart & calculate final quantity
-        cart = CartRepository.get_user_cart(db, user_id)
+        cart = CartRepository.get_or_create_user_cart(db, user_id)
 
         final_quantity = data.quantity
         existing_item = CartRepository.get_cart_item(
@@ -147,7 +150,7 @@ class CartService:
         cart = CartRepository.get_user_cart(db, user_id)
         item = CartRepository.get_cart_item_by_id(db, item_id)
         
-        if not item or item.cart_id != cart.id:
+        if not cart or not item or item.cart_id != cart.id:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Cart item not found"
@@ -161,6 +164,7 @@ class CartService:
     def clear_cart(db: Session, user_id: int):
         """Clear all items from cart"""
         cart = CartRepository.get_user_cart(db, user_id)
-        CartRepository.clear_cart(db, cart.id)
+        if cart:
+            CartRepository.clear_cart(db, cart.id)
         
         return {"message": "Cart cleared successfully"}
@@ -125,6 +125,34 @@ class EmailService:
         await self.fastmail.send_message(message)
 
 
+    async def send_order_email(self, email: str, subject: str, message_text: str):
+        body = f"""
+            <!DOCTYPE html>
+            <html>
+            <head>
+            <meta charset="UTF-8">
+            </head>
+            <body style="font-family: 'Segoe UI', Arial, sans-serif; background-color: #f3f4f6; padding: 24px;">
+            <div style="max-width: 480px; margin: auto; background: #ffffff; border-radius: 12px; padding: 24px; color: #333;">
+                <h2 style="margin-top:0; color: #2563eb;">{subject}</h2>
+                <p>{message_text}</p>
+                <p style="font-size: 12px; color: #9ca3af; text-align: center; margin-top: 24px;">
+                © {datetime.now().year} ShoesPyBaBa. All rights reserved.
+                </p>
+            </div>
+            </body>
+            </html>
+            """
+
+        message = MessageSchema(
+            subject=subject,
+            recipients=[email],
+            body=body,
+            subtype="html",
+        )
+
+        await self.fastmail.send_message(message)
+
     @staticmethod
     def generate_otp():
         return ''.join(random.choices(string.digits, k=6))
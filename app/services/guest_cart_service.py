@@ -0,0 +1,181 @@
+import hashlib
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+import orjson
+from fastapi import HTTPException, status
+from app.core.config import settings, logger
+from app.core.response_cache import catalog_cache
+from app.core.security import create_guest_cart_token, decode_guest_cart_token
+from app.repositories.cart_repository import CartRepository
+from app.repositories.product_repository import ProductRepository
+from app.schemas.cart_schema import AddToCartSchema, CartItemWithProductSchema, GuestCartSchema
+
+
+class GuestCartService:
+    """
+    Carts for anonymous users, kept entirely in a signed token the client
+    holds. Nothing is written until login merges the lines into the user's
+    cart; prices and availability come from the catalog cache when the
+    product page is cached, otherwise from one IN query.
+    """
+
+    @staticmethod
+    def _products(db: Session, product_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        products = {}
+        missing = []
+        for product_id in set(product_ids):
+            entry = catalog_cache.get(f"/products/{product_id}") if catalog_cache.enabled else None
+            if entry is not None:
+                products[product_id] = orjson.loads(entry.body)["data"]
+            else:
+                missing.append(product_id)
+        if missing:
+            products.update(ProductRepository(db).get_rows_for_cart(missing))
+        return products
+
+    @staticmethod
+    def _variant(product: Optional[Dict[str, Any]], size: Optional[int], color: Optional[str]):
+        """The product's matching variant; None when the product cannot be bought"""
+        if not product or product.get("status") != "active":
+            return None
+        return next(
+            (v for v in product.get("variants") or [] if v.get("size") == size and v.get("color") == color),
+            None
+        )
+
+    @staticmethod
+    def _view(products: Dict[int, Dict[str, Any]], lines: List[list], jti: Optional[str]) -> GuestCartSchema:
+        items = []
+        total_amount = 0
+        for position, (product_id, size, color, quantity) in enumerate(lines):
+            product = products.get(product_id)
+            if not product:
+                continue
+            subtotal = quantity * product["price"]
+            total_amount += subtotal
+            items.append(CartItemWithProductSchema(
+                id=position,
+                product_id=product_id,
+                product_name=product["name"],
+                product_image=ProductRepository._thumbnail(product.get("image_urls")),
+                quantity=quantity,
+                size=size,
+                color=color,
+                current_price=product["price"],
+                subtotal=subtotal
+            ))
+        return GuestCartSchema(
+            token=create_guest_cart_token(lines, jti),
+            items=items,
+            total_items=len(items),
+            total_amount=total_amount
+        )
+
+    @staticmethod
+    def get_cart(db: Session, token: Optional[str]) -> GuestCartSchema:
+        lines, jti = decode_guest_cart_token(token) if token else ([], None)
+        products = GuestCartService._products(db, [line[0] for line in lines])
+        # Products deleted since they were added drop out of the cart
+        lines = [line for line in lines if line[0] in products]
+        return GuestCartService._view(products, lines, jti)
+
+    @staticmethod
+    def add_to_cart(db: Session, token: Optional[str], data: AddToCartSchema) -> GuestCartSchema:
+        if not data.size or not data.color:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Size and color are required"
+            )
+
+        lines, jti = decode_guest_cart_token(token) if token else ([], None)
+        products = GuestCartService._products(db, [data.product_id] + [line[0] for line in lines])
+        product = products.get(data.product_id)
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found"
+            )
+        variant = GuestCartService._variant(product, data.size, data.color)
+        if not variant:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Variant not found" if product.get("status") == "active" else "Product is not available"
+            )
+
+        line = next((line for line in lines if line[:3] == [data.product_id, data.size, data.color]), None)
+        final_quantity = data.quantity + (line[3] if line else 0)
+        stock = variant.get("stock_quantity", 0)
+        if stock < final_quantity:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Insufficient stock. Available: {stock}"
+            )
+
+        if line:
+            line[3] = final_quantity
+        elif len(lines) >= settings.GUEST_CART_MAX_ITEMS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Guest cart is full ({settings.GUEST_CART_MAX_ITEMS} items). Please log in"
+            )
+        else:
+            lines.append([data.product_id, data.size, data.color, final_quantity])
+        lines = [line for line in lines if line[3] > 0]
+        return GuestCartService._view(products, lines, jti)
+
+    @staticmethod
+    def remove_cart_item(db: Session, token: Optional[str], position: int) -> GuestCartSchema:
+        lines, jti = decode_guest_cart_token(token) if token else ([], None)
+        if not 0 <= position < len(lines):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Cart item not found"
+            )
+        del lines[position]
+        return GuestCartService._view(GuestCartService._products(db, [line[0] for line in lines]), lines, jti)
+
+    @staticmethod
+    def merge_into_user_cart(db: Session, user_id: int, token: str) -> int:
+        """
+        Add a guest cart's lines to the user's cart in one batched upsert.
+        Each token merges once: its jti is recorded on the cart under a row
+        lock, and a repeat merges nothing. Quantities are capped at the
+        variant's current stock less what the cart already holds; lines whose
+        product or variant is gone are dropped, and a bad token merges nothing
+        rather than failing the login. Returns the number of lines merged.
+        """
+        try:
+            lines, jti = decode_guest_cart_token(token)
+        except HTTPException as e:
+            logger.warning("Guest cart not merged for user %s: %s", user_id, e.detail)
+            return 0
+        if not lines:
+            return 0
+        # Tokens signed before carts carried a jti are named by their hash
+        jti = jti or hashlib.sha256(token.encode()).hexdigest()[:32]
+
+        cart = CartRepository.lock_cart(db, CartRepository.get_or_create_user_cart(db, user_id).id)
+        if cart.merged_guest_cart_jti == jti:
+            db.commit()
+            logger.info("Guest cart %s already merged for user %s", jti, user_id)
+            return 0
+
+        # Stock is read from the database, not the catalog cache, so the cap is current
+        products = ProductRepository(db).get_rows_for_cart(list({line[0] for line in lines}))
+        in_cart = {
+            (item.product_id, item.size, item.color): item.quantity
+            for item in CartRepository.get_cart_items(db, cart.id)
+        }
+        merged = {}
+        for product_id, size, color, quantity in lines:
+            variant = GuestCartService._variant(products.get(product_id), size, color)
+            if quantity > 0 and variant:
+                key = (product_id, size, color)
+                available = variant.get("stock_quantity", 0) - in_cart.get(key, 0) - merged.get(key, 0)
+                if available > 0:
+                    merged[key] = merged.get(key, 0) + min(quantity, available)
+
+        cart.merged_guest_cart_jti = jti
+        # add_items_to_cart commits the jti with the lines
+        CartRepository.add_items_to_cart(db, cart.id, [(*key, quantity) for key, quantity in merged.items()])
+        return len(merged)
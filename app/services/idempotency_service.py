@@ -0,0 +1,117 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.repositories.idempotency_repository import IdempotencyRepository
+
+
+class _ResponseCache:
+    """Bounded in-memory LRU of completed responses, checked before the database"""
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[Tuple[int, str, str], Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key: Tuple[int, str, str]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            entry = self._items.get(cache_key)
+            if entry is None:
+                return None
+            stored_at, request_hash, response = entry
+            if time.monotonic() - stored_at > self._ttl_seconds:
+                del self._items[cache_key]
+                return None
+            self._items.move_to_end(cache_key)
+            return request_hash, response
+
+    def set(self, cache_key: Tuple[int, str, str], request_hash: str, response: Dict[str, Any]) -> None:
+        with self._lock:
+            self._items[cache_key] = (time.monotonic(), request_hash, response)
+            self._items.move_to_end(cache_key)
+            while len(self._items) > self._max_size:
+                self._items.popitem(last=False)
+
+
+_cache = _ResponseCache(
+    max_size=settings.IDEMPOTENCY_CACHE_SIZE,
+    ttl_seconds=settings.IDEMPOTENCY_KEY_TTL_HOURS * 3600,
+)
+
+
+class IdempotencyService:
+    @staticmethod
+    def _hash_request(payload: BaseModel) -> str:
+        return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+    @staticmethod
+    def _replay(request_hash: str, stored_hash: str, response: Dict[str, Any],
+                response_schema: Type[BaseModel]) -> BaseModel:
+        if stored_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency key was already used with a different request."
+            )
+        return response_schema.model_validate(response)
+
+    @staticmethod
+    async def execute(
+        db: Session,
+        user_id: int,
+        scope: str,
+        key: Optional[str],
+        payload: BaseModel,
+        response_schema: Type[BaseModel],
+        operation: Callable[[], Awaitable[BaseModel]],
+    ) -> BaseModel:
+        """
+        Run operation at most once per (user, scope, key).
+
+        Retries with the same key get the stored response without running the
+        operation again; a retry that arrives while the first attempt is still
+        running gets 409. Failed attempts release the key so the client can retry.
+        """
+        if not key:
+            return await operation()
+
+        cache_key = (user_id, scope, key)
+        request_hash = IdempotencyService._hash_request(payload)
+
+        cached = _cache.get(cache_key)
+        if cached:
+            return IdempotencyService._replay(request_hash, cached[0], cached[1], response_schema)
+
+        if not IdempotencyRepository.reserve(db, user_id, scope, key, request_hash):
+            record = IdempotencyRepository.get(db, user_id, scope, key)
+            expired_before = datetime.now() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+            if record and record.created_at and record.created_at < expired_before:
+                IdempotencyRepository.release(db, user_id, scope, key)
+                return await IdempotencyService.execute(db, user_id, scope, key, payload, response_schema, operation)
+            if record and record.status == "completed":
+                _cache.set(cache_key, record.request_hash, record.response)
+                return IdempotencyService._replay(request_hash, record.request_hash, record.response, response_schema)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this idempotency key is already in progress."
+            )
+
+        try:
+            result = await operation()
+        except Exception:
+            db.rollback()
+            IdempotencyRepository.release(db, user_id, scope, key)
+            raise
+
+        response = result.model_dump(mode="json")
+        IdempotencyRepository.complete(db, user_id, scope, key, response)
+        _cache.set(cache_key, request_hash, response)
+        return result
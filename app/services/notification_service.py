@@ -0,0 +1,45 @@
+import asyncio
+from typing import Optional
+from app.core.config import settings, logger
+from app.core.events import event_bus, OrderCreated, OrderStatusChanged
+from app.db.base import SessionLocal
+from app.models.user_model import User
+from app.services.email_service import EmailService
+
+
+def _get_user_email(user_id: int) -> Optional[str]:
+    db = SessionLocal()
+    try:
+        user = db.query(User.email).filter(User.id == user_id).first()
+        return user.email if user else None
+    finally:
+        db.close()
+
+
+async def _send_order_email(user_id: int, subject: str, message_text: str):
+    if not settings.EMAIL_USERNAME:
+        logger.info("Email not configured, skipping '%s' for user %s", subject, user_id)
+        return
+
+    email = await asyncio.to_thread(_get_user_email, user_id)
+    if not email:
+        return
+    await EmailService().send_order_email(email, subject, message_text)
+
+
+@event_bus.subscribe(OrderCreated)
+async def send_order_confirmation(event: OrderCreated):
+    await _send_order_email(
+        event.user_id,
+        f"Order #{event.order_id} received",
+        f"Thank you for your order. Total amount: {event.total_amount:,.0f} VND.",
+    )
+
+
+@event_bus.subscribe(OrderStatusChanged)
+async def send_order_status_update(event: OrderStatusChanged):
+    await _send_order_email(
+        event.user_id,
+        f"Order #{event.order_id} is now {event.new_status}",
+        f"Your order status changed from {event.old_status} to {event.new_status}.",
+    )
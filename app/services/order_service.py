@@ -1,5 +1,8 @@
+import csv
+import io
+import json
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Optional, List, Iterator
 from fastapi import HTTPException, status
 from app.repositories.order_repository import OrderRepository
 from app.repositories.cart_repository import CartRepository
@@ -12,8 +15,17 @@ from app.schemas.order_schema import (
     OrderHistorySchema
 )
 from app.models.product_model import Product
+from app.core.events import event_bus, OrderCreated, OrderStatusChanged
+from app.core.config import settings
 import math
 
+ORDER_EXPORT_FIELDS = [
+    "order_id", "user_id", "created_at", "status", "payment_status", "payment_method",
+    "payment_intent_id", "total_amount", "delivery_address",
+    "item_id", "product_id", "product_name", "size", "color", "quantity", "price_at_purchase",
+]
+ORDER_ITEM_EXPORT_FIELDS = ORDER_EXPORT_FIELDS[ORDER_EXPORT_FIELDS.index("item_id"):]
+
 
 class OrderService:
     @staticmethod
@@ -38,12 +50,57 @@ class OrderService:
             "price_at_purchase": item.price_at_purchase
         }
     
+    @staticmethod
+    def _map_order(order, items) -> dict:
+        return {
+            "id": order.id,
+            "user_id": order.user_id,
+            "user_full_name": order.user.full_name if order.user else None,
+            "delivery_address": order.delivery_address,
+            "order_date": order.order_date,
+            "total_amount": order.total_amount,
+            "status": order.status,
+            "payment_status": order.payment_status,
+            "payment_intent_id": order.payment_intent_id,
+            "payment_method": order.payment_method,
+            "created_at": order.created_at,
+            "updated_at": order.updated_at,
+            "items": [OrderService._map_order_item(item) for item in items]
+        }
+    
+    @staticmethod
+    def _order_history(db: Session, orders, total: int, page: int, limit: int) -> OrderHistorySchema:
+        """
+        Validate the whole page in one pass. The result is an instance of the
+        route's response_model, which FastAPI serializes without validating again.
+        """
+        return OrderHistorySchema.model_validate({
+            "orders": [
+                OrderService._map_order(order, OrderRepository.get_items(db, order))
+                for order in orders
+            ],
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "total_pages": math.ceil(total / limit) if total > 0 else 0
+        })
+    
+    @staticmethod
+    def _check_paid_amount(total_amount: float, expected_amount: Optional[int]) -> None:
+        """Reject an order whose total differs from what the payment intent charges"""
+        if expected_amount is not None and round(total_amount) != expected_amount:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Payment amount {expected_amount} does not match order total {round(total_amount)}"
+            )
+    
     @staticmethod
     def create_order_from_cart(db: Session, user_id: int, data: CreateOrderFromCartSchema, 
-                              payment_intent_id: Optional[str] = None) -> OrderSchema:
+                              payment_intent_id: Optional[str] = None,
+                              expected_amount: Optional[int] = None) -> OrderSchema:
         # Get user cart
         cart = CartRepository.get_user_cart(db, user_id)
-        cart_items = CartRepository.get_cart_items(db, cart.id)
+        cart_items = CartRepository.get_cart_items(db, cart.id) if cart else []
         
         if not cart_items:
             raise HTTPException(
@@ -53,6 +110,7 @@ class OrderService:
         
         # Calculate total using current product prices
         total_amount = CartRepository.get_cart_total(db, cart.id)
+        OrderService._check_paid_amount(total_amount, expected_amount)
 
         # Create order 
         order = OrderRepository.create_order(
@@ -89,6 +147,13 @@ class OrderService:
                     color=cart_item.color
                 )
         
+        event_bus.publish(OrderCreated(
+            order_id=order.id,
+            user_id=user_id,
+            total_amount=total_amount,
+            payment_method=order.payment_method,
+            payment_intent_id=payment_intent_id
+        ), db)
         db.commit()
         
         # Clear cart after order creation
@@ -103,7 +168,8 @@ class OrderService:
         user_id: int, 
         items: List[DirectOrderItemSchema],
         delivery_address: dict,
-        payment_intent_id: str
+        payment_intent_id: str,
+        expected_amount: Optional[int] = None
     ) -> OrderSchema:
         """Create order directly from product list (buy now)"""
         if not items:
@@ -159,6 +225,8 @@ class OrderService:
             total_amount += item.quantity * product.price
             validated_items.append((item, product))
         
+        OrderService._check_paid_amount(total_amount, expected_amount)
+
         # Create order (always use stripe payment)
         order = OrderRepository.create_order(
             db=db,
@@ -192,6 +260,13 @@ class OrderService:
                 color=item.color
             )
         
+        event_bus.publish(OrderCreated(
+            order_id=order.id,
+            user_id=user_id,
+            total_amount=total_amount,
+            payment_method=order.payment_method,
+            payment_intent_id=payment_intent_id
+        ), db)
         db.commit()
         
         # Return order with items
@@ -199,65 +274,24 @@ class OrderService:
     
     @staticmethod
     def get_order_by_id(db: Session, order_id: int) -> OrderSchema:
-        """Get order with items"""
-        order = OrderRepository.get_order_by_id(db, order_id)
+        """Get order with items; archived orders are found too"""
+        order = OrderRepository.get_order_by_id(db, order_id, include_archive=True)
         if not order:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Order not found"
             )
         
-        items = OrderRepository.get_order_items(db, order_id)
+        items = OrderRepository.get_items(db, order)
         
-        return OrderSchema(
-            id=order.id,
-            user_id=order.user_id,
-            user_full_name=order.user.full_name if order.user else None,
-            delivery_address=order.delivery_address,
-            order_date=order.order_date,
-            total_amount=order.total_amount,
-            status=order.status,
-            payment_status=order.payment_status,
-            payment_intent_id=order.payment_intent_id,
-            payment_method=order.payment_method,
-            created_at=order.created_at,
-            updated_at=order.updated_at,
-            items=[OrderService._map_order_item(item) for item in items]
-        )
+        return OrderSchema.model_validate(OrderService._map_order(order, items))
     
     @staticmethod
     def get_user_orders(db: Session, user_id: int, page: int = 1, limit: int = 10) -> OrderHistorySchema:
         """Get user's order history"""
         orders, total = OrderRepository.get_user_orders(db, user_id, page, limit)
         
-        order_schemas = []
-        for order in orders:
-            items = OrderRepository.get_order_items(db, order.id)
-            order_schemas.append(OrderSchema(
-                id=order.id,
-                user_id=order.user_id,
-                user_full_name=order.user.full_name if order.user else None,
-                delivery_address=order.delivery_address,
-                order_date=order.order_date,
-                total_amount=order.total_amount,
-                status=order.status,
-                payment_status=order.payment_status,
-                payment_intent_id=order.payment_intent_id,
-                payment_method=order.payment_method,
-                created_at=order.created_at,
-                updated_at=order.updated_at,
-                items=[OrderService._map_order_item(item) for item in items]
-            ))
-        
-        total_pages = math.ceil(total / limit) if total > 0 else 0
-        
-        return OrderHistorySchema(
-            orders=order_schemas,
-            total=total,
-            page=page,
-            limit=limit,
-            total_pages=total_pages
-        )
+        return OrderService._order_history(db, orders, total, page, limit)
     
     @staticmethod
     def search_orders(db: Session, filters: OrderSearchSchema) -> OrderHistorySchema:
@@ -273,77 +307,92 @@ class OrderService:
             limit=filters.limit
         )
         
-        order_schemas = []
-        for order in orders:
-            items = OrderRepository.get_order_items(db, order.id)
-            order_schemas.append(OrderSchema(
-                id=order.id,
-                user_id=order.user_id,
-                user_full_name=order.user.full_name if order.user else None,
-                delivery_address=order.delivery_address,
-                order_date=order.order_date,
-                total_amount=order.total_amount,
-                status=order.status,
-                payment_status=order.payment_status,
-                payment_intent_id=order.payment_intent_id,
-                payment_method=order.payment_method,
-                created_at=order.created_at,
-                updated_at=order.updated_at,
-                items=[OrderService._map_order_item(item) for item in items]
-            ))
+        return OrderService._order_history(db, orders, total, filters.page, filters.limit)
+    
+    @staticmethod
+    def export_orders(db: Session, filters: OrderSearchSchema, file_format: str = "csv") -> Iterator[str]:
+        """
+        Stream matching orders as CSV (one line per item) or NDJSON (one order
+        per line with nested items). Rows come from a server-side cursor, so
+        memory stays flat however large the date range is.
+        """
+        rows = OrderRepository.iter_order_rows(
+            db=db,
+            user_id=filters.user_id,
+            status=filters.status,
+            payment_status=filters.payment_status,
+            start_date=filters.start_date,
+            end_date=filters.end_date,
+            batch_size=settings.ORDER_EXPORT_BATCH_SIZE
+        )
         
-        total_pages = math.ceil(total / filters.limit) if total > 0 else 0
+        if file_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=ORDER_EXPORT_FIELDS)
+            writer.writeheader()
+            for row in rows:
+                row["delivery_address"] = json.dumps(row["delivery_address"], ensure_ascii=False)
+                writer.writerow(row)
+                if buffer.tell() >= 64 * 1024:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+            return
         
-        return OrderHistorySchema(
-            orders=order_schemas,
-            total=total,
-            page=filters.page,
-            limit=filters.limit,
-            total_pages=total_pages
-        )
+        # Rows are ordered by order id, so each order's items are consecutive
+        current = None
+        for row in rows:
+            if current is None or current["order_id"] != row["order_id"]:
+                if current is not None:
+                    yield json.dumps(current, ensure_ascii=False, default=str) + "\n"
+                current = {field: row[field] for field in ORDER_EXPORT_FIELDS if field not in ORDER_ITEM_EXPORT_FIELDS}
+                current["items"] = []
+            if row["item_id"] is not None:
+                current["items"].append({field: row[field] for field in ORDER_ITEM_EXPORT_FIELDS})
+        if current is not None:
+            yield json.dumps(current, ensure_ascii=False, default=str) + "\n"
     
     @staticmethod
     def get_orders_by_product(db: Session, product_id: int, page: int = 1, limit: int = 10) -> OrderHistorySchema:
         """Admin: Get orders by product"""
         orders, total = OrderRepository.get_orders_by_product(db, product_id, page, limit)
         
-        order_schemas = []
-        for order in orders:
-            items = OrderRepository.get_order_items(db, order.id)
-            order_schemas.append(OrderSchema(
-                id=order.id,
-                user_id=order.user_id,
-                user_full_name=order.user.full_name if order.user else None,
-                delivery_address=order.delivery_address,
-                order_date=order.order_date,
-                total_amount=order.total_amount,
-                status=order.status,
-                payment_status=order.payment_status,
-                payment_intent_id=order.payment_intent_id,
-                payment_method=order.payment_method,
-                created_at=order.created_at,
-                updated_at=order.updated_at,
-                items=[OrderService._map_order_item(item) for item in items]
-            ))
-        
-        total_pages = math.ceil(total / limit) if total > 0 else 0
-        
-        return OrderHistorySchema(
-            orders=order_schemas,
-            total=total,
-            page=page,
-            limit=limit,
-            total_pages=total_pages
-        )
+        return OrderService._order_history(db, orders, total, page, limit)
     
     @staticmethod
-    def update_order_status(db: Session, order_id: int, status: str) -> OrderSchema:
+    def update_order_status(db: Session, order_id: int, new_status: str) -> OrderSchema:
         """Admin: Update order status"""
-        order = OrderRepository.update_order_status(db, order_id, status)
+        order = OrderRepository.get_order_by_id(db, order_id)
         if not order:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Order not found"
             )
         
+        if order.status != new_status:
+            event_bus.publish(OrderStatusChanged(
+                order_id=order.id,
+                user_id=order.user_id,
+                old_status=order.status,
+                new_status=new_status
+            ), db)
+        OrderRepository.update_order_status(db, order_id, new_status)
+        
         return OrderService.get_order_by_id(db, order_id)
+    
+    @staticmethod
+    def update_payment_status(db: Session, order_id: int, payment_status: str):
+        """Update payment status, publishing the order status transition it implies"""
+        order = OrderRepository.get_order_by_id(db, order_id)
+        if not order:
+            return None
+        
+        if payment_status == "completed" and order.status != "processing":
+            event_bus.publish(OrderStatusChanged(
+                order_id=order.id,
+                user_id=order.user_id,
+                old_status=order.status,
+                new_status="processing"
+            ), db)
+        return OrderRepository.update_payment_status(db, order_id, payment_status)
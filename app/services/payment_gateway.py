@@ -0,0 +1,123 @@
+from typing import Any, Dict, Optional
+
+import httpx
+from pydantic import BaseModel
+
+from app.core.config import settings, logger
+
+
+class PaymentIntent(BaseModel):
+    id: str
+    client_secret: Optional[str] = None
+    amount: int
+    currency: str
+    status: str
+    metadata: Dict[str, Any] = {}
+
+
+class PaymentGatewayError(Exception):
+    """Raised when the payment provider rejects a request or cannot be reached"""
+
+    def __init__(self, message: str, timeout: bool = False):
+        super().__init__(message)
+        self.message = message
+        self.timeout = timeout
+
+
+class StripePaymentGateway:
+    """
+    Async Stripe client on a pooled httpx.AsyncClient.
+
+    Every call has connect/read timeouts so a slow Stripe cannot hold a
+    checkout request open indefinitely. Point STRIPE_API_BASE at the fake
+    server in fake_stripe.py to run checkout without network access.
+    """
+
+    def __init__(self, api_key: Optional[str], base_url: str):
+        self.api_key = api_key
+        self.base_url = base_url
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                auth=(self.api_key or "", ""),
+                timeout=httpx.Timeout(
+                    settings.STRIPE_READ_TIMEOUT,
+                    connect=settings.STRIPE_CONNECT_TIMEOUT,
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.STRIPE_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.STRIPE_MAX_CONNECTIONS,
+                ),
+            )
+        return self._client
+
+    async def _request(self, method: str, path: str, data: Optional[Dict[str, Any]] = None,
+                       timeout: Optional[float] = None) -> Dict[str, Any]:
+        if not self.configured:
+            raise PaymentGatewayError("Stripe API key not configured")
+
+        kwargs: Dict[str, Any] = {"data": data}
+        if timeout is not None:
+            kwargs["timeout"] = httpx.Timeout(timeout, connect=settings.STRIPE_CONNECT_TIMEOUT)
+
+        try:
+            response = await self._get_client().request(method, path, **kwargs)
+        except httpx.TimeoutException:
+            logger.warning("Stripe %s %s timed out", method, path)
+            raise PaymentGatewayError("Payment provider timed out", timeout=True)
+        except httpx.HTTPError as e:
+            raise PaymentGatewayError(f"Payment provider unreachable: {str(e)}")
+
+        try:
+            body = response.json()
+        except ValueError:
+            raise PaymentGatewayError(f"Invalid response from payment provider ({response.status_code})")
+        if response.status_code >= 400:
+            message = body.get("error", {}).get("message", response.text)
+            raise PaymentGatewayError(message)
+        return body
+
+    async def create_payment_intent(self, amount: int, currency: str = "vnd",
+                                    metadata: Optional[Dict[str, str]] = None,
+                                    timeout: Optional[float] = None) -> PaymentIntent:
+        data = {
+            "amount": int(amount),
+            "currency": currency,
+            "payment_method_types[]": "card",
+        }
+        for key, value in (metadata or {}).items():
+            data[f"metadata[{key}]"] = value
+        return PaymentIntent(**await self._request("POST", "/v1/payment_intents", data, timeout))
+
+    async def retrieve_payment_intent(self, payment_intent_id: str,
+                                      timeout: Optional[float] = None) -> PaymentIntent:
+        return PaymentIntent(**await self._request(
+            "GET", f"/v1/payment_intents/{payment_intent_id}", timeout=timeout
+        ))
+
+    async def confirm_payment_intent(self, payment_intent_id: str, payment_method: str,
+                                     timeout: Optional[float] = None) -> PaymentIntent:
+        return PaymentIntent(**await self._request(
+            "POST",
+            f"/v1/payment_intents/{payment_intent_id}/confirm",
+            {"payment_method": payment_method},
+            timeout,
+        ))
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+payment_gateway = StripePaymentGateway(
+    api_key=settings.STRIPE_SECRET_KEY,
+    base_url=settings.STRIPE_API_BASE,
+)
@@ -1,8 +1,11 @@
-import stripe
-import os
+import hashlib
+import hmac
+import json
+import time
 from typing import Optional, List
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from app.schemas.payment_schema import (
     CreatePaymentIntentSchema,
     PaymentIntentResponseSchema,
@@ -14,41 +17,62 @@ from app.schemas.order_schema import DeliveryAddressSchema
 from app.schemas.order_schema import CreateOrderFromCartSchema, OrderSchema
 from app.services.order_service import OrderService
 from app.repositories.order_repository import OrderRepository
+from app.services.idempotency_service import IdempotencyService
+from app.services.payment_gateway import payment_gateway, PaymentGatewayError
+from app.repositories.payment_event_repository import PaymentEventRepository
+from app.core.config import settings, logger
+from app.db.base import SessionLocal
 
-from dotenv import load_dotenv
+# Intents an order may be created for before the webhook reports the outcome
+PAYABLE_INTENT_STATUSES = ("succeeded", "processing", "requires_capture")
 
-# Initialize environment variables
-load_dotenv()
+PAYMENT_EVENT_STATUSES = {
+    "payment_intent.succeeded": "completed",
+    "payment_intent.payment_failed": "failed",
+}
+
+
+def _gateway_exception(e: PaymentGatewayError, prefix: str = "Stripe error") -> HTTPException:
+    if e.timeout:
+        return HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Payment provider timed out, please retry."
+        )
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"{prefix}: {e.message}"
+    )
 
-# Configure Stripe
-STRIPE_KEY = os.getenv("STRIPE_SECRET_KEY")
-if STRIPE_KEY:
-    stripe.api_key = STRIPE_KEY
-else:
-    stripe.api_key = None
 
 class PaymentService:
     @staticmethod
-    def _verify_payment_succeeded(payment_intent_id: str):
-        """Helper to verify that a payment intent actually succeeded on Stripe"""
-        if not stripe.api_key:
+    async def _verify_payment_intent(payment_intent_id: str, user_id: int, webhook_mode: bool):
+        """
+        Helper to verify on Stripe that a payment intent belongs to the user and
+        can pay for an order. Without webhooks it must have succeeded; with them
+        it may still be settling, and the webhook finalizes the order later.
+        """
+        if not payment_gateway.configured:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Stripe API key not configured."
             )
         try:
-            payment_intent = stripe.PaymentIntent.retrieve(payment_intent_id)
-            if payment_intent.status != "succeeded":
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Payment not completed. Status: {payment_intent.status}"
-                )
-            return payment_intent
-        except stripe.error.StripeError as e:
+            payment_intent = await payment_gateway.retrieve_payment_intent(payment_intent_id)
+        except PaymentGatewayError as e:
+            raise _gateway_exception(e)
+        if payment_intent.metadata.get("user_id") != str(user_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Payment does not belong to this user."
+            )
+        payable = PAYABLE_INTENT_STATUSES if webhook_mode else ("succeeded",)
+        if payment_intent.status not in payable:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Stripe error: {str(e)}"
+                detail=f"Payment not completed. Status: {payment_intent.status}"
             )
+        return payment_intent
 
     @staticmethod
     def _check_existing_order(db: Session, payment_intent_id: str):
@@ -61,49 +85,174 @@ class PaymentService:
             )
 
     @staticmethod
-    def create_payment_intent(amount: int) -> PaymentIntentResponseSchema:
-        """Create a Stripe PaymentIntent"""
-        if not stripe.api_key:
+    def _raise_integrity_conflict(db: Session, payment_intent_id: str, error: IntegrityError):
+        """Turn a constraint violation while creating the order into a client error"""
+        # Unique payment_intent_id: a concurrent request already created the order
+        PaymentService._check_existing_order(db, payment_intent_id)
+        logger.warning("Order for payment intent %s violated a constraint: %s", payment_intent_id, error.orig)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Order could not be created because it conflicts with existing data."
+        )
+
+    @staticmethod
+    def _webhook_enabled() -> bool:
+        return bool(settings.STRIPE_WEBHOOK_SECRET)
+
+    @staticmethod
+    def _apply_recorded_events(db: Session, order_id: int, payment_intent_id: str) -> bool:
+        """Apply webhook events that arrived before the order existed"""
+        events = PaymentEventRepository.get_unprocessed_for_intent(
+            db, payment_intent_id, list(PAYMENT_EVENT_STATUSES)
+        )
+        for event in events:
+            OrderService.update_payment_status(db, order_id, PAYMENT_EVENT_STATUSES[event.event_type])
+            PaymentEventRepository.mark_processed(db, event)
+        return bool(events)
+
+    @staticmethod
+    def _verify_webhook_signature(payload: bytes, signature_header: Optional[str]) -> None:
+        """Check a Stripe-Signature header (t=<timestamp>,v1=<hmac>) against the payload"""
+        if not signature_header:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Stripe API key not configured"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Missing Stripe-Signature header"
             )
 
-        try:
-            payment_intent = stripe.PaymentIntent.create(
-                amount=int(amount),
-                currency="vnd",
-                payment_method_types=["card"],
+        timestamp = None
+        signatures = []
+        for part in signature_header.split(","):
+            key, _, value = part.strip().partition("=")
+            if key == "t":
+                timestamp = value
+            elif key == "v1":
+                signatures.append(value)
+
+        if not timestamp or not timestamp.isdigit() or not signatures:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid Stripe-Signature header"
             )
-            
-            return PaymentIntentResponseSchema(
-                payment_intent_id=payment_intent.id,
-                client_secret=payment_intent.client_secret,
-                amount=amount,
-                currency="vnd",
-                status=payment_intent.status
+
+        expected = hmac.new(
+            settings.STRIPE_WEBHOOK_SECRET.encode(),
+            f"{timestamp}.".encode() + payload,
+            hashlib.sha256
+        ).hexdigest()
+        if not any(hmac.compare_digest(expected, signature) for signature in signatures):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid webhook signature"
             )
-            
-        except stripe.error.StripeError as e:
+
+        if abs(time.time() - int(timestamp)) > settings.STRIPE_WEBHOOK_TOLERANCE_SECONDS:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Stripe error: {str(e)}"
+                detail="Webhook timestamp outside tolerance"
             )
-        except Exception as e:
+
+    @staticmethod
+    def record_webhook_event(db: Session, payload: bytes, signature_header: Optional[str]) -> Optional[int]:
+        """Verify and store a webhook event; returns the stored id or None for replays"""
+        if not PaymentService._webhook_enabled():
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Payment intent creation failed: {str(e)}"
+                detail="Stripe webhook secret not configured"
             )
+        PaymentService._verify_webhook_signature(payload, signature_header)
+
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid webhook payload"
+            )
+
+        event_type = event.get("type")
+        data_object = event.get("data", {}).get("object", {})
+        payment_intent_id = data_object.get("id") if event_type in PAYMENT_EVENT_STATUSES else None
+
+        stored = PaymentEventRepository.record(
+            db,
+            event_id=event.get("id"),
+            event_type=event_type,
+            payment_intent_id=payment_intent_id,
+            payload=event
+        )
+        if stored is None:
+            logger.info("Ignoring replayed Stripe event %s", event.get("id"))
+            return None
+        if event_type not in PAYMENT_EVENT_STATUSES:
+            return None
+        return stored.id
+
+    @staticmethod
+    def process_webhook_event(payment_event_id: int) -> None:
+        """Background task: finalize the order a recorded payment event refers to"""
+        db = SessionLocal()
+        try:
+            event = PaymentEventRepository.get_by_id(db, payment_event_id)
+            if not event or event.processed_at:
+                return
+            order = OrderRepository.get_order_by_payment_intent(db, event.payment_intent_id)
+            if not order:
+                # Order not created yet, the confirm endpoint applies the event
+                return
+            OrderService.update_payment_status(db, order.id, PAYMENT_EVENT_STATUSES[event.event_type])
+            PaymentEventRepository.mark_processed(db, event)
+        except Exception:
+            logger.exception("Failed to process payment event %s", payment_event_id)
+        finally:
+            db.close()
+
+    @staticmethod
+    async def create_payment_intent(amount: int, user_id: int) -> PaymentIntentResponseSchema:
+        """Create a Stripe PaymentIntent"""
+        if not payment_gateway.configured:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Stripe API key not configured"
+            )
+
+        try:
+            payment_intent = await payment_gateway.create_payment_intent(
+                amount=int(amount), currency="vnd", metadata={"user_id": str(user_id)}
+            )
+        except PaymentGatewayError as e:
+            raise _gateway_exception(e)
+
+        return PaymentIntentResponseSchema(
+            payment_intent_id=payment_intent.id,
+            client_secret=payment_intent.client_secret,
+            amount=amount,
+            currency="vnd",
+            status=payment_intent.status
+        )
     
     @staticmethod
-    def confirm_payment_from_cart(db: Session, user_id: int, data: ConfirmPaymentFromCartSchema) -> OrderSchema:
+    async def confirm_payment_from_cart(db: Session, user_id: int, data: ConfirmPaymentFromCartSchema,
+                                        idempotency_key: Optional[str] = None) -> OrderSchema:
         """Process payment confirmation and create order from user's cart"""
-        # 1. Verify payment status on Stripe
-        PaymentService._verify_payment_succeeded(data.payment_intent_id)
-        
-        # 2. Prevent duplicate orders
+        return await IdempotencyService.execute(
+            db=db,
+            user_id=user_id,
+            scope="payments.confirm_from_cart",
+            key=idempotency_key,
+            payload=data,
+            response_schema=OrderSchema,
+            operation=lambda: PaymentService._confirm_payment_from_cart(db, user_id, data)
+        )
+
+    @staticmethod
+    async def _confirm_payment_from_cart(db: Session, user_id: int, data: ConfirmPaymentFromCartSchema) -> OrderSchema:
+        # 1. Prevent duplicate orders (cheap local check before calling Stripe)
         PaymentService._check_existing_order(db, data.payment_intent_id)
 
+        # 2. Verify the payment on Stripe; with webhooks it may still be settling
+        webhook_mode = PaymentService._webhook_enabled()
+        payment_intent = await PaymentService._verify_payment_intent(data.payment_intent_id, user_id, webhook_mode)
+
         try:
             # 3. Create order record
             order_data = CreateOrderFromCartSchema(delivery_address=data.delivery_address)
@@ -111,15 +260,22 @@ class PaymentService:
                 db=db,
                 user_id=user_id,
                 data=order_data,
-                payment_intent_id=data.payment_intent_id
+                payment_intent_id=data.payment_intent_id,
+                expected_amount=payment_intent.amount
             )
             
             # 4. Finalize payment status in database
-            OrderRepository.update_payment_status(db, order.id, "completed")
+            if webhook_mode:
+                PaymentService._apply_recorded_events(db, order.id, data.payment_intent_id)
+            else:
+                OrderService.update_payment_status(db, order.id, "completed")
             return OrderService.get_order_by_id(db, order.id)
             
         except HTTPException:
             raise
+        except IntegrityError as e:
+            db.rollback()
+            PaymentService._raise_integrity_conflict(db, data.payment_intent_id, e)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -127,14 +283,28 @@ class PaymentService:
             )
     
     @staticmethod
-    def confirm_payment_from_products(db: Session, user_id: int, data: ConfirmPaymentFromProductsSchema) -> OrderSchema:
+    async def confirm_payment_from_products(db: Session, user_id: int, data: ConfirmPaymentFromProductsSchema,
+                                            idempotency_key: Optional[str] = None) -> OrderSchema:
         """Process payment confirmation and create order for 'Buy Now' flow"""
-        # 1. Verify payment status on Stripe
-        PaymentService._verify_payment_succeeded(data.payment_intent_id)
-        
-        # 2. Prevent duplicate orders
+        return await IdempotencyService.execute(
+            db=db,
+            user_id=user_id,
+            scope="payments.confirm_from_products",
+            key=idempotency_key,
+            payload=data,
+            response_schema=OrderSchema,
+            operation=lambda: PaymentService._confirm_payment_from_products(db, user_id, data)
+        )
+
+    @staticmethod
+    async def _confirm_payment_from_products(db: Session, user_id: int, data: ConfirmPaymentFromProductsSchema) -> OrderSchema:
+        # 1. Prevent duplicate orders (cheap local check before calling Stripe)
         PaymentService._check_existing_order(db, data.payment_intent_id)
 
+        # 2. Verify the payment on Stripe; with webhooks it may still be settling
+        webhook_mode = PaymentService._webhook_enabled()
+        payment_intent = await PaymentService._verify_payment_intent(data.payment_intent_id, user_id, webhook_mode)
+
         try:
             # 3. Create order record
             order = OrderService.create_order_from_products(
@@ -142,15 +312,22 @@ class PaymentService:
                 user_id=user_id,
                 items=data.items,
                 delivery_address=data.delivery_address.model_dump(),
-                payment_intent_id=data.payment_intent_id
+                payment_intent_id=data.payment_intent_id,
+                expected_amount=payment_intent.amount
             )
             
             # 4. Finalize payment status in database
-            OrderRepository.update_payment_status(db, order.id, "completed")
+            if webhook_mode:
+                PaymentService._apply_recorded_events(db, order.id, data.payment_intent_id)
+            else:
+                OrderService.update_payment_status(db, order.id, "completed")
             return OrderService.get_order_by_id(db, order.id)
             
         except HTTPException:
             raise
+        except IntegrityError as e:
+            db.rollback()
+            PaymentService._raise_integrity_conflict(db, data.payment_intent_id, e)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -158,27 +335,18 @@ class PaymentService:
             )
 
     @staticmethod
-    def test_confirm_payment(payment_intent_id: str) -> dict:
+    async def test_confirm_payment(payment_intent_id: str) -> dict:
         try:
-            payment_intent = stripe.PaymentIntent.confirm(
+            payment_intent = await payment_gateway.confirm_payment_intent(
                 payment_intent_id,
                 payment_method="pm_card_visa",
             )
-            
-            return {
-                "payment_intent_id": payment_intent.id,
-                "status": payment_intent.status,
-                "amount": payment_intent.amount,
-                "currency": payment_intent.currency,
-            }
-
-        except stripe.error.StripeError as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Stripe confirmation error: {str(e)}"
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Test confirmation failed: {str(e)}"
-            )
\ No newline at end of file
+        except PaymentGatewayError as e:
+            raise _gateway_exception(e, "Stripe confirmation error")
+
+        return {
+            "payment_intent_id": payment_intent.id,
+            "status": payment_intent.status,
+            "amount": payment_intent.amount,
+            "currency": payment_intent.currency,
+        }
@@ -1,11 +1,36 @@
+import csv
+import io
+import json
+import orjson
 from sqlalchemy.orm import Session
-from typing import List, Optional, Tuple
+from typing import List, Optional, Set, Tuple, Iterator, IO, Dict, Any
 from fastapi import HTTPException
+from pydantic import ValidationError
+from app.core.config import settings
 from app.repositories.product_repository import ProductRepository
-from app.schemas.product_schema import ProductSchema, CreateProductSchema, UpdateProductSchema, ProductFilter
+from app.schemas.product_schema import (
+    ProductSchema,
+    CreateProductSchema,
+    UpdateProductSchema,
+    ProductFilter,
+    ProductListItemSchema,
+    PRODUCT_LIST_FIELDS,
+    BulkProductUpdateItem,
+    BulkProductUpdateResponse,
+    ProductBatchSchema
+)
+from app.core.events import event_bus, ProductsChanged
+from app.core.response_cache import catalog_cache
 from app.models.category_model import Category
 from app.models.brand_model import Brand
 
+PRODUCT_EXPORT_FIELDS = [
+    "id", "name", "description", "price", "category_id",
+    "brand_id", "status", "image_urls", "variants",
+]
+PRODUCT_JSON_FIELDS = ("image_urls", "variants")
+MAX_REPORTED_IMPORT_ERRORS = 100
+
 class ProductService:
     def __init__(self, repository: ProductRepository):
         self.repository = repository
@@ -44,10 +69,15 @@ class ProductService:
         page: int = 1, 
         keyword: Optional[str] = None, 
         search_type: str = "title",
-        sort_by: Optional[str] = None
+        sort_by: Optional[str] = None,
+        fields: Optional[str] = None,
+        view: str = "full"
     ) -> dict:
         skip = (page - 1) * limit
-        items, total = self.repository.get_all(skip=skip, limit=limit, keyword=keyword, search_type=search_type, sort_by=sort_by)
+        items, total = self.repository.get_all(
+            skip=skip, limit=limit, keyword=keyword, search_type=search_type, sort_by=sort_by,
+            fields=self._parse_fields(fields, view)
+        )
         
         return {
             "items": items,
@@ -57,6 +87,20 @@ class ProductService:
             "total_pages": (total + limit - 1) // limit if limit > 0 else 0
         }
 
+    @staticmethod
+    def _parse_fields(fields: Optional[str], view: str) -> Optional[Set[str]]:
+        """Fields to load for a product list; None means full rows"""
+        requested = {field.strip() for field in (fields or "").split(",") if field.strip()}
+        # fields=, or blank names nothing, so it falls back to view like an absent fields
+        if requested:
+            unknown = requested - set(ProductListItemSchema.model_fields)
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+            return requested
+        if view == "list":
+            return set(PRODUCT_LIST_FIELDS)
+        return None
+
     def _empty_pagination(self, page, size):
         return {
             "page": page,
@@ -66,7 +110,9 @@ class ProductService:
         }
 
     def create_product(self, product_data: CreateProductSchema) -> ProductSchema:
-        return self.repository.create(product_data.model_dump())
+        product = self.repository.create(product_data.model_dump())
+        event_bus.publish(ProductsChanged(product_ids=[product.id]))
+        return product
 
     def get_product(self, product_id: int) -> ProductSchema:
         product = self.repository.get_by_id(product_id)
@@ -74,6 +120,30 @@ class ProductService:
             raise HTTPException(status_code=404, detail="Product not found")
         return product
 
+    def get_products_by_ids(self, product_ids: List[int]) -> ProductBatchSchema:
+        """
+        Products in request order. Ids whose detail page is in the catalog cache
+        are served from it; the rest are loaded with one IN query.
+        """
+        if len(product_ids) > settings.PRODUCT_BATCH_MAX_IDS:
+            raise HTTPException(status_code=400, detail=f"At most {settings.PRODUCT_BATCH_MAX_IDS} ids per request")
+        product_ids = list(dict.fromkeys(product_ids))
+
+        found: Dict[int, ProductSchema] = {}
+        for product_id in product_ids:
+            entry = catalog_cache.get(f"/products/{product_id}") if catalog_cache.enabled else None
+            if entry is not None:
+                found[product_id] = ProductSchema.model_validate(orjson.loads(entry.body)["data"])
+        uncached = [product_id for product_id in product_ids if product_id not in found]
+        if uncached:
+            for product in self.repository.get_by_ids(uncached):
+                found[product.id] = ProductSchema.model_validate(product)
+
+        return ProductBatchSchema(
+            items=[found[product_id] for product_id in product_ids if product_id in found],
+            missing_ids=[product_id for product_id in product_ids if product_id not in found]
+        )
+
     def get_product_detail(self, product_id: int):
         product = self.repository.get_by_id(product_id)
         if not product:
@@ -86,7 +156,9 @@ class ProductService:
             raise HTTPException(status_code=404, detail="Product not found")
         
         update_data = product_data.model_dump(exclude_unset=True)
-        return self.repository.update(product, update_data)
+        product = self.repository.update(product, update_data)
+        event_bus.publish(ProductsChanged(product_ids=[product_id]))
+        return product
 
     def delete_product(self, product_id: int) -> None:
         product = self.repository.get_by_id(product_id)
@@ -94,3 +166,215 @@ class ProductService:
             raise HTTPException(status_code=404, detail="Product not found")
         
         self.repository.delete(product)
+        event_bus.publish(ProductsChanged(product_ids=[product_id]))
+
+    @staticmethod
+    def _apply_bulk_change(product: Dict[str, Any], item: BulkProductUpdateItem) -> Optional[str]:
+        """Apply one change to an in-memory product row; returns an error message or None"""
+        changes_price = item.price is not None or item.price_delta is not None
+        changes_stock = item.stock_quantity is not None or item.stock_delta is not None
+        if not changes_price and not changes_stock:
+            return "Nothing to update"
+
+        new_price = product["price"]
+        if item.price is not None:
+            new_price = item.price
+        if item.price_delta is not None:
+            new_price = (new_price or 0) + item.price_delta
+        if changes_price and new_price <= 0:
+            return "Price must be greater than 0"
+
+        variants = product["variants"]
+        variant = None
+        if changes_stock:
+            if item.size is None or item.color is None:
+                return "Size and color are required for stock updates"
+            variant = next(
+                (v for v in variants or [] if v.get("size") == item.size and v.get("color") == item.color),
+                None
+            )
+            if variant is None:
+                return "Variant not found"
+            new_stock = variant.get("stock_quantity", 0)
+            if item.stock_quantity is not None:
+                new_stock = item.stock_quantity
+            if item.stock_delta is not None:
+                new_stock += item.stock_delta
+            if new_stock < 0:
+                return "Stock cannot be negative"
+
+        product["price"] = new_price
+        if variant is not None:
+            # Copy so the JSON column is written as a new value
+            product["variants"] = [
+                {**v, "stock_quantity": new_stock} if v is variant else v for v in variants
+            ]
+            total_stock = sum(v.get("stock_quantity", 0) for v in product["variants"])
+            if total_stock <= 0:
+                product["status"] = "out_of_stock"
+            elif product["status"] == "out_of_stock":
+                product["status"] = "active"
+        return None
+
+    def bulk_update_products(self, items: List[BulkProductUpdateItem]) -> BulkProductUpdateResponse:
+        """
+        Apply price/stock changes in chunks: one SELECT of the affected products
+        and one executemany UPDATE per chunk, then a single cache invalidation.
+        """
+        chunk_size = settings.PRODUCT_BULK_UPDATE_CHUNK_SIZE
+        results = []
+        changed_ids = set()
+
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            products = self.repository.get_rows_for_bulk_update(list({item.product_id for item in chunk}))
+            dirty = set()
+
+            for offset, item in enumerate(chunk):
+                product = products.get(item.product_id)
+                error = "Product not found" if product is None else self._apply_bulk_change(product, item)
+                if error is None:
+                    dirty.add(item.product_id)
+                results.append({
+                    "index": start + offset,
+                    "product_id": item.product_id,
+                    "success": error is None,
+                    "message": error
+                })
+
+            # Commits even when nothing changed, releasing the chunk's row locks
+            self.repository.bulk_update([products[product_id] for product_id in dirty])
+            changed_ids.update(dirty)
+
+        if changed_ids:
+            event_bus.publish(ProductsChanged(product_ids=sorted(changed_ids)))
+
+        updated = sum(1 for result in results if result["success"])
+        return BulkProductUpdateResponse(
+            updated=updated,
+            failed=len(results) - updated,
+            results=results
+        )
+
+    @staticmethod
+    def _iter_import_rows(stream: IO[bytes], file_format: str) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """Yield (row, None) for each parsed record or (None, error) for a malformed one"""
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        if file_format == "csv":
+            reader = csv.DictReader(text)
+            while True:
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    return
+                except csv.Error as e:
+                    yield None, str(e)
+                    continue
+                try:
+                    # Empty cells are omitted so schema defaults apply
+                    yield {
+                        key: json.loads(value) if key in PRODUCT_JSON_FIELDS else value
+                        for key, value in row.items() if key is not None and value not in (None, "")
+                    }, None
+                except ValueError as e:
+                    yield None, f"Invalid JSON: {str(e)}"
+        else:
+            for line in text:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line), None
+                except ValueError as e:
+                    yield None, f"Invalid JSON: {str(e)}"
+
+    def _insert_import_batch(self, batch: List[Tuple[int, Dict[str, Any]]]) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        Insert the rows whose category and brand exist, checked with one IN
+        query each, so a bad reference fails its row rather than the batch.
+        Returns the number inserted and (row number, error) for the rest.
+        """
+        categories = self.repository.existing_ids(Category, {row["category_id"] for _, row in batch if row.get("category_id")})
+        brands = self.repository.existing_ids(Brand, {row["brand_id"] for _, row in batch if row.get("brand_id")})
+        valid = []
+        errors = []
+        for row_number, row in batch:
+            if row.get("category_id") and row["category_id"] not in categories:
+                errors.append((row_number, f"category_id: Category {row['category_id']} not found"))
+            elif row.get("brand_id") and row["brand_id"] not in brands:
+                errors.append((row_number, f"brand_id: Brand {row['brand_id']} not found"))
+            else:
+                valid.append(row)
+        return self.repository.bulk_create(valid), errors
+
+    def import_products(self, stream: IO[bytes], file_format: str) -> Iterator[Dict[str, Any]]:
+        """
+        Parse and insert products incrementally, yielding a progress report
+        after every batch and a final summary with per-row errors.
+        """
+        batch_size = settings.PRODUCT_IMPORT_BATCH_SIZE
+        processed = imported = failed = 0
+        errors = []
+        batch = []
+
+        def report(row_errors: List[Tuple[int, str]]) -> None:
+            nonlocal failed
+            failed += len(row_errors)
+            for row_number, error in row_errors:
+                if len(errors) < MAX_REPORTED_IMPORT_ERRORS:
+                    errors.append({"row": row_number, "error": error})
+
+        for row, error in self._iter_import_rows(stream, file_format):
+            processed += 1
+            if row is not None:
+                try:
+                    batch.append((processed, CreateProductSchema(**row).model_dump()))
+                except ValidationError as e:
+                    error = " | ".join(f"{err['loc'][-1] if err['loc'] else 'field'}: {err['msg']}" for err in e.errors())
+                except TypeError:
+                    error = "Row must be an object"
+
+            if error is not None:
+                report([(processed, error)])
+
+            if len(batch) >= batch_size:
+                inserted, row_errors = self._insert_import_batch(batch)
+                imported += inserted
+                report(row_errors)
+                batch = []
+                yield {"processed": processed, "imported": imported, "failed": failed}
+
+        if batch:
+            inserted, row_errors = self._insert_import_batch(batch)
+            imported += inserted
+            report(row_errors)
+        if imported:
+            # New rows only change listings, which an empty id list invalidates
+            event_bus.publish(ProductsChanged(product_ids=[]))
+        yield {
+            "processed": processed,
+            "imported": imported,
+            "failed": failed,
+            "errors": errors,
+            "done": True,
+        }
+
+    def export_products(self, file_format: str) -> Iterator[str]:
+        """Yield the catalog as CSV or JSONL text without loading it all in memory"""
+        rows = self.repository.iter_for_export(batch_size=settings.PRODUCT_IMPORT_BATCH_SIZE)
+        if file_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=PRODUCT_EXPORT_FIELDS)
+            writer.writeheader()
+            for row in rows:
+                for field in PRODUCT_JSON_FIELDS:
+                    if row[field] is not None:
+                        row[field] = json.dumps(row[field], ensure_ascii=False)
+                writer.writerow(row)
+                if buffer.tell() >= 64 * 1024:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            for row in rows:
+                yield json.dumps(row, ensure_ascii=False) + "\n"
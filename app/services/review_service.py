@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from typing import List
 from fastapi import HTTPException, status
 from app.repositories.review_repository import ReviewRepository
 from app.schemas.review_schema import ReviewCreate, ReviewUpdate
@@ -120,11 +121,24 @@ class ReviewService:
         self.review_repository.delete(review)
 
     def check_eligibility(self, user_id: int, product_id: int):
-        has_purchased = self.review_repository.has_purchased_product(user_id, product_id)
-        existing_review = self.review_repository.get_by_user_and_product(user_id, product_id)
+        has_purchased, already_reviewed = self.review_repository.get_eligibility(user_id, product_id)
         
         return {
-            "can_review": has_purchased and not existing_review,
+            "can_review": has_purchased and not already_reviewed,
             "has_purchased": has_purchased,
-            "already_reviewed": existing_review is not None
-        }
\ No newline at end of file
+            "already_reviewed": already_reviewed
+        }
+
+    def check_eligibility_batch(self, user_id: int, product_ids: List[int]):
+        """Eligibility for every product on a listing page with two indexed queries"""
+        product_ids = list(dict.fromkeys(product_ids))
+        purchased = self.review_repository.get_purchased_product_ids(user_id, product_ids)
+        reviewed = self.review_repository.get_reviewed_product_ids(user_id, product_ids)
+        
+        return {
+            product_id: {
+                "can_review": product_id in purchased and product_id not in reviewed,
+                "has_purchased": product_id in purchased,
+                "already_reviewed": product_id in reviewed
+            } for product_id in product_ids
+        }
@@ -0,0 +1,98 @@
+"""
+Compare the per-row admin update path (PUT /products/{id}) with the bulk
+price/stock endpoint on a throwaway SQLite database.
+
+    python -m benchmarks.bulk_product_update --products 2000 --rows 5000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Product
+from app.repositories.product_repository import ProductRepository
+from app.schemas.product_schema import BulkProductUpdateItem, UpdateProductSchema
+from app.services.product_service import ProductService
+
+SIZES = [38, 39, 40, 41, 42]
+COLORS = ["black", "white", "red"]
+
+
+def seed(session, products: int) -> None:
+    session.bulk_insert_mappings(Product, [
+        {
+            "name": f"Shoe {i}",
+            "price": 500000 + i,
+            "status": "active",
+            "variants": [
+                {"size": size, "color": color, "stock_quantity": 10}
+                for size in SIZES for color in COLORS
+            ],
+        }
+        for i in range(products)
+    ])
+    session.commit()
+
+
+def make_rows(products: int, rows: int):
+    return [
+        BulkProductUpdateItem(
+            product_id=random.randint(1, products),
+            size=random.choice(SIZES),
+            color=random.choice(COLORS),
+            price_delta=1000,
+            stock_delta=5,
+        )
+        for _ in range(rows)
+    ]
+
+
+def run_per_row(service: ProductService, rows) -> None:
+    for row in rows:
+        product = service.repository.get_by_id(row.product_id)
+        variants = [
+            {**v, "stock_quantity": v["stock_quantity"] + row.stock_delta}
+            if v["size"] == row.size and v["color"] == row.color else v
+            for v in product.variants
+        ]
+        service.update_product(row.product_id, UpdateProductSchema(
+            price=product.price + row.price_delta,
+            variants=variants,
+        ))
+
+
+def run_bulk(service: ProductService, rows) -> None:
+    service.bulk_update_products(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    random.seed(42)
+    rows = make_rows(args.products, args.rows)
+
+    for label, runner in (("per-row", run_per_row), ("bulk", run_bulk)):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            Base.metadata.create_all(bind=engine)
+            session = sessionmaker(bind=engine, autoflush=False)()
+            seed(session, args.products)
+
+            service = ProductService(ProductRepository(session))
+            started = time.perf_counter()
+            runner(service, rows)
+            elapsed = time.perf_counter() - started
+            print(f"{label:8s} {args.rows} rows in {elapsed:.3f}s ({args.rows / elapsed:,.0f} rows/s)")
+            session.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""
+Scripted load test reporting throughput and p50/p95/p99 per endpoint.
+
+Seed first (see benchmarks/seed.py), then either point it at a running API
+or let it spawn the API and the fake Stripe server itself:
+
+    export SQLALCHEMY_DATABASE_URL=sqlite:///./bench.db
+    python -m benchmarks.load_test --spawn --duration 60 --concurrency 32
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8000 --output run.json
+
+Compare against a stored run to catch regressions before deploy; the exit
+code is 1 when any endpoint's p95 grew by more than --max-regression:
+
+    python -m benchmarks.load_test --spawn --baseline baseline.json --max-regression 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import func
+
+from app.core.security import create_access_token
+from app.schemas.base_schema import is_success_code
+
+SIZES = [38, 39, 40, 41, 42, 43, 44]
+COLORS = ["black", "white", "red"]
+ADDRESS = {
+    "street_address": "1 Load test street",
+    "province_city": "Ho Chi Minh",
+    "recipient_name": "Load Test",
+    "recipient_phone": "0900000000",
+}
+
+DEFAULT_MIX = "browse=30,detail=20,search=10,cart_add=10,checkout=5,order_history=15,admin_search=10"
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.recording = False
+
+    def add(self, name: str, seconds: float, ok: bool) -> None:
+        if not self.recording:
+            return
+        self.latencies[name].append(seconds)
+        if not ok:
+            self.errors[name] += 1
+
+
+class Scenarios:
+    """One method per user journey; each call issues one or more timed requests"""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, rng: random.Random,
+                 products: int, users: int):
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.products = products
+        self.users = users
+        self.admin_headers = {"Authorization": f"Bearer {create_access_token(1, 'admin')}"}
+
+    def _user_headers(self) -> dict:
+        user_id = self.rng.randint(1, self.users)
+        return {"Authorization": f"Bearer {create_access_token(user_id, 'user')}"}
+
+    async def _request(self, name: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.add(name, time.perf_counter() - started, False)
+            return None
+        # Handlers report validation errors as HTTP 200 with code "422" in the body
+        ok = response.status_code < 400
+        if ok:
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            ok = is_success_code(body.get("code") if isinstance(body, dict) else None)
+        self.recorder.add(name, time.perf_counter() - started, ok)
+        return response if ok else None
+
+    async def browse(self):
+        page = self.rng.randint(1, 50)
+        await self._request("GET /products", "GET", f"/products?page={page}&limit=20")
+
+    async def detail(self):
+        product_id = self.rng.randint(1, self.products)
+        await self._request("GET /products/{id}", "GET", f"/products/{product_id}")
+
+    async def search(self):
+        keyword = self.rng.choice(["Runner", "Classic", "Trail", "Court", "Street"])
+        await self._request("GET /products?keyword", "GET", f"/products?keyword={keyword}&limit=20")
+
+    async def cart_add(self):
+        await self._request("POST /api/cart/items", "POST", "/api/cart/items", headers=self._user_headers(), json={
+            "product_id": self.rng.randint(1, self.products),
+            "quantity": 1,
+            "size": self.rng.choice(SIZES),
+            "color": self.rng.choice(COLORS),
+        })
+
+    async def checkout(self):
+        headers = self._user_headers()
+        product_id = self.rng.randint(1, self.products)
+        # The intent must charge exactly the order total
+        product = await self._request("GET /products/{id}", "GET", f"/products/{product_id}")
+        if product is None:
+            return
+        amount = round(product.json()["data"]["price"])
+        intent = await self._request(
+            "POST /api/payments/create-intent", "POST", f"/api/payments/create-intent?amount={amount}", headers=headers
+        )
+        if intent is None:
+            return
+        await self._request(
+            "POST /api/payments/confirm-from-products", "POST", "/api/payments/confirm-from-products",
+            headers={**headers, "Idempotency-Key": str(uuid.uuid4())},
+            json={
+                "payment_intent_id": intent.json()["payment_intent_id"],
+                "items": [{
+                    "product_id": product_id,
+                    "quantity": 1,
+                    "size": self.rng.choice(SIZES),
+                    "color": self.rng.choice(COLORS),
+                }],
+                "delivery_address": ADDRESS,
+            },
+        )
+
+    async def order_history(self):
+        await self._request("GET /api/orders", "GET", "/api/orders?page=1&limit=10", headers=self._user_headers())
+
+    async def admin_search(self):
+        status = self.rng.choice(["pending", "processing", "shipped", "delivered"])
+        await self._request(
+            "GET /api/orders/search/all", "GET", f"/api/orders/search/all?status={status}&page=1&limit=20",
+            headers=self.admin_headers
+        )
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if not hasattr(Scenarios, name.strip()):
+            raise SystemExit(f"Unknown scenario '{name}'")
+        weights[name.strip()] = int(weight)
+    return weights
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(recorder: Recorder, duration: float) -> Dict[str, dict]:
+    results = {}
+    for name, latencies in sorted(recorder.latencies.items()):
+        latencies.sort()
+        results[name] = {
+            "requests": len(latencies),
+            "errors": recorder.errors.get(name, 0),
+            "rps": round(len(latencies) / duration, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        }
+    return results
+
+
+def print_report(results: Dict[str, dict], duration: float) -> None:
+    print(f"\n{'endpoint':42s} {'reqs':>7s} {'errors':>6s} {'rps':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}")
+    total = 0
+    for name, row in results.items():
+        total += row["requests"]
+        print(f"{name:42s} {row['requests']:7d} {row['errors']:6d} {row['rps']:8.1f} "
+              f"{row['p50_ms']:8.1f} {row['p95_ms']:8.1f} {row['p99_ms']:8.1f}")
+    print(f"{'total':42s} {total:7d} {'':6s} {total / duration:8.1f}")
+
+
+def compare(results: Dict[str, dict], baseline_path: str, max_regression: float) -> bool:
+    with open(baseline_path) as f:
+        baseline = json.load(f)["endpoints"]
+    ok = True
+    for name, row in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous["p95_ms"]:
+            continue
+        change = row["p95_ms"] / previous["p95_ms"] - 1
+        if change > max_regression:
+            ok = False
+            print(f"✗ {name}: p95 {previous['p95_ms']:.1f} → {row['p95_ms']:.1f} ms ({change:+.0%})")
+    if ok:
+        print(f"✓ No endpoint's p95 regressed by more than {max_regression:.0%}")
+    return ok
+
+
+def count_seeded_rows():
+    from app.db.base import SessionLocal
+    from app.models import Product, User
+
+    db = SessionLocal()
+    try:
+        return (
+            db.query(func.max(Product.id)).scalar() or 1,
+            db.query(func.max(User.id)).scalar() or 1,
+        )
+    finally:
+        db.close()
+
+
+def wait_until_up(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"{url} did not come up within {timeout}s")
+
+
+def spawn_servers(port: int, stripe_port: int) -> List[subprocess.Popen]:
+    """Start fake Stripe and the API (single worker, no reload) in subprocesses"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {
+        **os.environ,
+        "FAKE_STRIPE_PORT": str(stripe_port),
+        "FAKE_STRIPE_AUTO_SUCCEED": "true",
+        "STRIPE_API_BASE": f"http://127.0.0.1:{stripe_port}",
+        "STRIPE_SECRET_KEY": "sk_test_fake",
+        "STRIPE_WEBHOOK_SECRET": "",
+        "PROFILING_ENABLED": "false",
+    }
+    processes = [
+        subprocess.Popen([sys.executable, "fake_stripe.py"], cwd=root, env=env),
+        subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=root, env=env,
+        ),
+    ]
+    wait_until_up(f"http://127.0.0.1:{stripe_port}/docs")
+    wait_until_up(f"http://127.0.0.1:{port}/home")
+    return processes
+
+
+async def run(base_url: str, duration: float, warmup: float, concurrency: int,
+              weights: Dict[str, int], products: int, users: int, seed: int) -> Recorder:
+    recorder = Recorder()
+    names = list(weights)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+        async def worker(index: int, deadline: float):
+            rng = random.Random(seed + index)
+            scenarios = Scenarios(client, recorder, rng, products, users)
+            journeys: Dict[str, Callable] = {name: getattr(scenarios, name) for name in names}
+            while time.monotonic() < deadline:
+                await journeys[rng.choices(names, [weights[name] for name in names])[0]]()
+
+        start = time.monotonic()
+        tasks = [asyncio.create_task(worker(i, start + warmup + duration)) for i in range(concurrency)]
+        await asyncio.sleep(warmup)
+        recorder.recording = True
+        await asyncio.gather(*tasks)
+    return recorder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--spawn", action="store_true", help="Start the API and fake Stripe for the run")
+    parser.add_argument("--port", type=int, default=8765, help="API port with --spawn")
+    parser.add_argument("--stripe-port", type=int, default=12111, help="Fake Stripe port with --spawn")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before recording")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="scenario=weight,...")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write results as JSON (usable as --baseline)")
+    parser.add_argument("--baseline", help="JSON from a previous --output run")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed p95 growth vs baseline")
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    products, users = count_seeded_rows()
+    processes = spawn_servers(args.port, args.stripe_port) if args.spawn else []
+    base_url = f"http://127.0.0.1:{args.port}" if args.spawn else args.base_url
+
+    try:
+        print(f"Running {args.concurrency} workers for {args.duration}s against {base_url} "
+              f"({products:,} products, {users:,} users)")
+        recorder = asyncio.run(run(
+            base_url, args.duration, args.warmup, args.concurrency, weights, products, users, args.seed
+        ))
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    results = summarize(recorder, args.duration)
+    print_report(results, args.duration)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "duration": args.duration,
+                "concurrency": args.concurrency,
+                "mix": weights,
+                "endpoints": results,
+            }, f, indent=2)
+
+    if args.baseline and not compare(results, args.baseline, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Seed an empty database with realistic catalog and order volumes for load tests.
+
+Uses the database in SQLALCHEMY_DATABASE_URL (SQLite or MySQL):
+
+    SQLALCHEMY_DATABASE_URL=sqlite:///./bench.db python -m benchmarks.seed
+    SQLALCHEMY_DATABASE_URL=sqlite:///./bench.db python -m benchmarks.seed --scale 0.01
+
+Full scale is 100k products, 1M orders, ~5M order items and 500k reviews.
+Ids are assigned here so children can reference parents without reading
+them back, which is why the target tables must be empty. Runs are
+deterministic for a given --seed.
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert
+
+from app.db.base import SessionLocal, engine
+from app.models import Base, Brand, Category, Order, OrderItem, Product, Review, User
+from app.models.role_model import seed_roles
+from app.core.security import hash_password
+
+SIZES = [38, 39, 40, 41, 42, 43, 44]
+COLORS = ["black", "white", "red"]
+ORDER_STATUSES = ["pending", "processing", "shipped", "delivered", "cancelled"]
+ORDER_STATUS_WEIGHTS = [10, 10, 10, 65, 5]
+PAYMENT_STATUS_BY_ORDER_STATUS = {
+    "pending": "pending",
+    "processing": "completed",
+    "shipped": "completed",
+    "delivered": "completed",
+    "cancelled": "refunded",
+}
+# Password of every seeded user
+USER_PASSWORD = "benchmark"
+# Stock large enough that checkout scenarios never run out
+VARIANT_STOCK = 1_000_000
+
+FULL_SCALE = {
+    "users": 50_000,
+    "products": 100_000,
+    "orders": 1_000_000,
+    "items_per_order": 5,
+    "reviews": 500_000,
+}
+
+
+def insert_batches(db, model, rows, batch_size: int, label: str, total: int) -> None:
+    batch = []
+    inserted = 0
+    started = time.perf_counter()
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            db.execute(insert(model), batch)
+            db.commit()
+            inserted += len(batch)
+            batch = []
+            print(f"\r  {label}: {inserted:,}/{total:,}", end="", flush=True)
+    if batch:
+        db.execute(insert(model), batch)
+        db.commit()
+        inserted += len(batch)
+    print(f"\r  {label}: {inserted:,} rows in {time.perf_counter() - started:.1f}s")
+
+
+def popular_product(rng: random.Random, products: int) -> int:
+    """80/20 product pick: the first fifth of the catalog gets most of the sales"""
+    if rng.random() < 0.8:
+        return rng.randint(1, max(1, products // 5))
+    return rng.randint(1, products)
+
+
+def insert_orders(db, rng: random.Random, volumes, prices, batch_size: int, now: datetime) -> None:
+    """Orders and their items, flushed together so each batch satisfies the foreign key"""
+    orders, items = [], []
+    item_id = 0
+    started = time.perf_counter()
+
+    def flush():
+        db.execute(insert(Order), orders)
+        db.execute(insert(OrderItem), items)
+        db.commit()
+        orders.clear()
+        items.clear()
+
+    for order_id in range(1, volumes["orders"] + 1):
+        total = 0.0
+        # 1..2*avg-1 items, averaging items_per_order
+        for _ in range(rng.randint(1, 2 * volumes["items_per_order"] - 1)):
+            item_id += 1
+            product_id = popular_product(rng, volumes["products"])
+            quantity = rng.randint(1, 3)
+            total += prices[product_id] * quantity
+            items.append({
+                "id": item_id,
+                "order_id": order_id,
+                "product_id": product_id,
+                "product_name": f"Shoe {product_id}",
+                "size": rng.choice(SIZES),
+                "color": rng.choice(COLORS),
+                "quantity": quantity,
+                "price_at_purchase": prices[product_id],
+            })
+
+        order_status = rng.choices(ORDER_STATUSES, ORDER_STATUS_WEIGHTS)[0]
+        created_at = now - timedelta(seconds=rng.randint(0, 730 * 86400))
+        orders.append({
+            "id": order_id,
+            "user_id": rng.randint(1, volumes["users"]),
+            "delivery_address": {
+                "street_address": f"{order_id} Benchmark street",
+                "province_city": "Ho Chi Minh",
+                "recipient_name": "Bench",
+                "recipient_phone": "0900000000",
+            },
+            "order_date": created_at,
+            "total_amount": total,
+            "status": order_status,
+            "payment_status": PAYMENT_STATUS_BY_ORDER_STATUS[order_status],
+            "payment_intent_id": f"pi_bench_{order_id}",
+            "payment_method": "stripe",
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+        if len(orders) >= batch_size:
+            flush()
+            print(f"\r  orders: {order_id:,}/{volumes['orders']:,}", end="", flush=True)
+    if orders:
+        flush()
+    print(f"\r  orders: {volumes['orders']:,} rows, order_items: {item_id:,} rows "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+def seed(scale: float, batch_size: int, rng_seed: int) -> None:
+    volumes = {key: max(1, int(value * scale)) for key, value in FULL_SCALE.items()}
+    volumes["items_per_order"] = FULL_SCALE["items_per_order"]
+    rng = random.Random(rng_seed)
+    now = datetime.now()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        for model in (User, Product, Order, OrderItem, Review):
+            if db.query(func.count()).select_from(model).scalar():
+                print(f"✗ {model.__tablename__} is not empty; seed into a fresh database")
+                sys.exit(1)
+
+        seed_roles(db)
+        print(f"Seeding with scale={scale}: {volumes}")
+
+        insert_batches(db, Category, (
+            {"id": i, "name": f"Category {i}"} for i in range(1, 21)
+        ), batch_size, "categories", 20)
+        insert_batches(db, Brand, (
+            {"id": i, "brand_name": f"Brand {i}"} for i in range(1, 31)
+        ), batch_size, "brands", 30)
+
+        # One hash for everyone, hashing per user would dominate the run
+        password = hash_password(USER_PASSWORD)
+        insert_batches(db, User, (
+            {
+                "id": i,
+                "full_name": f"User {i}",
+                "email": f"user{i}@bench.local",
+                "password": password,
+                "role_id": 2,
+                "status": 1,
+            }
+            for i in range(1, volumes["users"] + 1)
+        ), batch_size, "users", volumes["users"])
+
+        prices = {}
+
+        def products():
+            for i in range(1, volumes["products"] + 1):
+                prices[i] = rng.randrange(300_000, 5_000_000, 10_000)
+                yield {
+                    "id": i,
+                    "name": f"Shoe {i} {rng.choice(['Runner', 'Classic', 'Trail', 'Court', 'Street'])}",
+                    "description": f"Benchmark product {i}",
+                    "price": prices[i],
+                    "category_id": rng.randint(1, 20),
+                    "brand_id": rng.randint(1, 30),
+                    "status": "active",
+                    "variants": [
+                        {"size": size, "color": color, "stock_quantity": VARIANT_STOCK}
+                        for size in SIZES for color in COLORS
+                    ],
+                }
+        insert_batches(db, Product, products(), batch_size, "products", volumes["products"])
+
+        insert_orders(db, rng, volumes, prices, batch_size, now)
+
+        insert_batches(db, Review, (
+            {
+                "id": i,
+                "user_id": rng.randint(1, volumes["users"]),
+                "product_id": popular_product(rng, volumes["products"]),
+                "rating": float(rng.choices([1, 2, 3, 4, 5], [5, 5, 15, 35, 40])[0]),
+                "comment": "Benchmark review",
+                "created_at": now - timedelta(seconds=rng.randint(0, 730 * 86400)),
+            }
+            for i in range(1, volumes["reviews"] + 1)
+        ), batch_size, "reviews", volumes["reviews"])
+    finally:
+        db.close()
+
+
+def rebuild_aggregates() -> None:
+    from app.db.rebuild_aggregates import REBUILDERS
+
+    for rebuild in REBUILDERS.values():
+        rebuild()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="Fraction of the full-scale volumes")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-aggregates", action="store_true", help="Do not rebuild rating/sales rollups")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    seed(args.scale, args.batch_size, args.seed)
+    if not args.skip_aggregates:
+        rebuild_aggregates()
+    print(f"✓ Seeded in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Per-item cost of turning ORM rows into response bytes for the product and
+order list endpoints, old path against the current one. No database: rows
+are transient ORM objects, and each run goes through FastAPI's own
+response_model handling and response class.
+
+    python -m benchmarks.serialization --items 100 --iterations 200
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models import Order, OrderItem, Product
+from app.schemas.base_schema import DataResponse
+from app.schemas.order_schema import OrderHistorySchema, OrderSchema
+from app.schemas.product_schema import ProductPaginationSchema
+from app.services.order_service import OrderService
+
+SIZES = [38, 39, 40, 41, 42, 43, 44]
+COLORS = ["black", "white", "red"]
+
+
+def make_products(count: int):
+    products = []
+    for i in range(1, count + 1):
+        product = Product(
+            id=i,
+            name=f"Shoe {i}",
+            description="A comfortable everyday shoe " * 4,
+            price=500000 + i,
+            category_id=1,
+            brand_id=1,
+            status="active",
+            image_urls=[{"url": f"https://cdn.example.com/{i}/{n}.jpg", "public_id": f"{i}-{n}"} for n in range(3)],
+            variants=[{"size": size, "color": color, "stock_quantity": 10} for size in SIZES for color in COLORS],
+        )
+        product.sold_count = i * 3
+        product.rating = {"average": 4.2, "count": 12, "histogram": {"1": 0, "2": 1, "3": 1, "4": 4, "5": 6}}
+        products.append(product)
+    return products
+
+
+def make_orders(count: int, products):
+    now = datetime.now()
+    orders = []
+    for i in range(1, count + 1):
+        order = Order(
+            id=i,
+            user_id=1,
+            delivery_address={
+                "street_address": f"{i} Nguyen Trai",
+                "province_city": "Ho Chi Minh",
+                "recipient_name": "Bench",
+                "recipient_phone": "0900000000",
+            },
+            order_date=now,
+            total_amount=1500000.0,
+            status="delivered",
+            payment_status="completed",
+            payment_intent_id=f"pi_{i}",
+            payment_method="stripe",
+            created_at=now,
+            updated_at=now,
+        )
+        items = []
+        for n in range(5):
+            product = products[(i + n) % len(products)]
+            item = OrderItem(
+                id=i * 10 + n,
+                order_id=i,
+                product_id=product.id,
+                product_name=product.name,
+                size=40,
+                color="black",
+                quantity=1,
+                price_at_purchase=product.price,
+            )
+            item.product = product
+            items.append(item)
+        orders.append((order, items))
+    return orders
+
+
+def per_row_order_schema(order, items) -> OrderSchema:
+    """How OrderService used to build each order: one validation call per row"""
+    return OrderSchema(
+        id=order.id,
+        user_id=order.user_id,
+        user_full_name=None,
+        delivery_address=order.delivery_address,
+        order_date=order.order_date,
+        total_amount=order.total_amount,
+        status=order.status,
+        payment_status=order.payment_status,
+        payment_intent_id=order.payment_intent_id,
+        payment_method=order.payment_method,
+        created_at=order.created_at,
+        updated_at=order.updated_at,
+        items=[OrderService._map_order_item(item) for item in items],
+    )
+
+
+async def render(field, content, response_class) -> bytes:
+    return response_class(await serialize_response(field=field, response_content=content)).body
+
+
+def product_page(products, response_class):
+    field = create_model_field("response", DataResponse[ProductPaginationSchema])
+
+    async def run():
+        data = {"items": products, "total": len(products), "page": 1, "limit": len(products), "total_pages": 1}
+        return await render(field, DataResponse.custom_response(code="200", message="ok", data=data), response_class)
+    return run
+
+
+def order_page_per_row(orders, response_class):
+    field = create_model_field("response", OrderHistorySchema)
+
+    async def run():
+        content = OrderHistorySchema(
+            orders=[per_row_order_schema(order, items) for order, items in orders],
+            total=len(orders), page=1, limit=len(orders), total_pages=1,
+        )
+        return await render(field, content, response_class)
+    return run
+
+
+def order_page_single_pass(orders, response_class):
+    field = create_model_field("response", OrderHistorySchema)
+
+    async def run():
+        content = OrderHistorySchema.model_validate({
+            "orders": [OrderService._map_order(order, items) for order, items in orders],
+            "total": len(orders), "page": 1, "limit": len(orders), "total_pages": 1,
+        })
+        return await render(field, content, response_class)
+    return run
+
+
+async def measure(run, iterations: int) -> float:
+    await run()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await run()
+    return (time.perf_counter() - started) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100, help="Rows per response")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    products = make_products(args.items)
+    orders = make_orders(args.items, products)
+
+    cases = [
+        ("products  json.dumps", product_page(products, JSONResponse)),
+        ("products  orjson", product_page(products, ORJSONResponse)),
+        ("orders    per-row + json.dumps", order_page_per_row(orders, JSONResponse)),
+        ("orders    single pass + orjson", order_page_single_pass(orders, ORJSONResponse)),
+    ]
+
+    print(f"{args.items} rows per response, {args.iterations} iterations")
+    for label, run in cases:
+        per_response = asyncio.run(measure(run, args.iterations))
+        print(f"  {label:34s} {per_response * 1000:8.2f} ms/response {per_response / args.items * 1e6:8.1f} µs/item")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Local fake of the Stripe PaymentIntent API for offline checkout and load tests.
+
+Run it, then start the API with:
+    STRIPE_API_BASE=http://127.0.0.1:12111 STRIPE_SECRET_KEY=sk_test_fake python run.py
+
+FAKE_STRIPE_LATENCY_MS adds a delay to every call to simulate a slow provider.
+FAKE_STRIPE_AUTO_SUCCEED=true creates intents that are already "succeeded".
+"""
+import asyncio
+import os
+import secrets
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LATENCY_MS = int(os.getenv("FAKE_STRIPE_LATENCY_MS", "0"))
+AUTO_SUCCEED = os.getenv("FAKE_STRIPE_AUTO_SUCCEED", "false").lower() == "true"
+
+app = FastAPI(title="Fake Stripe")
+payment_intents = {}
+
+
+def _error(status_code: int, message: str) -> JSONResponse:
+    return JSONResponse(status_code=status_code, content={"error": {"message": message}})
+
+
+@app.middleware("http")
+async def simulate_latency(request: Request, call_next):
+    if LATENCY_MS:
+        await asyncio.sleep(LATENCY_MS / 1000)
+    if not request.headers.get("authorization"):
+        return _error(401, "No API key provided")
+    return await call_next(request)
+
+
+@app.post("/v1/payment_intents")
+async def create_payment_intent(request: Request):
+    form = await request.form()
+    intent_id = f"pi_fake_{secrets.token_hex(12)}"
+    intent = {
+        "id": intent_id,
+        "object": "payment_intent",
+        "client_secret": f"{intent_id}_secret_{secrets.token_hex(8)}",
+        "amount": int(form.get("amount", 0)),
+        "currency": form.get("currency", "vnd"),
+        "status": "succeeded" if AUTO_SUCCEED else "requires_payment_method",
+        "metadata": {
+            key[len("metadata["):-1]: value
+            for key, value in form.items() if key.startswith("metadata[")
+        },
+    }
+    payment_intents[intent_id] = intent
+    return intent
+
+
+@app.get("/v1/payment_intents/{intent_id}")
+async def retrieve_payment_intent(intent_id: str):
+    intent = payment_intents.get(intent_id)
+    if not intent:
+        return _error(404, f"No such payment_intent: '{intent_id}'")
+    return intent
+
+
+@app.post("/v1/payment_intents/{intent_id}/confirm")
+async def confirm_payment_intent(intent_id: str, request: Request):
+    intent = payment_intents.get(intent_id)
+    if not intent:
+        return _error(404, f"No such payment_intent: '{intent_id}'")
+    form = await request.form()
+    if form.get("payment_method") == "pm_card_chargeDeclined":
+        intent["status"] = "requires_payment_method"
+        return _error(402, "Your card was declined.")
+    intent["status"] = "succeeded"
+    return intent
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="127.0.0.1", port=int(os.getenv("FAKE_STRIPE_PORT", "12111")))